@@ -0,0 +1,80 @@
+"""
+File to be run to benchmark the speed of reading cover sheets. Generates synthetic cover sheets in the legacy table layout and times reading them with each reading engine. Pass --forms to also benchmark the extraction of content-control forms in wordformTesting.
+"""
+from src.input.cover_sheets.reading import read_cover_sheet_file
+from src.input.cover_sheets.synthetic import create_synthetic_cover_sheets
+import argparse
+import subprocess
+import sys
+import time
+
+try:
+    import resource     # not available on Windows, where peak memory is not reported
+except ImportError:
+    resource = None
+
+def time_reader(read_function, file_paths):
+    """
+    Reads each of the passed files with the passed function and returns the time taken to read each.
+
+    :param read_function: A function taking the path to a file.
+    :param file_paths: A list of paths to the files to be read.
+    :return: A list of the number of seconds taken to read each file, in the order of the passed paths.
+    """
+    latencies = []
+
+    for file_path in file_paths:
+        start = time.perf_counter()
+        read_function(file_path)
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+def print_report(name, latencies):
+    """
+    Prints the throughput and latency percentiles of a benchmark run, along with the peak memory used by the process so far.
+
+    :param name: The name of the benchmark run.
+    :param latencies: A list of the number of seconds taken to read each file.
+    """
+    ordered = sorted(latencies)
+    percentile = lambda p: ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)] * 1000
+
+    print(f"{name}: {len(latencies) / sum(latencies):.1f} files/sec over {len(latencies)} files")
+    print(f"\tlatency (ms): p50 {percentile(50):.2f}, p90 {percentile(90):.2f}, p99 {percentile(99):.2f}, max {ordered[-1] * 1000:.2f}")
+    print(f"\tpeak RSS: {get_peak_rss_mb()}")
+
+def get_peak_rss_mb():
+    """
+    Returns the peak resident memory of the current process.
+
+    :return: A string holding the peak resident memory in megabytes, or "n/a" on platforms where it cannot be measured.
+    """
+    if resource is None:
+        return "n/a"
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == "darwin":    # reported in bytes on macOS, kilobytes elsewhere
+        peak_rss = peak_rss / 1024
+
+    return f"{peak_rss / 1024:.1f} MB"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the speed of reading cover sheets.")
+    parser.add_argument("--count", type=int, default=1000, help="the number of synthetic cover sheets to read")
+    parser.add_argument("--directory", default="benchmark_data/cover_sheets/", help="the directory in which synthetic cover sheets are created and reused across runs")
+    parser.add_argument("--engines", nargs="+", default=["docx", "xml"], help="the reading engines to benchmark")
+    parser.add_argument("--forms", action="store_true", help="also benchmark the extraction of content-control forms in wordformTesting")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    file_paths = create_synthetic_cover_sheets(args.directory, args.count)
+    print(f"{len(file_paths)} synthetic cover sheets ready in {time.perf_counter() - start:.1f} seconds")
+
+    for engine in args.engines:
+        print_report(f"read_cover_sheet_file (engine=\"{engine}\")", time_reader(lambda file_path: read_cover_sheet_file(file_path, engine=engine), file_paths))
+
+    # wordformTesting is run as its own project, from its own directory, as both projects hold a package named src
+    if args.forms:
+        subprocess.run([sys.executable, "benchmark.py", "--count", str(args.count)], cwd="wordformTesting", check=True)
@@ -0,0 +1,36 @@
+"""
+File to be run to read newly published cover sheets into the database. Pass --watch to keep watching the cover sheet directory and ingest cover sheets as they are published, or --forms to load the forms extracted by wordformTesting instead. Columns that are not yet in the database are handled by --new-columns. When ingest.py is run from a terminal (and not with --watch), it defaults to asking which new columns to add, as it did before the policies were introduced; otherwise it defaults to NEW_COLUMN_POLICY and asks for no input, such that ingest.py can be run unattended. Note that NEW_COLUMN_POLICY is "fail" by default, so an unattended run that reads new columns stops without updating the database.
+"""
+from src.input.cover_sheets.upload import ingest_cover_sheets, ingest_form_jsonl, NEW_COLUMN_POLICIES
+from src.input.cover_sheets.watch import watch_cover_sheets
+import argparse
+import sys
+
+from src.constants import DATABASE_PATH, COVER_SHEET_DIRECTORY, NEW_COLUMN_POLICY, NEW_COLUMN_ALLOWLIST
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reads newly published cover sheets into the database.")
+    parser.add_argument("--path", default=COVER_SHEET_DIRECTORY, help="the directory where cover sheets are stored")
+    parser.add_argument("--processes", type=int, default=None, help="the number of worker processes used to read cover sheets (defaults to the number of CPUs, or 1 when watching)")
+    parser.add_argument("--watch", action="store_true", help="keep polling the directory and ingest cover sheets as they are published")
+    parser.add_argument("--poll-interval", type=float, default=10, help="the number of seconds between polls when watching")
+    parser.add_argument("--settle-time", type=float, default=5, help="the number of seconds a file must go unmodified before it is read when watching")
+    parser.add_argument("--batch-size", type=int, default=25, help="the maximum number of cover sheets appended to the database at once when watching")
+    parser.add_argument("--forms", metavar="JSONL_PATH", help="load the content-control forms in a JSONL file written by wordformTesting rather than reading cover sheets")
+    parser.add_argument("--unmapped-inputs", action="store_true", help="with --forms, also load the form inputs that are not mapped to a column of the database, subject to --new-columns")
+    parser.add_argument("--new-columns", choices=NEW_COLUMN_POLICIES, default=None, help="how columns that are not yet in the database are handled: add all of them, ignore all of them, only add those passed to --allow-columns, fail without updating the database, or prompt for each of them (defaults to prompt when run from a terminal without --watch, otherwise to NEW_COLUMN_POLICY)")
+    parser.add_argument("--allow-columns", nargs="+", default=NEW_COLUMN_ALLOWLIST, metavar="COLUMN", help="the new columns that are added under --new-columns allowlist (defaults to NEW_COLUMN_ALLOWLIST)")
+    args = parser.parse_args()
+
+    if args.new_columns is None:
+        args.new_columns = "prompt" if sys.stdin.isatty() and not args.watch else NEW_COLUMN_POLICY    # an unattended run never waits on the console
+
+    if args.forms:
+        print(f"{ingest_form_jsonl(DATABASE_PATH, args.forms, unmapped_inputs=args.unmapped_inputs, new_column_policy=args.new_columns, new_column_allowlist=args.allow_columns)} forms added to the database")
+    elif args.watch:
+        watch_cover_sheets(DATABASE_PATH, path=args.path, poll_interval=args.poll_interval, settle_time=args.settle_time, batch_size=args.batch_size, processes=args.processes or 1, new_column_policy=args.new_columns, new_column_allowlist=args.allow_columns)
+    else:
+        read_errors = ingest_cover_sheets(DATABASE_PATH, path=args.path, processes=args.processes, new_column_policy=args.new_columns, new_column_allowlist=args.allow_columns)
+
+        for file_path, error in read_errors.items():
+            print(f"Unable to read cover sheet {file_path}: {error}")
@@ -0,0 +1,16 @@
+"""
+File to be run to copy the .csv database into a SQLite database, or into a columnar database partitioned by fiscal year and quarter. The type of the new database is chosen by its path: a path ending in .db, .sqlite or .sqlite3 creates a SQLite database, and any other path a partitioned database. Once the copy is made, set DATABASE_PATH in src/constants.py to the path of the new database to read from and write to it.
+"""
+from src.input.database import migrate_csv_database, PARTITION_FORMATS
+import argparse
+
+from src.constants import DATABASE_PATH
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copies the .csv database into a SQLite database or a columnar database partitioned by fiscal year and quarter.")
+    parser.add_argument("destination", help="the path of the SQLite database file, or the directory of the partitioned database, to be created")
+    parser.add_argument("--csv", default=DATABASE_PATH, help="the path to the .csv database to be copied")
+    parser.add_argument("--format", choices=list(PARTITION_FORMATS.keys()), default="parquet", help="the file format in which the partitions of a partitioned database are stored")
+    args = parser.parse_args()
+
+    print(f"{migrate_csv_database(args.csv, args.destination, partition_format=args.format)} rows copied to {args.destination}")
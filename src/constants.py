@@ -7,10 +7,16 @@ import pandas as pd
 """
 CONFIG: Need to be changed based on the user's local environment in order to run the project
 """
+# The central database, either a .csv file, a SQLite database (.db, .sqlite or .sqlite3) or the directory of a database partitioned by fiscal year and quarter (see migrate_database.py)
 DATABASE_PATH = "./admin/Dummy Data/dummy_cover_sheet_data.csv"
 THEMATIC_MAPPING_PATH = "./admin/Dummy Data/apg_thematic_mapping.xlsx"
 # A path to the directory in which cover sheets are stored (relative to the location of the project's root)
 COVER_SHEET_DIRECTORY = "../cover_sheet/cover_sheets/"
+# The ingestion manifest, recording the cover sheet files that have already been read into the database
+MANIFEST_PATH = "./admin/cover_sheet_manifest.json"
+# How columns read from cover sheets that are not yet in the database are handled: "add" adds all of them, "ignore" leaves all of them out, "allowlist" only adds those in NEW_COLUMN_ALLOWLIST, "fail" stops the update with an error, leaving the database unchanged, and "prompt" asks on the console which of them to add. Used by unattended runs; ingest.py run from a terminal asks (--new-columns prompt) unless --new-columns is passed
+NEW_COLUMN_POLICY = "fail"
+NEW_COLUMN_ALLOWLIST = []
 
 """
 OUTPUT PATH
@@ -49,6 +55,25 @@ HEADER_MAP = {
     "How can academia help?": "Academia help"
 }
 
+# Maps the input IDs of the content-control form (read by wordformTesting) to columns in the data. Input IDs that are not mapped keep their name as their column, with nested inputs joined by "&"
+FORM_COLUMN_MAP = {
+    "agency_acronym_1": "Agency Name",
+    "goal_nickname": "Goal Name",
+    "fiscal_year": "Fiscal Year",
+    "fiscal_quarter": "Quarter"
+}
+
+# Maps the status checkboxes of the content-control form to the goal status they represent
+FORM_STATUS_MAP = {
+    "ahead": "Ahead",
+    "on_track": "On track",
+    "delayed": "Nearly on track",
+    "blocked": "Blocked"
+}
+
+# The engine used to read cover sheet files by default: "docx" reads each file through a python-docx Document, "xml" reads the file's word/document.xml directly and is considerably faster
+READING_ENGINE = "docx"
+
 """
 COLUMN NAME LISTS: List including the names of related columns in the central data source
 """
@@ -64,6 +89,18 @@ CAP_GOALS_LIST = ['CAP Goal 1', 'CAP Goal 2', 'CAP Goal 3', 'CAP Goal 4']
 # List containing the names of all APG outcomes
 OUTCOMES_LIST = ['Outcome A', 'Outcome B', 'Outcome C', 'Outcome D', 'Outcome E', 'Outcome F', 'Outcome G']
 
+"""
+DATABASE SCHEMA: The types with which the columns of the central data source are loaded (see load_database)
+"""
+# Columns holding a small set of repeated values, loaded as categories
+CATEGORY_COLUMNS = ["Agency Name", "Goal Name", "Status", "Quarter"]
+
+# Checkbox columns holding a 1 if checked and 0 otherwise, loaded as 8-bit integers
+FLAG_COLUMNS = CHALLENGES_LIST + THEMES_LIST
+
+# Columns holding long free-text answers, which can be left out when loading the data and loaded later for only the rows that need them
+TEXT_COLUMNS = list(HEADER_MAP.values()) + ["Success Story"]
+
 """
 GOAL STATUSES
 """
@@ -0,0 +1,104 @@
+"""
+Functions related to loading the data extracted from content-control cover sheet forms by wordformTesting, which writes one JSON line per form, into the central database.
+"""
+
+from src.constants import FORM_COLUMN_MAP, FORM_STATUS_MAP
+import src.input.cover_sheets.manifest as manifest_io
+
+import pandas as pd
+import json
+import os
+import re
+
+def iter_form_batches(jsonl_path, batch_size=500, manifest=None, unmapped_inputs=False):
+    """
+    Reads the forms in the passed JSONL file a batch at a time, such that the file never has to be held in memory in full.
+
+    :param jsonl_path: The path to a JSONL file written by wordformTesting, holding one {"file": ..., "data": ...} object per line. A partly written last line, left by an interrupted extraction, is ignored.
+    :param batch_size: The maximum number of forms in each batch.
+    :param manifest: An ingestion manifest, as returned by load_manifest. Forms recorded in it with the same line are skipped. Defaults to reading every form.
+    :param unmapped_inputs: Whether to keep the inputs of the form that are not mapped to a column of the database. See get_form_row.
+    :return: A generator of tuples, each holding a DataFrame with a row per form in the columns of the database, followed by a dictionary mapping the manifest key of each form in the DataFrame to its manifest entry. Pass the entries to record_cover_sheets once the forms have been added to the database.
+    """
+    if manifest is None:
+        manifest = {}
+
+    rows = []
+    entries = {}
+
+    for file_name, line, data in __iter_form_data(jsonl_path):
+        key, entry = manifest_io.get_form_entry(file_name, line)
+
+        if manifest.get(key, {}).get("hash") == entry["hash"] or key in entries:     # skips forms loaded by an earlier run, and repeated lines
+            continue
+
+        rows.append(get_form_row(data, unmapped_inputs=unmapped_inputs))
+        entries[key] = entry
+
+        if len(rows) == batch_size:
+            yield pd.DataFrame(rows), entries
+            rows = []
+            entries = {}
+
+    if len(rows) > 0:
+        yield pd.DataFrame(rows), entries
+
+def get_form_row(data, unmapped_inputs=False):
+    """
+    Returns the passed form data as a row of the database.
+
+    :param data: A dictionary holding the data extracted from a single form, with nested inputs held in nested dictionaries.
+    :param unmapped_inputs: Whether to keep the inputs that are not mapped to a column of the database, in columns named by their input IDs, with nested inputs joined with "&". Defaults to leaving them out, such that the form only holds columns that are already in the database.
+    :return: A dictionary mapping column names to values. Mapped inputs are renamed (see FORM_COLUMN_MAP), the status checkboxes are combined into a single "Status" and fiscal years such as "FY24" are converted to 2024.
+    """
+    row = {}
+
+    for key, value in __flatten(data):
+        if key in FORM_STATUS_MAP:
+            if value == "X":    # checked box
+                row["Status"] = FORM_STATUS_MAP[key]
+        elif key in FORM_COLUMN_MAP:
+            row[FORM_COLUMN_MAP[key]] = value
+        elif unmapped_inputs:
+            row[key] = value
+
+    fiscal_year = re.fullmatch(r"FY(\d{2})", str(row.get("Fiscal Year", "")))
+    if fiscal_year:
+        row["Fiscal Year"] = 2000 + int(fiscal_year.group(1))
+
+    return row
+
+def __iter_form_data(jsonl_path):
+    """
+    Reads the data of each form in the passed JSONL file, one line at a time.
+
+    :param jsonl_path: The path to a JSONL file written by wordformTesting.
+    :return: A generator of tuples, each holding the name of a form's file, the line holding the form as bytes and the data extracted from the form.
+    """
+    if not os.path.isfile(jsonl_path):
+        return
+
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):    # a line is only complete once its newline is written
+                return
+
+            form = json.loads(line)
+            yield form["file"], line, form["data"]
+
+def __flatten(data, prefix=""):
+    """
+    Flattens nested form data into (input ID, value) pairs, the reverse of the nesting done by wordformTesting.
+
+    :param data: A dictionary holding form data, possibly nested.
+    :param prefix: The input ID of the dictionary within the form data, used to build the input IDs of its keys.
+    :return: A generator of tuples, each holding the full input ID of an input and its value. The empty input ID and the "Errors" of validated forms are left out.
+    """
+    for key, value in data.items():
+        if prefix == "" and key in ("", "Errors"):
+            continue
+
+        if isinstance(value, dict):
+            yield from __flatten(value, f"{prefix}{key}&")
+        else:
+            yield f"{prefix}{key}", value
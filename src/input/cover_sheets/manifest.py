@@ -0,0 +1,110 @@
+"""
+Functions related to the ingestion manifest, which records every cover sheet file that has been read into the database so that later runs only read new or changed files. The forms loaded from the JSONL files written by wordformTesting are recorded in the same manifest, under their file name prefixed with FORM_KEY_PREFIX.
+"""
+
+import hashlib
+import json
+import os
+
+# Prefix of the manifest keys of forms loaded from a JSONL file, which keeps them apart from the paths of cover sheet files
+FORM_KEY_PREFIX = "form:"
+
+def load_manifest(manifest_path):
+    """
+    Returns the ingestion manifest stored at the passed path.
+
+    :param manifest_path: The path to the .json file holding the manifest.
+    :return: A dictionary mapping the path of each ingested cover sheet file to a dictionary holding the "hash", "mtime" and "size" of the file when it was ingested, and the key of each loaded form to the "hash" of its line (see get_form_entry). Returns an empty dictionary if no manifest has been saved yet.
+    """
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_manifest(manifest_path, manifest):
+    """
+    Saves the passed manifest to the passed path. The manifest is written to a temporary file first and then moved into place, such that an interrupted run never leaves a partially written manifest behind.
+
+    :param manifest_path: The path to the .json file holding the manifest.
+    :param manifest: A dictionary in the format returned by load_manifest.
+    """
+    manifest_dir = os.path.dirname(manifest_path)
+
+    # Creates the manifest's directory if it does not already exist
+    if manifest_dir and not os.path.isdir(manifest_dir):
+        os.makedirs(manifest_dir)
+
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    os.replace(temp_path, manifest_path)
+
+def get_file_hash(file_path, block_size=1 << 20):
+    """
+    Returns the SHA-256 hash of the contents of the file at the passed path, reading the file in blocks so that large files are never held in memory in full.
+
+    :param file_path: The path to a file.
+    :param block_size: The number of bytes read from the file at a time.
+    :return: The hexadecimal SHA-256 digest of the file's contents.
+    """
+    file_hash = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+def get_new_cover_sheet_paths(file_paths, manifest):
+    """
+    Given a list of paths to cover sheet files, returns the paths of the files that have not yet been ingested according to the passed manifest.
+
+    A file whose size and modification time match its entry in the manifest is assumed to be unchanged and is not opened. Any other file is hashed, and is only considered new if no ingested file has the same contents, such that byte-identical resubmissions (including copies saved under a different name) are skipped.
+
+    :param file_paths: A list of paths to .docx files, each of which contains a cover sheet.
+    :param manifest: A dictionary in the format returned by load_manifest.
+    :return: A list of the paths of the new or changed files, in the order they were passed, followed by a dictionary mapping the path of every file that was hashed to its manifest entry. Pass the entries of the files that were successfully ingested to record_cover_sheets.
+    """
+    ingested_hashes = {entry["hash"] for entry in manifest.values()}
+    new_paths = []
+    entries = {}
+
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        entry = manifest.get(file_path)
+
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            continue    # file is unchanged since it was ingested
+
+        entries[file_path] = {
+            "hash": get_file_hash(file_path),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size
+        }
+
+        if entries[file_path]["hash"] not in ingested_hashes:
+            new_paths.append(file_path)
+            ingested_hashes.add(entries[file_path]["hash"])     # skips later copies of the same file within this batch
+
+    return new_paths, entries
+
+def record_cover_sheets(manifest, entries):
+    """
+    Adds the passed entries to the passed manifest, marking their files as ingested.
+
+    :param manifest: A dictionary in the format returned by load_manifest. Modified in place.
+    :param entries: A dictionary mapping the path of each ingested cover sheet file to its manifest entry, as returned by get_new_cover_sheet_paths.
+    """
+    manifest.update(entries)
+
+def get_form_entry(file_name, line):
+    """
+    Returns the manifest key and entry of a form loaded from a JSONL file written by wordformTesting.
+
+    :param file_name: The name of the form's file, as held in its line.
+    :param line: The line of the JSONL file holding the form, as bytes.
+    :return: The key of the form in the manifest, followed by its entry: a dictionary holding the "hash" of the line. Forms have no "mtime" and "size", which are None.
+    """
+    return FORM_KEY_PREFIX + file_name, {"hash": hashlib.sha256(line).hexdigest(), "mtime": None, "size": None}
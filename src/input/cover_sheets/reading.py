@@ -3,21 +3,34 @@ Functions realted to scraping the data from an incoming cover sheet.
 """
 
 import src.utility as utility
-from src.constants import COVER_SHEET_DIRECTORY, HEADER_MAP
+from src.constants import COVER_SHEET_DIRECTORY, HEADER_MAP, READING_ENGINE
+from src.objects.cover_sheet import CoverSheetRecord, records_to_dataframe
 
 from docx import Document
 from docx.text.paragraph import Paragraph
-import pandas as pd
+from lxml import etree
+from functools import partial
+from multiprocessing import Pool
+import tarfile
+import zipfile
+import io
 import os
 
-def read_cover_sheet(document):
+# Tag prefix of the elements in the WordprocessingML namespace, in which all of the text and tables of a .docx file are stored
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# File extensions of the archives in which agencies may submit a bundle of cover sheets
+BUNDLE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+def read_cover_sheet(document, record=False):
     """
     Returns a dictionary containing the data collected from the passed word document
     
     :param document: A Document object holding a performance cover sheet from a .docx file
-    :return: A dictionary containing all of the relevant data scraped from the passed cover sheet document
+    :param record: Whether to return the data as a CoverSheetRecord, which holds the same data as the dictionary in far less memory, rather than as a dictionary.
+    :return: A dictionary containing all of the relevant data scraped from the passed cover sheet document, or a CoverSheetRecord holding the same data if record is TRUE
     """
-    data = {}
+    data = CoverSheetRecord() if record else {}
     header = None
 
     for block in utility.iter_block_items(document):
@@ -38,21 +51,86 @@ def read_cover_sheet(document):
                         for paragraph in cell.paragraphs: 
                             row_text.append(paragraph.text)     # collects all paragraphs in a given cell into a list
 
-                    # storing of checkboxes in data field - continues until all checkboxes are retrieved from cell
-                    while __checkbox_in_row(row_text):
-                        # Retrieves index of the first checked and unchecked checkboxes
-                        checked_index = __get_checkbox_index(row_text, True)
-                        unchecked_index = __get_checkbox_index(row_text, False)
+                    __read_checkbox_row(row_text, data)
+    
+    return data
 
-                        index = max(checked_index, unchecked_index)     # retrives the maximum index value, meaning index -1 is never selected
-                        checkbox_value = 1 if index == checked_index else 0
-                        row_text.pop(index)     # removes element with checkbox that is being added to data
-                        column_title = row_text.pop(index)  # removes element in row directly after checkbox, which is assumed to be the title of the checkbox field
+def read_cover_sheet_xml(docx_file, record=False):
+    """
+    Returns a dictionary containing the data collected from the passed .docx file. Produces the same dictionary as read_cover_sheet, but reads word/document.xml directly in a single pass over its paragraphs and tables rather than building a python-docx Document, which is considerably faster.
+
+    :param docx_file: The path to a .docx file holding a performance cover sheet, or a file-like object opened in binary mode.
+    :param record: Whether to return the data as a CoverSheetRecord rather than as a dictionary. See read_cover_sheet.
+    :return: A dictionary containing all of the relevant data scraped from the passed cover sheet document, or a CoverSheetRecord holding the same data if record is TRUE
+    """
+    data = CoverSheetRecord() if record else {}
+    header = None
+
+    with zipfile.ZipFile(docx_file) as docx_zip, docx_zip.open("word/document.xml") as document_xml:
+        for event, elem in etree.iterparse(document_xml, tag=(f"{W}p", f"{W}tbl")):
+            if elem.getparent().tag != f"{W}body":
+                continue    # paragraphs and tables nested in other elements are read as part of the top-level block that holds them
+
+            if elem.tag == f"{W}p":     # handling of paragraphs
+                text = __get_paragraph_text(elem)
+                if text in HEADER_MAP.keys():     # if the paragraph holds one of the headers used to indicate that text can be inputted from user
+                    header = text     # stores text as a header
+            else:   # if block is a table
+                rows = __get_table_rows(elem)
+
+                if header:  # if table comes directly after a recognized header
+                    table_data = ["\n".join(cell) for row in rows for cell in row]    # separate each paragraph by a line break
+
+                    # Storing of data under the mapped column name, resetting header to read more data
+                    data[HEADER_MAP[header]] = " ".join(table_data)
+                    header = None
+                else:   # for tables that do not come directly after headers
+                    for row in rows:
+                        row_text = [paragraph_text for cell in row for paragraph_text in cell]     # collects all paragraphs in a given row into a list
+
+                        __read_checkbox_row(row_text, data)
+
+            # Frees the block that was just read, along with all of the blocks before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
 
-                        data[column_title] = checkbox_value   # stores a 1 if box is checked, else 0
-    
     return data
 
+def read_cover_sheet_file(file_path, engine=READING_ENGINE, record=False):
+    """
+    Returns a dictionary containing the data collected from the cover sheet at the passed path, using the specified reading engine.
+
+    :param file_path: The path to a .docx file holding a performance cover sheet, or a file-like object opened in binary mode.
+    :param engine: The engine used to read the cover sheet: "docx" to read it through a python-docx Document (read_cover_sheet) or "xml" to read word/document.xml directly (read_cover_sheet_xml).
+    :param record: Whether to return the data as a CoverSheetRecord rather than as a dictionary. See read_cover_sheet.
+    :return: A dictionary containing all of the relevant data scraped from the passed cover sheet document, or a CoverSheetRecord holding the same data if record is TRUE
+    """
+    if engine == "docx":
+        return read_cover_sheet(Document(file_path), record=record)
+    elif engine == "xml":
+        return read_cover_sheet_xml(file_path, record=record)
+    else:
+        raise ValueError(f"\"{engine}\" is not a valid reading engine. Please use either \"docx\" or \"xml\".")
+
+def compare_reading_engines(file_path):
+    """
+    Reads the cover sheet at the passed path with both reading engines and returns the fields on which their output differs. Intended to confirm that the "xml" engine can stand in for the "docx" engine on a given set of cover sheets.
+
+    :param file_path: The path to a .docx file holding a performance cover sheet.
+    :return: A dictionary mapping each field that is missing from the output of either engine or holds different values in each to a tuple of the value read by the "docx" engine and the value read by the "xml" engine, with missing values represented as None. An empty dictionary means the engines agree.
+    """
+    docx_data = read_cover_sheet_file(file_path, engine="docx")
+    xml_data = read_cover_sheet_file(file_path, engine="xml")
+
+    differences = {}
+
+    for field in list(docx_data) + [field for field in xml_data if field not in docx_data]:
+        if field not in docx_data or field not in xml_data or docx_data[field] != xml_data[field]:
+            differences[field] = (docx_data.get(field), xml_data.get(field))
+
+    return differences
+
 # DOCUMENT RETRIEVAL METHODS
 
 def process_cover_sheets(cover_sheets_list):
@@ -64,9 +142,136 @@ def process_cover_sheets(cover_sheets_list):
     """
     data = []
     for cover_sheet in cover_sheets_list:
-        data.append(read_cover_sheet(cover_sheet))
+        data.append(read_cover_sheet(cover_sheet, record=True))
         
-    return pd.DataFrame(data)
+    return records_to_dataframe(data)
+
+def process_cover_sheet_files(file_paths, processes=None, chunksize=4, engine=READING_ENGINE):
+    """
+    Creates a DataFrame object from a list of paths to cover sheet files, reading the files in parallel across a pool of worker processes. Rows of the returned DataFrame follow the order of the passed paths, regardless of the order in which the workers finish.
+
+    :param file_paths: A list of paths to .docx files, each of which contains a cover sheet, or to bundles of such files (see BUNDLE_EXTENSIONS). Cover sheets are read from bundles in memory, without extracting them to disk.
+    :param processes: The number of worker processes used to read the cover sheets. Defaults to the number of CPUs on the machine; a value of 1 reads every file in the current process without creating a pool.
+    :param chunksize: The number of files handed to a worker process at a time. Larger values reduce the overhead of passing work between processes.
+    :param engine: The engine used to read each cover sheet, either "docx" or "xml". See read_cover_sheet_file.
+    :return: A DataFrame object with each row representing a successfully read cover sheet, followed by a dictionary mapping the path of every file that could not be read to the error message raised while reading it. Cover sheets within a bundle are identified by the path of the bundle joined with their path inside the bundle.
+    """
+    data = []
+    errors = {}
+    sources = __get_cover_sheet_sources(file_paths, errors)
+
+    if processes == 1:
+        results = map(partial(__read_cover_sheet_file, engine=engine), sources)     # avoids the start-up cost of a pool when only one process is requested
+        __collect_results(results, data, errors)
+    else:
+        with Pool(processes) as pool:
+            results = pool.imap(partial(__read_cover_sheet_file, engine=engine), sources, chunksize=chunksize)     # imap yields results in the order of the passed paths
+            __collect_results(results, data, errors)
+
+    return records_to_dataframe(data), errors
+
+def process_cover_sheets_in_chunks(cover_sheets, chunk_size=100):
+    """
+    Generates DataFrame objects from an iterable of cover sheets, each holding at most the passed number of rows. Only the cover sheets of a single chunk are read into memory at a time when a generator such as iter_cover_sheets is passed.
+
+    :param cover_sheets: An iterable of Document objects, each of which was created from a separate .docx file containing a cover sheet.
+    :param chunk_size: The maximum number of cover sheets represented in each generated DataFrame.
+    :return: A stream of DataFrame objects with each row representing a cover sheet, in the order in which the cover sheets were passed.
+    """
+    data = []
+
+    for cover_sheet in cover_sheets:
+        data.append(read_cover_sheet(cover_sheet, record=True))
+
+        if len(data) == chunk_size:
+            yield records_to_dataframe(data)
+            data = []   # releases the rows of the chunk that was just generated
+
+    # Generates the final, partially filled chunk
+    if len(data) > 0:
+        yield records_to_dataframe(data)
+
+def iter_cover_sheets(path=None):
+    """
+    Returns a stream of docx Document objects representing cover sheets, each of which is opened from the folder where cover sheets are stored only once it is requested. Unlike get_cover_sheets, at most one Document is held in memory at a time, provided that the caller does not keep references to the Document objects it has already received.
+
+    :param path: The path to the directory where cover sheet objects are stored. NOTE: This directory should only include cover sheets.
+    :return: A stream of docx Document objects representing cover sheets, in the order of their file names. Cover sheets within a bundle are generated in the order they are stored in the bundle.
+    """
+    file_paths = get_cover_sheet_paths(path)
+
+    if file_paths is None:  # if the directory could not be found
+        return
+
+    for file_path in file_paths:
+        if is_bundle(file_path):
+            for member_path, content in iter_bundle_members(file_path):
+                yield Document(io.BytesIO(content))
+        else:
+            yield Document(file_path)
+
+def iter_bundle_members(bundle_path):
+    """
+    Returns a stream of the .docx files held in the passed .zip or .tar bundle, each of which is read into memory only once it is requested. Nothing is extracted to disk.
+
+    :param bundle_path: The path to a bundle of cover sheets, with one of the extensions in BUNDLE_EXTENSIONS.
+    :return: A stream of tuples, each holding the path of the bundle joined with the path of a .docx file inside the bundle, followed by the contents of the .docx file as bytes.
+    """
+    if bundle_path.endswith(".zip"):
+        with zipfile.ZipFile(bundle_path) as bundle:
+            for member in bundle.infolist():
+                if not member.is_dir() and __is_cover_sheet_member(member.filename):
+                    yield os.path.join(bundle_path, member.filename), bundle.read(member)
+    else:
+        with tarfile.open(bundle_path, "r:*") as bundle:   # detects the compression of the bundle, if any
+            for member in bundle:   # reads the bundle front to back, such that compressed bundles are only decompressed once
+                if member.isfile() and __is_cover_sheet_member(member.name):
+                    yield os.path.join(bundle_path, member.name), bundle.extractfile(member).read()
+
+def is_bundle(file_path):
+    """
+    Returns TRUE if the passed path is to a bundle of cover sheets, FALSE otherwise.
+
+    :param file_path: The path to a file.
+    :return: TRUE if the file has one of the extensions in BUNDLE_EXTENSIONS, FALSE otherwise.
+    """
+    return file_path.lower().endswith(BUNDLE_EXTENSIONS)
+
+def get_source_path(file_path, source_paths):
+    """
+    Returns the path, among the passed paths, of the file from which the passed cover sheet was read: the path of the cover sheet itself, or of the bundle holding it. Used to match the errors returned by process_cover_sheet_files, which identify the cover sheets within a bundle by the path of the bundle joined with their path inside it, with the files that were passed.
+
+    :param file_path: The path of a cover sheet, as returned by process_cover_sheet_files.
+    :param source_paths: A set (or dictionary) of the paths to .docx files and bundles that the cover sheet may have been read from.
+    :return: The path of the .docx file or bundle from which the cover sheet was read. Returns the passed path if it does not match any of the passed paths.
+    """
+    path = file_path
+
+    while path not in source_paths:
+        parent = os.path.dirname(path)
+        if parent == path or parent == "":  # if the path does not lie within any of the passed paths
+            return file_path
+        path = parent
+
+    return path
+
+def get_cover_sheet_paths(path=None):
+    """
+    Returns a sorted list of the paths to the .docx files and bundles of .docx files in the folder where cover sheets are stored, without opening any of the files.
+
+    :param path: The path to the directory where cover sheet objects are stored. NOTE: This directory should only include cover sheets.
+    :return: A list of paths to .docx files and bundles (see BUNDLE_EXTENSIONS), sorted by file name so that the order of cover sheets is the same on every run. Returns None if the directory could not be found.
+    """
+    if path == None:
+        path = COVER_SHEET_DIRECTORY    # retrieves cover sheets from the default directory specified by a constant if no path was passed
+
+    try:
+        filenames = sorted(os.listdir(path))
+    except FileNotFoundError as e:
+        print(f"Unable to retrieve cover sheets from path {path}")
+        return None
+
+    return [os.path.join(path, filename) for filename in filenames if filename.endswith(".docx") or is_bundle(filename)]
 
 def get_cover_sheets(path=None):
     """
@@ -89,6 +294,73 @@ def get_cover_sheets(path=None):
 
     return cover_sheets
 
+def __collect_results(results, data, errors):
+    """
+    Sorts the results of reading cover sheet files into the rows of data that were read and the errors that were raised.
+
+    :param results: An iterable of (path, data, error) tuples, as returned by __read_cover_sheet_file.
+    :param data: A list to which the CoverSheetRecord of each successfully read file is appended.
+    :param errors: A dictionary in which the error message of each file that could not be read is stored under its path.
+    """
+    for file_path, cover_sheet_data, error in results:
+        if error is None:
+            data.append(cover_sheet_data)
+        else:
+            errors[file_path] = error
+
+def __get_cover_sheet_sources(file_paths, errors):
+    """
+    Returns the cover sheets to be read from the passed paths, reading the contents of the cover sheets in each bundle into memory.
+
+    :param file_paths: A list of paths to .docx files and bundles of .docx files.
+    :param errors: A dictionary in which the error message of each bundle that could not be opened is stored under its path.
+    :return: A list holding the path of each .docx file, and a (path, contents) tuple for each .docx file within a bundle, in the order in which they should be read.
+    """
+    sources = []
+
+    for file_path in file_paths:
+        if is_bundle(file_path):
+            try:
+                members = list(iter_bundle_members(file_path))
+            except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                errors[file_path] = f"{type(e).__name__}: {e}"
+                continue
+            sources.extend(members)
+        else:
+            sources.append(file_path)
+
+    return sources
+
+def __is_cover_sheet_member(member_path):
+    """
+    Returns TRUE if the passed file within a bundle is a cover sheet, FALSE otherwise. Leaves out the hidden files that operating systems add when creating archives and the lock files Word creates beside open documents.
+
+    :param member_path: The path of a file within a bundle.
+    :return: TRUE if the file is a .docx file that is not hidden and is not a lock file, FALSE otherwise.
+    """
+    filename = os.path.basename(member_path)
+
+    return filename.endswith(".docx") and not filename.startswith(("~$", "._")) and not member_path.startswith("__MACOSX/")
+
+def __read_cover_sheet_file(source, engine=READING_ENGINE):
+    """
+    Opens and reads the passed cover sheet. Catches any error raised while doing so, such that a single malformed file does not stop the reading of a whole batch of cover sheets.
+
+    :param source: The path to a .docx file containing a cover sheet, or a tuple of the path and the contents of a .docx file within a bundle.
+    :param engine: The engine used to read the cover sheet, either "docx" or "xml". See read_cover_sheet_file.
+    :return: The path of the cover sheet, the CoverSheetRecord holding the data read from the cover sheet (None if it could not be read) and the error message raised while reading the file (None if it was read successfully).
+    """
+    if isinstance(source, tuple):   # if the cover sheet was read from a bundle
+        file_path, content = source
+        file = io.BytesIO(content)
+    else:
+        file_path = file = source
+
+    try:
+        return file_path, read_cover_sheet_file(file, engine=engine, record=True), None
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}"
+
 # DATA READING METHODS
 
 def get_list_from_table(table):
@@ -110,30 +382,132 @@ def get_list_from_table(table):
 
     return text_input
 
-def __checkbox_in_row(row):
+def __read_checkbox_row(row_text, data):
     """
-    Given a list of data from a row, return TRUE if there is a checkbox in the row, FALSE otherwise.
+    Stores the value of every checkbox in the passed row in the passed dictionary, under the title of the checkbox field.
 
-    :param row: A list of data from a row within a Word document table.
-    :return: TRUE if a checkbox is in the row, FALSE otherwise.
+    :param row_text: A list of the text of each paragraph in a row within a Word document table.
+    :param data: The dictionary or CoverSheetRecord holding the data being collected from a cover sheet, to which the checkbox values are added.
     """
-    return any([checkbox in row_element for row_element in row for checkbox in ["☒", "☐"]])
+    for column_title, checkbox_value in tokenize_checkbox_row(row_text):
+        data[column_title] = checkbox_value   # stores a 1 if box is checked, else 0
 
-def __get_checkbox_index(row, is_checked):
+def __get_paragraph_text(p):
     """
-    Given a list of data from a row, return the index of first occurrence the passed check type. Returns -1 if the check type is not present in the list.
+    Returns the text of the passed w:p element, matching the text python-docx returns for the same paragraph: tabs are read as "\t", line breaks as "\n" and non-breaking hyphens as "-", and the visible text of hyperlinks is included.
 
-    :param row: A list of data from a row within a Word document table.
-    :param is_checked: Boolean corresponding to whether the desired index is of checked checkboxes (true) or unchecked checkboxes (unchecked).
-    :return: The index of the list that contains the specified checkbox type if it is present. Otherwise, return -1.
+    :param p: A w:p element read from word/document.xml.
+    :return: The text held in the passed paragraph.
     """
-    if is_checked:
-        checkbox = "☒"
-    else:
-        checkbox = "☐"
+    text = []
 
-    for id, cell_text in enumerate(row):
-        if checkbox in cell_text:
-            return id   # returns the ID if the specified checkbox is found
-    
-    return -1   # returns -1 if the row is looped through and no checkbox is found
+    for child in p:
+        if child.tag == f"{W}r":
+            runs = [child]
+        elif child.tag == f"{W}hyperlink":
+            runs = child.iterchildren(f"{W}r")
+        else:
+            continue
+
+        for run in runs:
+            for elem in run:
+                tag = elem.tag
+                if tag == f"{W}t":
+                    text.append(elem.text or "")
+                elif tag in (f"{W}tab", f"{W}ptab"):
+                    text.append("\t")
+                elif tag == f"{W}cr":
+                    text.append("\n")
+                elif tag == f"{W}br":
+                    text.append("\n" if elem.get(f"{W}type", "textWrapping") == "textWrapping" else "")    # column and page breaks hold no text
+                elif tag == f"{W}noBreakHyphen":
+                    text.append("-")
+
+    return "".join(text)
+
+def __get_table_rows(tbl):
+    """
+    Returns the paragraph text of every cell of the passed w:tbl element, laid out on the table grid in the same way as the cells of a python-docx Table: a cell spanning several grid columns, or continuing a vertical merge, is repeated in each grid position it covers.
+
+    :param tbl: A w:tbl element read from word/document.xml.
+    :return: A list of rows, each of which is a list of cells, each of which is a list of the text of the paragraphs directly within the cell.
+    """
+    col_count = len(tbl.findall(f"{W}tblGrid/{W}gridCol"))
+    cells = []
+    row_count = 0
+
+    for tr in tbl.iterchildren(f"{W}tr"):
+        row_count += 1
+        for tc in tr.iterchildren(f"{W}tc"):
+            tcPr = tc.find(f"{W}tcPr")
+            grid_span = 1
+            v_merge = None
+
+            if tcPr is not None:
+                grid_span_elem = tcPr.find(f"{W}gridSpan")
+                if grid_span_elem is not None:
+                    grid_span = int(grid_span_elem.get(f"{W}val"))
+                v_merge_elem = tcPr.find(f"{W}vMerge")
+                if v_merge_elem is not None:
+                    v_merge = v_merge_elem.get(f"{W}val", "continue")   # a w:vMerge element without a value continues the merge
+
+            for grid_span_idx in range(grid_span):
+                if v_merge == "continue":
+                    cells.append(cells[-col_count])     # repeats the cell above, which the merge continues
+                elif grid_span_idx > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append([__get_paragraph_text(p) for p in tc.iterchildren(f"{W}p")])
+
+    return [cells[row_idx * col_count:(row_idx + 1) * col_count] for row_idx in range(row_count)]
+
+def tokenize_checkbox_row(row_text):
+    """
+    Generates a (column title, value) pair for every checkbox in the passed row, where the value is 1 if the box is checked and 0 otherwise. Each element of the row holding a checkbox is paired with the element directly after it, which is assumed to be the title of the checkbox field.
+
+    Checkboxes are paired in the following order, which is kept for compatibility with earlier versions of the reader: the later of the first checked and the first unchecked checkbox remaining in the row is read first, and both it and its title are removed from the row before the next checkbox is read. Rather than searching the row again after each removal, the row is held as a linked list and the next checked and unchecked checkboxes are tracked with pointers that only move forward, so that each element is visited a constant number of times.
+
+    :param row_text: A list of the text of each paragraph in a row within a Word document table. Not modified.
+    :return: A stream of (column title, value) tuples, one for each checkbox in the row.
+    """
+    row_length = len(row_text)
+    next_index = list(range(1, row_length + 1))     # index of the next element remaining in the row, row_length if there is none
+    previous_index = list(range(-1, row_length - 1))    # index of the previous element remaining in the row, -1 if there is none
+    removed = [False] * row_length
+
+    # Indices of the elements holding each type of checkbox, in the order they appear in the row
+    checked_indices = [i for i, text in enumerate(row_text) if "☒" in text]
+    unchecked_indices = [i for i, text in enumerate(row_text) if "☐" in text]
+    checked_position = 0
+    unchecked_position = 0
+
+    def remove(index):
+        removed[index] = True
+        if previous_index[index] != -1:
+            next_index[previous_index[index]] = next_index[index]
+        if next_index[index] != row_length:
+            previous_index[next_index[index]] = previous_index[index]
+
+    while True:
+        # Skips over checkboxes that have already been read, or that were removed as the title of another checkbox
+        while checked_position < len(checked_indices) and removed[checked_indices[checked_position]]:
+            checked_position += 1
+        while unchecked_position < len(unchecked_indices) and removed[unchecked_indices[unchecked_position]]:
+            unchecked_position += 1
+
+        checked_index = checked_indices[checked_position] if checked_position < len(checked_indices) else -1
+        unchecked_index = unchecked_indices[unchecked_position] if unchecked_position < len(unchecked_indices) else -1
+
+        if checked_index == -1 and unchecked_index == -1:     # if no checkboxes remain in the row
+            return
+
+        index = max(checked_index, unchecked_index)     # retrives the maximum index value, meaning index -1 is never selected
+        title_index = next_index[index]
+
+        if title_index == row_length:
+            raise IndexError(f"The checkbox \"{row_text[index]}\" is the last element of its row and has no title.")
+
+        remove(index)   # removes element with checkbox that is being added to data
+        remove(title_index)     # removes element in row directly after checkbox, which is assumed to be the title of the checkbox field
+
+        yield row_text[title_index], 1 if index == checked_index else 0
@@ -0,0 +1,103 @@
+"""
+Functions related to generating synthetic cover sheets, filled with random data in the legacy table layout read by read_cover_sheet. Used to benchmark the cover sheet reader without access to real submissions.
+"""
+
+from src.constants import HEADER_MAP, CHALLENGES_LIST, THEMES_LIST, STATUS_RANK_MAP
+
+from docx import Document
+from docx.shared import Inches
+import random
+import os
+
+# Words from which the free-text answers of synthetic cover sheets are built
+WORDS = ["agency", "goal", "progress", "hiring", "technology", "funding", "delay", "contract", "review", "policy", "data", "staff", "training", "partners", "outreach", "milestone", "quarter", "target", "systems", "support"]
+
+# Images that may be embedded in synthetic cover sheets, such that their file size resembles that of real submissions
+IMAGE_PATHS = [f"src/resources/speedometers/speedometer_{status.lower().replace(' ', '_')}.png" for status in STATUS_RANK_MAP.keys()]
+
+def create_synthetic_cover_sheet(file_path, seed=None, image_probability=0.5):
+    """
+    Creates a .docx file holding a cover sheet in the legacy table layout, filled with random data. The cover sheet has a row of checkboxes for its goal status, a grid of checkboxes for each of the challenges and themes, and a free-text answer table after each of the headers in HEADER_MAP.
+
+    :param file_path: The path to which the cover sheet will be saved.
+    :param seed: The seed of the random data, such that the same seed always creates the same cover sheet. Defaults to a random seed.
+    :param image_probability: The probability of embedding an image in the cover sheet.
+    """
+    rng = random.Random(seed)
+    document = Document()
+
+    document.add_heading("Agency Priority Goal Quarterly Cover Sheet", level=1)
+
+    status = rng.choice(list(STATUS_RANK_MAP.keys()))
+    document.add_paragraph("What is the status of your goal?")
+    __add_checkbox_table(document, [(option, option == status) for option in STATUS_RANK_MAP.keys()], columns=len(STATUS_RANK_MAP))
+
+    document.add_paragraph("Which challenges did your goal team face this quarter?")
+    __add_checkbox_table(document, [(challenge, rng.random() < 0.3) for challenge in CHALLENGES_LIST], columns=2)
+
+    document.add_paragraph("Which themes does your goal relate to?")
+    __add_checkbox_table(document, [(theme, rng.random() < 0.5) for theme in THEMES_LIST], columns=len(THEMES_LIST))
+
+    if rng.random() < image_probability:
+        document.add_picture(rng.choice(IMAGE_PATHS), width=Inches(3))
+
+    for header in HEADER_MAP.keys():
+        document.add_paragraph(header)
+        table = document.add_table(rows=1, cols=1)
+        cell = table.cell(0, 0)
+        cell.text = __get_random_text(rng)
+
+        for i in range(rng.randint(0, 2)):  # some answers span several paragraphs
+            cell.add_paragraph(__get_random_text(rng))
+
+    document.save(file_path)
+
+def create_synthetic_cover_sheets(directory, count, seed=0, image_probability=0.5):
+    """
+    Creates the passed number of synthetic cover sheets in the passed directory. Cover sheets that already exist from an earlier call with the same seed are kept rather than created again.
+
+    :param directory: The directory to which the cover sheets will be saved. Created if it does not already exist.
+    :param count: The number of cover sheets to create.
+    :param seed: The seed of the random data. The cover sheet at a given position always holds the same data for the same seed.
+    :param image_probability: The probability of embedding an image in each cover sheet.
+    :return: A list of the paths to the cover sheets, in the order they were created.
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    file_paths = []
+
+    for i in range(count):
+        file_path = os.path.join(directory, f"synthetic_cover_sheet_{seed}_{i:05}.docx")
+
+        if not os.path.isfile(file_path):
+            create_synthetic_cover_sheet(file_path, seed=f"{seed}-{i}", image_probability=image_probability)
+
+        file_paths.append(file_path)
+
+    return file_paths
+
+def __add_checkbox_table(document, checkboxes, columns):
+    """
+    Adds a table of checkboxes to the passed document. Each checkbox takes up two cells of a row: one holding the checked (☒) or unchecked (☐) box and one holding its title.
+
+    :param document: A docx Document object to which the table will be added.
+    :param checkboxes: A list of tuples, each holding the title of a checkbox and whether or not it is checked.
+    :param columns: The number of checkboxes in each row of the table.
+    """
+    rows = -(-len(checkboxes) // columns)   # rounds up, such that every checkbox has a row
+    table = document.add_table(rows=rows, cols=columns * 2)
+
+    for i, (title, is_checked) in enumerate(checkboxes):
+        row = table.rows[i // columns]
+        row.cells[(i % columns) * 2].text = "☒" if is_checked else "☐"
+        row.cells[(i % columns) * 2 + 1].text = title
+
+def __get_random_text(rng):
+    """
+    Returns a random sentence built from the words in WORDS.
+
+    :param rng: A Random object used to choose the words.
+    :return: A string holding a random sentence.
+    """
+    return " ".join(rng.choice(WORDS) for i in range(rng.randint(5, 40))).capitalize() + "."
@@ -2,50 +2,162 @@
 Functions related to updating the central database with the most recently read cover sheets.
 """
 
-import pandas as pd
+from src.input.cover_sheets.reading import get_cover_sheet_paths, get_source_path, process_cover_sheet_files
+from src.input.cover_sheets.forms import iter_form_batches
+from src.input.database import get_database_columns, append_to_database
+import src.input.cover_sheets.manifest as manifest_io
+from src.constants import MANIFEST_PATH, NEW_COLUMN_POLICY, NEW_COLUMN_ALLOWLIST
 
-def update_database(database_path, new_data_df):
+# The ways in which columns that are not yet in the database can be handled when updating it. See NEW_COLUMN_POLICY
+NEW_COLUMN_POLICIES = ["add", "ignore", "allowlist", "fail", "prompt"]
+
+def ingest_cover_sheets(database_path, path=None, manifest_path=MANIFEST_PATH, processes=None, new_column_policy=NEW_COLUMN_POLICY, new_column_allowlist=NEW_COLUMN_ALLOWLIST):
+    """
+    Reads the cover sheets in the passed directory that have not been ingested before and appends them to the database. Files are tracked in the ingestion manifest by their contents, such that a run only reads new or changed cover sheets and skips byte-identical resubmissions.
+
+    :param database_path: The path to the central data storage for the project.
+    :param path: The path to the directory where cover sheets are stored. Defaults to the directory specified by a constant.
+    :param manifest_path: The path to the .json file holding the ingestion manifest.
+    :param processes: The number of worker processes used to read the cover sheets. See process_cover_sheet_files.
+    :param new_column_policy: How columns that are not yet in the database are handled. See update_database.
+    :param new_column_allowlist: The columns that are added to the database under the "allowlist" policy. See update_database.
+    :return: A dictionary mapping the path of every file that could not be read to the error message raised while reading it. These files, and any bundle holding one of them, are left out of the manifest so that they are read again on the next run. See ingest_cover_sheet_files.
     """
-    Updates the databased located at the passed path with the new data (read from cover sheets) passed as an argument appended as new rows.
+    file_paths = get_cover_sheet_paths(path)
+
+    if file_paths is None:  # if the directory could not be found
+        return {}
+
+    return ingest_cover_sheet_files(database_path, file_paths, manifest_path=manifest_path, processes=processes, new_column_policy=new_column_policy, new_column_allowlist=new_column_allowlist)
+
+def ingest_cover_sheet_files(database_path, file_paths, manifest_path=MANIFEST_PATH, processes=None, batch_size=None, new_column_policy=NEW_COLUMN_POLICY, new_column_allowlist=NEW_COLUMN_ALLOWLIST):
+    """
+    Reads the cover sheet files at the passed paths that have not been ingested before and appends them to the database, recording them in the ingestion manifest.
+
+    :param database_path: The path to the central data storage for the project.
+    :param file_paths: A list of paths to .docx files, each of which contains a cover sheet.
+    :param manifest_path: The path to the .json file holding the ingestion manifest.
+    :param processes: The number of worker processes used to read the cover sheets. See process_cover_sheet_files.
+    :param batch_size: The maximum number of new cover sheets appended to the database at once. The manifest is saved after each batch, such that an interrupted run only repeats the batch in progress. Defaults to appending all new cover sheets at once.
+    :param new_column_policy: How columns that are not yet in the database are handled. See update_database.
+    :param new_column_allowlist: The columns that are added to the database under the "allowlist" policy. See update_database.
+    :return: A dictionary mapping the path of every file that could not be read to the error message raised while reading it, with cover sheets within a bundle identified as in process_cover_sheet_files. These files, and any bundle holding one of them, are left out of the database and of the manifest so that they are read again on the next run.
+    """
+    manifest = manifest_io.load_manifest(manifest_path)
+    new_paths, entries = manifest_io.get_new_cover_sheet_paths(file_paths, manifest)
+
+    if batch_size is None:
+        batch_size = max(len(new_paths), 1)
+
+    errors = {}
+    for i in range(0, len(new_paths), batch_size):
+        batch_paths = new_paths[i:i + batch_size]
+        new_data_df, batch_errors = process_cover_sheet_files(batch_paths, processes=processes)
+        errors.update(batch_errors)
+
+        # Maps the errors of cover sheets within a bundle to the bundle, such that a bundle holding a cover sheet that could not be read is ingested again as a whole once it is fixed
+        batch_path_set = set(batch_paths)
+        failed_paths = {get_source_path(file_path, batch_path_set) for file_path in batch_errors}
+        if any(file_path not in batch_path_set for file_path in batch_errors):    # if a bundle was read in part, its other cover sheets are left out of the database until it is ingested as a whole
+            new_data_df, _ = process_cover_sheet_files([file_path for file_path in batch_paths if file_path not in failed_paths], processes=processes)
+
+        if len(new_data_df) > 0:
+            update_database(database_path, new_data_df, new_column_policy=new_column_policy, new_column_allowlist=new_column_allowlist)
+
+        # Records the files only after the database has been updated, such that a failed update is retried on the next run
+        manifest_io.record_cover_sheets(manifest, {file_path: entries[file_path] for file_path in batch_paths if file_path not in failed_paths})
+        manifest_io.save_manifest(manifest_path, manifest)
+
+    # Records the files that were skipped as byte-identical resubmissions, such that they are not hashed again on the next run
+    new_path_set = set(new_paths)
+    manifest_io.record_cover_sheets(manifest, {file_path: entry for file_path, entry in entries.items() if file_path not in new_path_set})
+    manifest_io.save_manifest(manifest_path, manifest)
+
+    return errors
+
+def ingest_form_jsonl(database_path, jsonl_path, manifest_path=MANIFEST_PATH, batch_size=500, unmapped_inputs=False, new_column_policy=NEW_COLUMN_POLICY, new_column_allowlist=NEW_COLUMN_ALLOWLIST):
+    """
+    Appends the forms in a JSONL file written by wordformTesting to the database, streaming the file a batch of forms at a time. Loaded forms are recorded in the ingestion manifest, such that running this again over the same (or a resumed) JSONL file only appends the forms that are new or have changed.
+
+    :param database_path: The path to the central data storage for the project.
+    :param jsonl_path: The path to the JSONL file holding one extracted form per line.
+    :param manifest_path: The path to the .json file holding the ingestion manifest.
+    :param batch_size: The maximum number of forms appended to the database at once. The manifest is saved after each batch.
+    :param unmapped_inputs: Whether to append the inputs of the forms that are not mapped to a column of the database (see FORM_COLUMN_MAP), which are then handled by the new-column policy. Defaults to leaving them out.
+    :param new_column_policy: How columns that are not yet in the database are handled. See update_database.
+    :param new_column_allowlist: The columns that are added to the database under the "allowlist" policy. See update_database.
+    :return: The number of forms appended to the database.
+    """
+    manifest = manifest_io.load_manifest(manifest_path)
+    count = 0
+
+    for new_data_df, entries in iter_form_batches(jsonl_path, batch_size=batch_size, manifest=manifest, unmapped_inputs=unmapped_inputs):
+        update_database(database_path, new_data_df, new_column_policy=new_column_policy, new_column_allowlist=new_column_allowlist)
+        count += len(new_data_df)
 
-    :param database_path: The path to the central data storage for the project. Only supports .csv files (could be expanded in the future).
+        # Records the forms only after the database has been updated, such that a failed update is retried on the next run
+        manifest_io.record_cover_sheets(manifest, entries)
+        manifest_io.save_manifest(manifest_path, manifest)
+
+    return count
+
+def update_database(database_path, new_data_df, new_column_policy=NEW_COLUMN_POLICY, new_column_allowlist=NEW_COLUMN_ALLOWLIST):
+    """
+    Updates the databased located at the passed path with the new data (read from cover sheets) passed as an argument appended as new rows. Columns of the new data that are not yet in the database are handled according to the passed policy, which asks for no input from the user unless it is "prompt", such that the database can be updated by scheduled or unattended runs. The decision made for each new column is printed.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database (see src/input/database.py). New rows are added to a partitioned database without rewriting any of its existing files, and are upserted into a SQLite database, such that rows that were already added are replaced rather than duplicated.
     :param new_data_df: A DataFrame holding data to be added to the database, presumably read from cover sheets.
+    :param new_column_policy: How columns that are not yet in the database are handled, one of NEW_COLUMN_POLICIES: "add" adds all of them, which are set at values of NaN for all previous entries; "ignore" leaves all of them out; "allowlist" only adds those in new_column_allowlist; "fail" raises an error without updating the database; "prompt" asks the user on the console which of them to add, as update_database did before these policies were introduced, and is only meant for interactive runs.
+    :param new_column_allowlist: A list of the columns that are added to the database under the "allowlist" policy.
+    :return: A dictionary mapping each column of the new data that was not yet in the database to TRUE if it was added, FALSE if it was left out.
+    """
+    # NOTE: Rows without a value in the key columns (Agency Name, Goal Name, Fiscal Year and Quarter) are rejected by a SQLite database when appended; a .csv database accepts them as they are.
+
+    if new_column_policy not in NEW_COLUMN_POLICIES:
+        raise ValueError(f"\"{new_column_policy}\" is not a valid new column policy. Please use one of: {', '.join(NEW_COLUMN_POLICIES)}.")
+
+    database_columns = set(get_database_columns(database_path))     # reads the columns of the database without reading its rows
+    different_columns = [column for column in new_data_df.columns if column not in database_columns]  # list of columns in the cover sheets but not in database
+
+    if len(different_columns) > 0 and new_column_policy == "fail":
+        raise ValueError(f"The following data fields were retrieved from the cover sheets that are not present in the database: {', '.join(different_columns)}. Set NEW_COLUMN_POLICY (or pass --new-columns to ingest.py) to \"add\", \"ignore\" or \"allowlist\" to update the database.")
+
+    if len(different_columns) > 0 and new_column_policy == "prompt":
+        new_column_allowlist = prompt_new_columns(different_columns)    # the columns chosen by the user are added as under the "allowlist" policy
+
+    added_columns = {column: new_column_policy == "add" or (new_column_policy in ["allowlist", "prompt"] and column in new_column_allowlist) for column in different_columns}
+
+    for column, is_added in added_columns.items():
+        print(f"New column \"{column}\" {'added to' if is_added else 'left out of'} the database (policy: {new_column_policy})")
+
+    # Aligns the new data with the columns to be kept in a single selection, keeping the order of its columns
+    kept_columns = [column for column in new_data_df.columns if added_columns.get(column, True)]
+    append_to_database(database_path, new_data_df.loc[:, kept_columns])
+
+    return added_columns
+
+def prompt_new_columns(different_columns):
+    """
+    Asks the user on the console which of the passed columns, read from cover sheets but not yet in the database, should be added to it: first whether to add all of them, then, if not, whether to add some of them, and if so, whether to add each one.
+
+    :param different_columns: A list of the columns of the new data that are not yet in the database.
+    :return: A list of the columns that the user chose to add.
     """
-    # NOTE: In future refinements of this function, there is an opportunity to reject input/raise an error here if certain columns are missing (e.g., Quarter, Fiscal Year and Agency Name).
-
-    database = pd.read_csv(database_path)
-    different_columns = new_data_df.columns.difference(database.columns).to_list()  # list of columns in the cover sheets but not in database
-
-    # If there are columns in the new data that are not included in the database
-    if len(different_columns) > 0:
-        added_cols_str = "WARNING: The following three data fields were retrieved from the cover sheet that are not present in the database:\n"
-        for column in different_columns:
-            added_cols_str += f"\t\"{column}\"\n"
-
-        # Console prompt asking user whether or not they want to add new columns to database
-        added_cols_str += "Would you like to add all of these columns to the database? Enter Y/N: "
-        
-        create_new_columns = handle_yes_no_input(added_cols_str)
-
-        if create_new_columns:
-            database = database.append(new_data_df)     # appends new data with new columns, which are set at values of NaN for all previous entries
-        else:
-            # Retrieving list of columns in both database and new data
-            common_cols = (new_data_df.columns & database.columns).tolist()
-            
-            # Initiating the addition of some of the columns in the new data, but not all
-            if handle_yes_no_input("Would you like to add some, but not all, of the above listed columns to the database? Enter Y/N: "):
-                for column in different_columns:
-                    if handle_yes_no_input(f"Would you like to add the \"{column}\" column? Enter Y/N: "):
-                        common_cols.append(column)  # add the selected column to the list of columns to be used
-            
-            common_slice = new_data_df.loc[:, common_cols]  # only selects columns from new data DataFrame that are in database, no new columns added
-            
-            database = database.append(common_slice)
-    else:   # if all columns in new data are in database
-        database = database.append(new_data_df)
-
-    database.to_csv(database_path, index=False)
+    added_cols_str = "WARNING: The following data fields were retrieved from the cover sheets that are not present in the database:\n"
+    for column in different_columns:
+        added_cols_str += f"\t\"{column}\"\n"
+
+    # Console prompt asking user whether or not they want to add new columns to database
+    added_cols_str += "Would you like to add all of these columns to the database? Enter Y/N: "
+
+    if handle_yes_no_input(added_cols_str):
+        return list(different_columns)
+
+    # Initiating the addition of some of the columns in the new data, but not all
+    if handle_yes_no_input("Would you like to add some, but not all, of the above listed columns to the database? Enter Y/N: "):
+        return [column for column in different_columns if handle_yes_no_input(f"Would you like to add the \"{column}\" column? Enter Y/N: ")]
+
+    return []
 
 def handle_yes_no_input(prompt):
     """
@@ -0,0 +1,110 @@
+"""
+Functions related to watching the cover sheet directory and ingesting cover sheets as they are published.
+"""
+
+from src.input.cover_sheets.reading import get_cover_sheet_paths, get_source_path
+from src.input.cover_sheets.upload import ingest_cover_sheet_files
+import src.input.cover_sheets.manifest as manifest_io
+from src.constants import COVER_SHEET_DIRECTORY, MANIFEST_PATH, NEW_COLUMN_POLICY, NEW_COLUMN_ALLOWLIST
+
+from datetime import datetime
+import time
+import os
+
+def watch_cover_sheets(database_path, path=None, manifest_path=MANIFEST_PATH, poll_interval=10, settle_time=5, batch_size=25, processes=1, max_polls=None, new_column_policy=NEW_COLUMN_POLICY, new_column_allowlist=NEW_COLUMN_ALLOWLIST):
+    """
+    Polls the cover sheet directory and appends each new cover sheet to the database shortly after it lands. Runs until interrupted (e.g., with Ctrl+C) unless a maximum number of polls is passed.
+
+    A file is only read once it has settled, i.e., once its size and modification time are the same as on the previous poll and it has not been modified for the passed number of seconds, such that files that are still being copied into the directory are not read partway through. Files that could not be read, or whose columns were rejected by the new-column policy, are not retried until they change.
+
+    :param database_path: The path to the central data storage for the project.
+    :param path: The path to the directory where cover sheets are stored. Defaults to the directory specified by a constant.
+    :param manifest_path: The path to the .json file holding the ingestion manifest. See ingest_cover_sheet_files.
+    :param poll_interval: The number of seconds to wait between polls of the directory.
+    :param settle_time: The minimum number of seconds since a file was last modified before it is read.
+    :param batch_size: The maximum number of cover sheets appended to the database at once.
+    :param processes: The number of worker processes used to read the cover sheets. See process_cover_sheet_files.
+    :param max_polls: The number of polls after which to stop watching. Defaults to watching indefinitely.
+    :param new_column_policy: How columns that are not yet in the database are handled. See update_database.
+    :param new_column_allowlist: The columns that are added to the database under the "allowlist" policy. See update_database.
+    """
+    if path == None:
+        path = COVER_SHEET_DIRECTORY
+
+    previous_stats = {}     # maps the path of each file seen on the previous poll to its size and modification time
+    failed_stats = {}   # maps the path of each file that could not be read to its size and modification time when it was read
+    polls = 0
+
+    print(f"Watching {path} for new cover sheets every {poll_interval} seconds")
+
+    try:
+        while max_polls is None or polls < max_polls:
+            current_stats = __get_file_stats(get_cover_sheet_paths(path) or [])
+            settled_paths = get_settled_paths(current_stats, previous_stats, settle_time)
+            settled_paths = [file_path for file_path in settled_paths if failed_stats.get(file_path) != current_stats[file_path]]     # skips files that failed to read and have not changed since
+
+            manifest = manifest_io.load_manifest(manifest_path)
+            settled_paths = [file_path for file_path in settled_paths if file_path not in manifest or (manifest[file_path]["size"], manifest[file_path]["mtime"]) != current_stats[file_path]]     # skips files that were ingested and have not changed since, without opening the manifest for every batch
+
+            errors = {}
+            for i in range(0, len(settled_paths), batch_size):    # ingests a batch at a time, such that a batch whose columns are rejected by the new-column policy does not hold back the others
+                batch_paths = settled_paths[i:i + batch_size]
+                try:
+                    errors.update(ingest_cover_sheet_files(database_path, batch_paths, manifest_path=manifest_path, processes=processes, new_column_policy=new_column_policy, new_column_allowlist=new_column_allowlist))
+                except ValueError as e:     # if the new-column policy rejected the columns of the batch, which is left out of the manifest
+                    print(f"{__timestamp()} Unable to update the database with {', '.join(batch_paths)}: {e}")
+                    failed_stats.update({file_path: current_stats[file_path] for file_path in batch_paths})
+
+            for file_path, error in errors.items():
+                source_path = get_source_path(file_path, current_stats)    # the bundle holding the cover sheet, if it was read from one
+                failed_stats[source_path] = current_stats[source_path]
+                print(f"{__timestamp()} Unable to read cover sheet {file_path}: {error}")
+
+            previous_stats = current_stats
+            polls += 1
+
+            if max_polls is None or polls < max_polls:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print(f"{__timestamp()} Stopped watching {path}")
+
+def get_settled_paths(current_stats, previous_stats, settle_time, now=None):
+    """
+    Returns the paths of the files that have not changed since the previous poll and have not been modified for at least the passed number of seconds.
+
+    :param current_stats: A dictionary mapping the path of each file found on the current poll to a tuple of its size and modification time.
+    :param previous_stats: A dictionary in the same format as current_stats, holding the files found on the previous poll.
+    :param settle_time: The minimum number of seconds since a file was last modified for it to be considered settled.
+    :param now: The current time as a timestamp. Defaults to the time of the call.
+    :return: A list of the paths of the settled files, in the order of current_stats.
+    """
+    if now is None:
+        now = time.time()
+
+    return [file_path for file_path, stat in current_stats.items() if previous_stats.get(file_path) == stat and now - stat[1] >= settle_time]
+
+def __get_file_stats(file_paths):
+    """
+    Returns the size and modification time of each of the files at the passed paths. Files that are removed before they can be inspected are left out.
+
+    :param file_paths: A list of paths to files.
+    :return: A dictionary mapping each file path to a tuple of the file's size and modification time.
+    """
+    file_stats = {}
+
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        file_stats[file_path] = (stat.st_size, stat.st_mtime)
+
+    return file_stats
+
+def __timestamp():
+    """
+    Returns the current time formatted for the messages printed while watching the cover sheet directory.
+
+    :return: The current time as a string in the format "[YYYY-MM-DD HH:MM:SS]".
+    """
+    return datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
@@ -0,0 +1,558 @@
+"""
+Functions related to storing and loading the central database. The database is either a single .csv file, a SQLite database file, or a directory holding a columnar (Parquet or Feather) database partitioned by fiscal year and quarter.
+
+Loaded data is given the types set out in the database schema in src/constants.py: columns holding a small set of repeated values (e.g., agency names and goal statuses) are loaded as categories, which hold each distinct value once and are compared as integer codes, and checkbox columns as 8-bit integers. The long free-text columns can be left out when loading the data, and loaded later for only the rows that need them.
+
+A SQLite database holds a single table, in which each row is identified by its agency, goal, fiscal year and quarter (see KEY_COLUMNS). The key columns are indexed, such that the rows of an agency or of a quarter are looked up rather than scanned for, and a row added with the same key as an existing row replaces the values of the existing row, such that reading a resubmitted or already-ingested cover sheet again does not duplicate it. Rows without a value in every key column are rejected, as SQLite would treat them as distinct from every other row. Each append is made in a single transaction.
+
+In a partitioned database, the rows of each fiscal year and quarter are stored in their own directory, named after the partition (e.g., "Fiscal Year=2020/Quarter=Q4"), and new rows are always written to a new file within the directory of their partition, such that existing files are never rewritten. Rows without a fiscal year or quarter are rejected, rather than being gathered into a partition that no reader could prune. The files making up the database are listed in an index file at the root of the directory, along with the partition and columns of each, which is only updated once a file has been written in full. Readers use the index to load only the partitions and columns they need.
+"""
+
+from src.constants import AGENCY_NAME_TO_ABBREVIATION, CATEGORY_COLUMNS, FLAG_COLUMNS, TEXT_COLUMNS
+
+from contextlib import contextmanager
+import pandas as pd
+import sqlite3
+import json
+import os
+
+# The columns by which a partitioned database is partitioned, outermost first
+PARTITION_COLUMNS = ["Fiscal Year", "Quarter"]
+
+# The file formats in which the partitions of a database can be stored, mapped to the extension of their files
+PARTITION_FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather"
+}
+
+# The columns identifying a row of a SQLite database, mapped to the type with which each is declared, such that equal values read from different sources (e.g., 2020 and "2020") are stored in the same way
+KEY_COLUMNS = {
+    "Agency Name": "TEXT",
+    "Goal Name": "TEXT",
+    "Fiscal Year": "INTEGER",
+    "Quarter": "TEXT"
+}
+
+# File extensions of SQLite databases
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# The name of the table holding the rows of a SQLite database
+SQLITE_TABLE = "cover_sheets"
+
+# The name of the index file at the root of a partitioned database
+INDEX_FILENAME = "_index.json"
+
+def get_database_backend(database_path):
+    """
+    Returns the type of the database at the passed path, based on its extension.
+
+    :param database_path: The path to the central data storage for the project.
+    :return: "csv" for a .csv file, "sqlite" for a file with one of the extensions in SQLITE_EXTENSIONS, or "partitioned" for any other path, which is taken to be the directory of a partitioned database.
+    """
+    if database_path.lower().endswith(".csv"):
+        return "csv"
+    elif database_path.lower().endswith(SQLITE_EXTENSIONS):
+        return "sqlite"
+    else:
+        return "partitioned"
+
+def load_database(database_path, columns=None, fiscal_years=None, quarters=None, agencies=None, text_columns=True, typed=True):
+    """
+    Returns the contents of the database at the passed path, or of the passed subset of its columns, fiscal years, quarters and agencies. Only the matching rows and columns are read from a SQLite database, and only the matching partitions and columns are read from a partitioned database; a .csv database is read in full, after which the matching rows and columns are selected.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+    :param columns: A list of the columns to load. Columns that are not in the database are left out. Defaults to all of the columns.
+    :param fiscal_years: A list of the fiscal years to load. Defaults to all of the fiscal years.
+    :param quarters: A list of the quarters to load (e.g., ["Q3", "Q4"]). Defaults to all of the quarters.
+    :param agencies: A list of the abbreviations of the agencies to load. Defaults to all of the agencies.
+    :param text_columns: Whether to load the free-text columns in TEXT_COLUMNS. If FALSE, they are left out, even if they are passed in columns, and can be loaded later with load_text_columns.
+    :param typed: Whether to give the loaded columns the types in the database schema. See apply_database_schema.
+    :return: A DataFrame holding the loaded rows, with a fresh index. Rows from a partitioned database are in the order of their fiscal year and quarter, then the order in which they were added; rows from other databases are in the order they were added.
+    """
+    backend = get_database_backend(database_path)
+
+    if not text_columns:
+        columns = [column for column in (get_database_columns(database_path) if columns is None else columns) if column not in TEXT_COLUMNS]
+
+    database = __load_database(database_path, backend, columns, fiscal_years, quarters, agencies)
+
+    return apply_database_schema(database) if typed else database
+
+def __load_database(database_path, backend, columns, fiscal_years, quarters, agencies):
+    """
+    Returns the passed subset of the rows and columns of the database at the passed path, with the types they were stored with. See load_database.
+
+    :param database_path: The path to the central data storage for the project.
+    :param backend: The type of the database, as returned by get_database_backend.
+    :param columns: A list of the columns to load, or None to load all of them.
+    :param fiscal_years: A list of the fiscal years to load, or None to load all of them.
+    :param quarters: A list of the quarters to load, or None to load all of them.
+    :param agencies: A list of the abbreviations of the agencies to load, or None to load all of them.
+    :return: A DataFrame holding the loaded rows, with a fresh index.
+    """
+
+    if backend == "sqlite":
+        conditions = [(column, values) for column, values in [("Fiscal Year", fiscal_years), ("Quarter", quarters), ("Agency Name", agencies)] if values is not None]
+        where = " AND ".join(f"{__quote(column)} IN ({', '.join('?' * len(values))})" for column, values in conditions)
+        return __query_sqlite(database_path, columns, where, [value for column, values in conditions for value in values])
+
+    if backend == "csv":
+        filter_columns = [column for column, values in [("Fiscal Year", fiscal_years), ("Quarter", quarters), ("Agency Name", agencies)] if values is not None]
+        database = pd.read_csv(database_path, usecols=None if columns is None else lambda column: column in columns or column in filter_columns)   # only parses the columns that are needed
+
+        if fiscal_years is not None:
+            database = database.loc[database["Fiscal Year"].isin(fiscal_years)]
+        if quarters is not None:
+            database = database.loc[database["Quarter"].isin(quarters)]
+    else:
+        index = load_index(database_path)
+        frames = []
+
+        for entry in get_partition_files(index, fiscal_years, quarters):
+            file_columns = entry["columns"] if columns is None else [column for column in entry["columns"] if column in columns or (column == "Agency Name" and agencies is not None)]     # reads the agency of each row when filtering by agency, even if it was not requested
+            frames.append(__read_partition_file(os.path.join(database_path, entry["path"]), index["format"], file_columns))
+
+        if len(frames) == 0:   # if no partition matches, returns the matching columns without any rows
+            database_columns = get_database_columns(database_path)
+            return pd.DataFrame(columns=database_columns if columns is None else [column for column in columns if column in database_columns])
+
+        database = pd.concat(frames, ignore_index=True)     # columns missing from the files of earlier partitions are NaN in their rows
+
+    if agencies is not None:
+        database = database.loc[database["Agency Name"].isin(agencies)]
+
+    if columns is not None:
+        database = database.loc[:, [column for column in columns if column in database.columns]]     # keeps the order of the passed columns
+
+    return database.reset_index(drop=True)
+
+def load_agency_database(database_path, agency, quarter, year, text_columns=True, typed=True):
+    """
+    Returns the rows of the database needed to create an Agency object: every row of the passed agency, along with the rows of every agency in the passed quarter and fiscal year, against which the agency is compared. An Agency object created from the returned DataFrame is the same as one created from the whole database. The rows are looked up through the indexes of a SQLite database, rather than by scanning the whole database.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+    :param agency: The abbreviation or full name of the agency.
+    :param quarter: The quarter that the agency will be reporting on.
+    :param year: The fiscal year that the agency will be reporting on.
+    :param text_columns: Whether to load the free-text columns in TEXT_COLUMNS. See load_database.
+    :param typed: Whether to give the loaded columns the types in the database schema. See apply_database_schema.
+    :return: A DataFrame holding the matching rows, in the order they are held in the database, with a fresh index.
+    """
+    abbreviation = AGENCY_NAME_TO_ABBREVIATION.get(agency, agency)
+    columns = None if text_columns else [column for column in get_database_columns(database_path) if column not in TEXT_COLUMNS]
+
+    if get_database_backend(database_path) == "sqlite":
+        where = f"{__quote('Agency Name')} = ? OR ({__quote('Fiscal Year')} = ? AND {__quote('Quarter')} = ?)"
+        database = __query_sqlite(database_path, columns, where, [abbreviation, year, quarter])
+    else:
+        database = load_database(database_path, columns=columns, typed=False)
+        database = database.loc[(database["Agency Name"] == abbreviation) | ((database["Fiscal Year"] == year) & (database["Quarter"] == quarter))].reset_index(drop=True)
+
+    return apply_database_schema(database) if typed else database
+
+def load_text_columns(database_path, df):
+    """
+    Returns the passed DataFrame with the free-text columns in TEXT_COLUMNS added to it, loaded from the database for only the rows it holds. Used to load the free text of the rows that need it after loading the rest of the data without it.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+    :param df: A DataFrame holding rows of the database, including their key columns (see KEY_COLUMNS).
+    :return: A copy of the passed DataFrame, with the same index, to which the free-text columns of the database are added. Rows that are not found in the database are NaN in the added columns.
+    """
+    text_columns = [column for column in get_database_columns(database_path) if column in TEXT_COLUMNS and column not in df.columns]
+    keys = list(KEY_COLUMNS)
+
+    text_df = load_database(database_path, columns=keys + text_columns, fiscal_years=df["Fiscal Year"].unique().tolist(), quarters=df["Quarter"].unique().tolist(), agencies=df["Agency Name"].unique().tolist(), typed=False)
+    text_df = text_df.drop_duplicates(subset=keys, keep="last")     # rows added later replace earlier rows with the same key
+
+    key_df = df.loc[:, keys].astype(object)     # matches the keys by value, whatever the types they were loaded with
+    merged = key_df.merge(text_df.astype({key: object for key in keys}), on=keys, how="left")
+
+    result = df.copy()
+    for column in text_columns:
+        result[column] = merged[column].values
+
+    return result
+
+def apply_database_schema(df):
+    """
+    Returns the passed DataFrame with the types set out in the database schema: the columns in CATEGORY_COLUMNS as categories, and the columns in FLAG_COLUMNS as 8-bit integers, or as 32-bit floats if some of their values are missing. Other columns keep their types.
+
+    :param df: A DataFrame holding rows of the database.
+    :return: A copy of the passed DataFrame with the types of the schema.
+    """
+    dtypes = {column: "category" for column in CATEGORY_COLUMNS if column in df.columns}
+
+    for column in FLAG_COLUMNS:
+        if column in df.columns:
+            dtypes[column] = "int8" if df[column].notna().all() else "float32"     # integers cannot hold NaN
+
+    return df.astype(dtypes)
+
+def get_database_columns(database_path):
+    """
+    Returns the columns of the database at the passed path, without reading any of its rows.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+    :return: A list of the columns of the database, in the order they were added.
+    """
+    backend = get_database_backend(database_path)
+
+    if backend == "csv":
+        return pd.read_csv(database_path, nrows=0).columns.to_list()
+    elif backend == "sqlite":
+        with __sqlite_transaction(database_path) as connection:
+            return __get_sqlite_columns(connection)
+
+    columns = {}
+    for entry in load_index(database_path)["files"]:
+        columns.update(dict.fromkeys(entry["columns"]))
+
+    return list(columns)
+
+def append_to_database(database_path, new_data_df):
+    """
+    Appends the rows of the passed DataFrame to the database at the passed path. Rows are written to a new file in the partition of their fiscal year and quarter, such that none of the existing files of a partitioned database are rewritten; a .csv database is rewritten in full.
+
+    Rows are upserted into a SQLite database, in a single transaction: a row with the same agency, goal, fiscal year and quarter as a row already in the database replaces the values of the existing row in the columns of the passed DataFrame, rather than being added as a new row. A ValueError is raised, and no rows are added, if any row has no value in one of these key columns.
+
+    Likewise, a ValueError is raised, and no rows are added to a partitioned database, if any row has no fiscal year or quarter, as a row cannot be placed in a partition without them.
+
+    :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+    :param new_data_df: A DataFrame holding the rows to be appended. Columns that are not in the database are added to it, and are NaN for all previous rows.
+    """
+    backend = get_database_backend(database_path)
+
+    if backend == "csv":
+        database = pd.read_csv(database_path)
+        database = pd.concat([database, new_data_df])   # columns that are only in the new data are NaN for all previous rows
+        database.to_csv(database_path, index=False)
+        return
+    elif backend == "sqlite":
+        __upsert_sqlite(database_path, new_data_df)
+        return
+
+    __check_key_values(new_data_df, PARTITION_COLUMNS, "the partition of each row of a partitioned database")
+
+    index = load_index(database_path)
+
+    for partition, partition_df in __group_by_partition(new_data_df):
+        directory = __get_partition_directory(partition)
+        os.makedirs(os.path.join(database_path, directory), exist_ok=True)
+
+        path = os.path.join(directory, f"part-{len(index['files']):05}{PARTITION_FORMATS[index['format']]}")     # numbered by the order in which the files were added, such that every file name is unique
+        __write_partition_file(partition_df, os.path.join(database_path, path), index["format"])
+
+        index["files"].append({
+            "path": path.replace(os.sep, "/"),
+            "partition": partition,
+            "columns": partition_df.columns.to_list(),
+            "rows": len(partition_df)
+        })
+
+    save_index(database_path, index)    # records the new files only once all of them have been written in full, such that an interrupted append leaves the database unchanged
+
+def create_database(database_path, partition_format="parquet"):
+    """
+    Creates an empty SQLite or partitioned database at the passed path.
+
+    :param database_path: The path to a SQLite database file, or to the directory of a partitioned database, which is created if it does not already exist.
+    :param partition_format: The file format in which partitions are stored, one of the keys of PARTITION_FORMATS. Not used for SQLite databases.
+    """
+    if get_database_backend(database_path) == "sqlite":
+        if os.path.exists(database_path):
+            raise FileExistsError(f"A database already exists at {database_path}.")
+
+        with __sqlite_transaction(database_path) as connection:
+            __add_sqlite_columns(connection, list(KEY_COLUMNS))
+        return
+
+    if partition_format not in PARTITION_FORMATS:
+        raise ValueError(f"\"{partition_format}\" is not a valid partition format. Please use one of: {', '.join(PARTITION_FORMATS)}.")
+
+    if os.path.isfile(os.path.join(database_path, INDEX_FILENAME)):
+        raise FileExistsError(f"A database already exists at {database_path}.")
+
+    os.makedirs(database_path, exist_ok=True)
+    save_index(database_path, {"format": partition_format, "partition_columns": PARTITION_COLUMNS, "files": []})
+
+def migrate_csv_database(csv_path, database_path, partition_format="parquet"):
+    """
+    Copies the .csv database at the passed path into a new SQLite or partitioned database. The .csv file is left unchanged. Rows of the .csv file sharing the same agency, goal, fiscal year and quarter are merged when copied into a SQLite database, with later rows replacing earlier ones.
+
+    :param csv_path: The path to the .csv database.
+    :param database_path: The path to the new SQLite database file, or to the directory of the new partitioned database. Must not already hold a database.
+    :param partition_format: The file format in which partitions are stored, one of the keys of PARTITION_FORMATS. Not used for SQLite databases.
+    :return: The number of rows read from the .csv file.
+    """
+    database = pd.read_csv(csv_path)
+
+    if get_database_backend(database_path) == "sqlite":
+        if os.path.exists(database_path):
+            raise FileExistsError(f"A database already exists at {database_path}.")
+    else:
+        create_database(database_path, partition_format=partition_format)   # SQLite tables are created with the columns of the .csv file, in the same order, when the rows are first added
+
+    append_to_database(database_path, database)
+
+    return len(database)
+
+def load_index(database_path):
+    """
+    Loads the index of the partitioned database at the passed path.
+
+    :param database_path: The path to the directory of a partitioned database.
+    :return: A dictionary holding the format of the files of the database, its partition columns and a list of its files, each a dictionary holding the path of the file relative to the database, its partition, columns and number of rows.
+    """
+    index_path = os.path.join(database_path, INDEX_FILENAME)
+
+    if not os.path.isfile(index_path):
+        raise FileNotFoundError(f"No partitioned database was found at {database_path}. Create one with migrate_database.py.")
+
+    with open(index_path) as f:
+        return json.load(f)
+
+def save_index(database_path, index):
+    """
+    Saves the passed index to the partitioned database at the passed path. The index is written to a temporary file first, such that an interrupted save leaves the previous index intact.
+
+    :param database_path: The path to the directory of a partitioned database.
+    :param index: A dictionary holding the index of the database, as returned by load_index.
+    """
+    index_path = os.path.join(database_path, INDEX_FILENAME)
+    temp_path = f"{index_path}.tmp"
+
+    with open(temp_path, "w") as f:
+        json.dump(index, f, indent=4)
+
+    os.replace(temp_path, index_path)
+
+def get_partition_files(index, fiscal_years=None, quarters=None):
+    """
+    Returns the files of a partitioned database that hold rows from the passed fiscal years and quarters.
+
+    :param index: A dictionary holding the index of a partitioned database, as returned by load_index.
+    :param fiscal_years: A list of fiscal years. Defaults to all of the fiscal years.
+    :param quarters: A list of quarters. Defaults to all of the quarters.
+    :return: A list of the entries of the index describing the matching files, ordered by fiscal year and quarter, then by the order in which they were added.
+    """
+    if fiscal_years is not None:
+        fiscal_years = {__get_partition_value(year) for year in fiscal_years}
+    if quarters is not None:
+        quarters = {__get_partition_value(quarter) for quarter in quarters}
+
+    files = [entry for entry in index["files"] if (fiscal_years is None or entry["partition"][0] in fiscal_years) and (quarters is None or entry["partition"][1] in quarters)]
+
+    return sorted(files, key=lambda entry: [__get_partition_sort_key(value) for value in entry["partition"]])
+
+def __group_by_partition(df):
+    """
+    Splits the passed DataFrame into the rows of each partition, keeping the order of the rows within each partition.
+
+    :param df: A DataFrame holding rows of the database, each of which has a value in every partition column.
+    :return: A list of tuples, each holding the values of the partition columns of a partition, as a list, followed by a DataFrame holding its rows with a fresh index. Partitions are in the order they first appear in the passed DataFrame.
+    """
+    values = [df[column].map(__get_partition_value).to_list() for column in PARTITION_COLUMNS]
+    positions = {}
+
+    for i, key in enumerate(zip(*values)):
+        positions.setdefault(key, []).append(i)
+
+    return [(list(key), df.iloc[rows].reset_index(drop=True)) for key, rows in positions.items()]
+
+def __get_partition_value(value):
+    """
+    Returns the passed value of a partition column in the form in which it is stored in the index, such that equal values read from different sources (e.g., 2020 and 2020.0) fall into the same partition.
+
+    :param value: The value of a partition column in a row.
+    :return: None if the value is missing, an integer if the value is a whole number, otherwise the value as a string.
+    """
+    if pd.isna(value):
+        return None
+
+    try:
+        if float(value) == int(float(value)):
+            return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return str(value)
+
+def __get_partition_sort_key(value):
+    """
+    Returns the key by which partitions are sorted on the passed value of a partition column: numbers first, in numeric order, then strings, then missing values.
+
+    :param value: The value of a partition column, as stored in the index.
+    :return: A tuple that can be compared with the key of any other value.
+    """
+    if value is None:
+        return (2, 0, "")
+    elif isinstance(value, int):
+        return (0, value, "")
+    else:
+        return (1, 0, value)
+
+def __get_partition_directory(partition):
+    """
+    Returns the path of the directory of the passed partition, relative to the root of the database.
+
+    :param partition: A list of the values of the partition columns of a partition.
+    :return: A path with a directory for each partition column, named after the column and its value.
+    """
+    return os.path.join(*[f"{column}={value}" for column, value in zip(PARTITION_COLUMNS, partition)])
+
+def __write_partition_file(df, path, partition_format):
+    """
+    Writes the passed DataFrame to a file of the passed format.
+
+    :param df: A DataFrame with a default index.
+    :param path: The path of the file.
+    :param partition_format: The file format, one of the keys of PARTITION_FORMATS.
+    """
+    if partition_format == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+
+def __read_partition_file(path, partition_format, columns):
+    """
+    Reads the passed columns from a file of the passed format.
+
+    :param path: The path of the file.
+    :param partition_format: The file format, one of the keys of PARTITION_FORMATS.
+    :param columns: A list of the columns to read, all of which are held by the file.
+    :return: A DataFrame holding the passed columns of every row in the file.
+    """
+    if partition_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    else:
+        return pd.read_feather(path, columns=columns)
+
+@contextmanager
+def __sqlite_transaction(database_path):
+    """
+    Opens a connection to the SQLite database at the passed path and runs the statements made through it in a single transaction, which is committed when the block is left normally and rolled back if an error is raised.
+
+    :param database_path: The path to a SQLite database file, which is created if it does not already exist.
+    :return: A context manager yielding the connection.
+    """
+    connection = sqlite3.connect(database_path, isolation_level=None)   # transactions are managed here, such that changes to the table are made in the same transaction as the rows
+    try:
+        connection.execute("BEGIN")
+        yield connection
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+def __upsert_sqlite(database_path, df):
+    """
+    Adds the rows of the passed DataFrame to the SQLite database at the passed path, replacing the values of any existing row with the same key, and adds any of its columns that are not yet in the database. Made in a single transaction, such that either all of the rows are added or none are.
+
+    :param database_path: The path to a SQLite database file. The file and its table are created if they do not already exist.
+    :param df: A DataFrame holding the rows to be added, each of which must have a value in every key column (see KEY_COLUMNS). Raises a ValueError, without adding any rows, if one does not.
+    """
+    __check_key_values(df, list(KEY_COLUMNS), "the key of each row of a SQLite database (SQLite treats missing key values as distinct, such that the rows would be added again rather than replaced each time they are ingested)")
+
+    columns = df.columns.to_list()
+    key_columns = list(KEY_COLUMNS)
+    update_columns = [column for column in columns if column not in KEY_COLUMNS]
+
+    if len(update_columns) > 0:
+        on_conflict = "DO UPDATE SET " + ", ".join(f"{__quote(column)} = excluded.{__quote(column)}" for column in update_columns)
+    else:
+        on_conflict = "DO NOTHING"
+
+    statement = f"INSERT INTO {SQLITE_TABLE} ({', '.join(__quote(column) for column in columns)}) VALUES ({', '.join('?' * len(columns))}) ON CONFLICT ({', '.join(__quote(column) for column in key_columns)}) {on_conflict}"
+    rows = df.astype(object).where(df.notna(), None).values.tolist()   # converts NumPy values to Python values, and NaN to NULL
+
+    with __sqlite_transaction(database_path) as connection:
+        __add_sqlite_columns(connection, columns)
+        connection.executemany(statement, rows)
+
+def __check_key_values(df, columns, reason):
+    """
+    Raises a ValueError if the passed DataFrame lacks one of the passed columns, or if any of its rows has no value in one of them. Cover sheets in the legacy table layout, read by read_cover_sheet, hold no agency, goal, fiscal year or quarter, which have to be set on their rows before they are added to a database that relies on them.
+
+    :param df: A DataFrame holding the rows to be added to a database.
+    :param columns: A list of the columns in which every row must have a value.
+    :param reason: Why the columns are needed, given in the error message.
+    """
+    missing_columns = [column for column in columns if column not in df.columns]
+
+    if len(missing_columns) > 0:
+        raise ValueError(f"The rows to be added to the database lack the following columns, which are needed as {reason}: {', '.join(missing_columns)}. Set these columns on the rows before adding them, or use a .csv database.")
+
+    missing_rows = df[columns].isna().any(axis=1)
+
+    if missing_rows.any():
+        raise ValueError(f"{missing_rows.sum()} of the {len(df)} rows to be added to the database have no value in one or more of the following columns, which are needed as {reason}: {', '.join(columns)}. Set these columns on the rows before adding them, or use a .csv database.")
+
+def __query_sqlite(database_path, columns, where, parameters):
+    """
+    Returns the rows of the SQLite database at the passed path that match the passed condition.
+
+    :param database_path: The path to a SQLite database file.
+    :param columns: A list of the columns to load, or None to load all of them. Columns that are not in the database are left out.
+    :param where: An SQL condition, in which values are given as "?" placeholders, or an empty string to load every row.
+    :param parameters: A list of the values of the placeholders in the condition.
+    :return: A DataFrame holding the matching rows, in the order they were added, with NaN for NULL values.
+    """
+    if not os.path.isfile(database_path):
+        raise FileNotFoundError(f"No SQLite database was found at {database_path}. Create one with migrate_database.py.")
+
+    with __sqlite_transaction(database_path) as connection:
+        database_columns = __get_sqlite_columns(connection)
+        columns = database_columns if columns is None else [column for column in columns if column in database_columns]
+
+        if len(columns) == 0:   # if the table has not been created, as no rows have been added yet
+            return pd.DataFrame()
+
+        query = f"SELECT {', '.join(__quote(column) for column in columns)} FROM {SQLITE_TABLE}"
+        if where:
+            query += f" WHERE {where}"
+        query += " ORDER BY rowid"
+
+        database = pd.read_sql_query(query, connection, params=parameters)
+
+    return database.fillna(value=float("nan"))  # missing values are read as None in columns of text
+
+def __get_sqlite_columns(connection):
+    """
+    Returns the columns of the table of a SQLite database.
+
+    :param connection: A connection to a SQLite database.
+    :return: A list of the columns of the table, in the order they were added, or an empty list if the table has not been created.
+    """
+    return [row[1] for row in connection.execute(f"PRAGMA table_info({SQLITE_TABLE})")]
+
+def __add_sqlite_columns(connection, columns):
+    """
+    Adds the passed columns to the table of a SQLite database, creating the table and its indexes if it does not exist.
+
+    :param connection: A connection to a SQLite database.
+    :param columns: A list of columns, some of which may already be in the table.
+    """
+    existing_columns = __get_sqlite_columns(connection)
+
+    if len(existing_columns) == 0:
+        columns = columns + [column for column in KEY_COLUMNS if column not in columns]    # the key columns are always part of the table
+        definitions = [f"{__quote(column)} {KEY_COLUMNS[column]}" if column in KEY_COLUMNS else __quote(column) for column in columns]
+        connection.execute(f"CREATE TABLE {SQLITE_TABLE} ({', '.join(definitions)})")
+        connection.execute(f"CREATE UNIQUE INDEX {SQLITE_TABLE}_key ON {SQLITE_TABLE} ({', '.join(__quote(column) for column in KEY_COLUMNS)})")
+        connection.execute(f"CREATE INDEX {SQLITE_TABLE}_quarter ON {SQLITE_TABLE} ({__quote('Fiscal Year')}, {__quote('Quarter')})")    # looks up the rows of every agency in a quarter, which the key index cannot
+        return
+
+    for column in columns:
+        if column not in existing_columns:
+            connection.execute(f"ALTER TABLE {SQLITE_TABLE} ADD COLUMN {__quote(column)}")
+
+def __quote(identifier):
+    """
+    Returns the passed column or table name quoted for use in an SQL statement.
+
+    :param identifier: The name of a column or table.
+    :return: The name enclosed in double quotes, with any double quotes within it escaped.
+    """
+    return '"' + str(identifier).replace('"', '""') + '"'
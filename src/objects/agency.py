@@ -2,17 +2,20 @@
 Holds definition of Agency class and its associated methods.
 """
 
-from src.constants import OUTCOMES_LIST, THEMATIC_MAPPING_DF, CHALLENGES_LIST, THEMES_LIST, CAP_GOALS_LIST, AGENCY_NAME_TO_ABBREVIATION, AGENCY_ABBREVIATION_TO_NAME
+from src.constants import CHALLENGES_LIST, AGENCY_NAME_TO_ABBREVIATION, AGENCY_ABBREVIATION_TO_NAME
+from src.objects.thematic_mapping import THEMATIC_MAPPING
 import src.utility as utility
 
+import numpy as np
 import pandas as pd
 
 class Agency():
     """
     Represents a CFO Act agency at a given quarter and fiscal year and contains data related to the performance of its APGs over quarters and fiscal years.
     """
+    NO_POSITIONS = np.array([], dtype=np.intp)  # positions returned when no rows match a lookup
     
-    def __init__(self, df, name, current_quarter, current_year):
+    def __init__(self, df, name, current_quarter, current_year, agency_df=None, theme_challenge_index=None):
         """
         Constructor method; creates a Agency object initialized with the basic attributes of a agency being reported on.
 
@@ -20,6 +23,8 @@ class Agency():
         :param name: The name of the agency that this object represents. Takes either an abbreviation or a full agency name.
         :param current_quarter: The quarter that this agency will be reporting on.
         :param current_year: The year that this agency will be reporting on. 
+        :param agency_df: The rows of the central DataFrame relevant to the agency, if they have already been selected (e.g., by a Dataset object). Defaults to selecting them from the central DataFrame.
+        :param theme_challenge_index: The index of the APG teams working on each theme and challenge in the current quarter and fiscal year, if it has already been built (e.g., by a Dataset object). See ThematicMapping.get_theme_challenge_index. Defaults to building it from the central DataFrame when first needed.
         """
         if name in AGENCY_ABBREVIATION_TO_NAME.keys():  # if name is an abbreviation:
             self.name = AGENCY_ABBREVIATION_TO_NAME[name]
@@ -31,11 +36,17 @@ class Agency():
             raise ValueError(f"\"{name}\" is neither a valid agency abbreviation nor a full agency name of one of the 24 CFO act agencies.")
 
         self.df = df
-        self.agency_df = self.get_df().loc[self.get_df()["Agency Name"] == self.get_abbreviation()]  # a DataFrame only containing data relevant to the agency that the object represents
+        self.agency_df = agency_df if agency_df is not None else self.get_df().loc[self.get_df()["Agency Name"] == self.get_abbreviation()]  # a DataFrame only containing data relevant to the agency that the object represents
         self.apgs = list(self.get_agency_df()["Goal Name"].unique())
         self.current_quarter = current_quarter 
         self.current_year = current_year
 
+        # Positions of the rows of each goal, and of each goal in each fiscal year and quarter, within the agency DataFrame, such that the rows of a goal are looked up rather than scanned for. Rows without a goal name are kept (dropna=False) under the key NaN, such that get_goal_status_df still returns them
+        goal_names = self.get_agency_df()["Goal Name"].astype(object)  # grouped as objects, as pandas leaves out the missing values of a categorical column even with dropna=False
+        self.goal_positions = {self.__get_goal_key(goal_name): positions for goal_name, positions in self.get_agency_df().groupby(goal_names, sort=False, dropna=False).indices.items()}
+        self.goal_quarter_positions = {(self.__get_goal_key(goal_name), year, quarter): positions for (goal_name, year, quarter), positions in self.get_agency_df().groupby([goal_names, "Fiscal Year", "Quarter"], sort=False, observed=True, dropna=False).indices.items()}
+        self.theme_challenge_index = theme_challenge_index
+
     # GETTER METHODS
 
     def get_df(self):
@@ -106,16 +117,21 @@ class Agency():
         :return: A DataFrame mapping each APG to its goal status across the specified year and quarters.
         """
         year, quarter = self.__handle_year_quarter_input(year, quarter)
+        columns = ["Goal Name", "Quarter", "Fiscal Year", "Status"]
+
+        if "all" in [year, quarter] and not goal_names:     # all rows
+            return self.get_agency_df()[columns].reset_index(drop=True)
+
+        goal_keys = dict.fromkeys(self.__get_goal_key(goal_name) for goal_name in (goal_names if goal_names else self.get_goals()))    # a missing goal name selects the rows without one, as isin did
+
+        if "all" in [year, quarter]:
+            positions = [self.goal_positions.get(goal_key, self.NO_POSITIONS) for goal_key in goal_keys]
+        else:
+            positions = [self.goal_quarter_positions.get((goal_key, year, quarter), self.NO_POSITIONS) for goal_key in goal_keys]
 
-        conditional = pd.Series(data=[True for i in range(len(self.get_agency_df()))], index=self.get_agency_df().index)     # defaults to all rows
-        
-        if not "all" in [year, quarter]:
-            conditional = conditional & (self.get_agency_df()["Fiscal Year"] == year) & (self.get_agency_df()["Quarter"] == quarter)
-        
-        if goal_names:
-            conditional = conditional & (self.get_agency_df()["Goal Name"].isin(goal_names))
+        positions = np.sort(np.concatenate([self.NO_POSITIONS] + positions))     # rows are kept in the order they are held in the agency DataFrame
 
-        return self.get_agency_df().loc[conditional, ["Goal Name", "Quarter", "Fiscal Year", "Status"]].reset_index(drop=True)
+        return self.get_agency_df()[columns].iloc[positions].reset_index(drop=True)
 
     def get_goal_status(self, goal_name, year=None, quarter=None):
         """
@@ -125,11 +141,14 @@ class Agency():
         :param year: The year from which to retrieve goal status. Defaults to the year that the object represents.
         :param quarter: The quarter from which to retrieve goal status. Defaults to the quarter that the object represents. "previous" returns the data only from the previous quarter.
         """
-        try:
-            return self.get_apg_row(goal_name, year=year, quarter=quarter)["Status"].iloc[0]
-        except IndexError:  # if the passed goal name is not held within the agency
+        year, quarter = self.__handle_year_quarter_input(year, quarter)
+        positions = self.__get_row_positions(goal_name, year, quarter)
+
+        if len(positions) == 0:     # if the passed goal name is not held within the agency
             return None
 
+        return self.get_agency_df()["Status"].iloc[positions[0]]
+
     def get_challenges(self, goal_name):
         """
         Returns a list of the challenges reported for the passed goal name.
@@ -137,7 +156,9 @@ class Agency():
         :param goal_name: The name of the APG from which the challenges reported will be returned.
         :return: A list of the challenges reported by the passed goal team.
         """
-        return self.get_apg_row(goal_name)[CHALLENGES_LIST].columns[(self.get_apg_row(goal_name)[CHALLENGES_LIST] == 1).all()].tolist()     # list of challenge columns that are in the affirmative
+        challenges_df = self.get_apg_row(goal_name)[CHALLENGES_LIST]
+
+        return challenges_df.columns[(challenges_df == 1).all()].tolist()     # list of challenge columns that are in the affirmative
 
     def get_themes(self, goal_name):
         """
@@ -146,7 +167,7 @@ class Agency():
         :param goal_name: The name of the APG from which the related themes will be returned.
         :return: A list of the themes connected to the the passed goal.
         """
-        return self.__get_affirmative_thematic_columns(goal_name, THEMES_LIST)
+        return THEMATIC_MAPPING.get_themes(goal_name)
 
     def get_cap_goals(self, goal_name):
         """
@@ -155,7 +176,7 @@ class Agency():
         :param goal_name: The name of the APG from which the related CAP goals will be returned.
         :return: A list of the CAP goals connected to the the passed goal.
         """
-        return self.__get_affirmative_thematic_columns(goal_name, CAP_GOALS_LIST)
+        return THEMATIC_MAPPING.get_cap_goals(goal_name)
 
     def get_outcomes(self, goal_name):
         """
@@ -164,7 +185,7 @@ class Agency():
         :param goal_name: The name of the APG from which the related outcomes will be returned.
         :return: A list of the outcomes connected to the the passed goal.
         """
-        return self.__get_affirmative_thematic_columns(goal_name, OUTCOMES_LIST)
+        return THEMATIC_MAPPING.get_outcomes(goal_name)
 
     def get_apg_row(self, goal_name, year=None, quarter=None):
         """
@@ -177,7 +198,20 @@ class Agency():
         """
         year, quarter = self.__handle_year_quarter_input(year, quarter)
 
-        return self.get_agency_df().loc[(self.get_agency_df()["Quarter"] == quarter) & (self.get_agency_df()["Fiscal Year"] == year) & (self.get_agency_df()["Goal Name"] == goal_name)]
+        return self.get_agency_df().iloc[self.__get_row_positions(goal_name, year, quarter)]
+
+    def get_common_teams_theme_challenge(self, theme, challenge):
+        """
+        Given a passed theme and challenge, returns the APG teams of other agencies within the passed theme that are addressing the passed challenge in the current quarter. Read from the theme and challenge index, and the same as the agency and goal name of each row returned by get_common_apgs_theme_challenge.
+
+        :param theme: The theme for which common APG teams will be retrieved.
+        :param challenge: The challenge for which common APG teams will be revealed.
+        :return: A list of (agency, goal name) tuples, one for each common APG team.
+        """
+        if self.theme_challenge_index is None:
+            self.theme_challenge_index = THEMATIC_MAPPING.get_theme_challenge_index(self.get_df(), self.get_quarter(), self.get_year())
+
+        return [(agency, goal_name) for agency, goal_name, mapping_agencies in self.theme_challenge_index.get((theme, challenge), []) if mapping_agencies - {self.get_name()}]   # leaves out goals only connected to the theme under this agency
 
     def get_common_apgs_theme_challenge(self, theme, challenge):
         """
@@ -187,24 +221,35 @@ class Agency():
         :param challenge: The challenge for which common APG teams will be revealed.
         :return: A DataFrame where each row is a unique instance of an APG team within the passed theme that is addressing the passed challenge in the current quarter.
         """
-        common_theme_apgs = THEMATIC_MAPPING_DF.loc[(THEMATIC_MAPPING_DF[theme] == 1) & (THEMATIC_MAPPING_DF["Agency Name"] != self.get_name()), "Goal Name"].tolist()
+        common_theme_apgs = THEMATIC_MAPPING.get_goals(theme, exclude_agency=self.get_name())
 
         common_agencies_df = self.get_df().loc[(self.get_df()["Quarter"] == self.get_quarter()) & (self.get_df()["Fiscal Year"] == self.get_year())]    # retrieves slice of DataFrame for current year and quarter
         common_agencies_df = common_agencies_df.loc[(common_agencies_df["Goal Name"].isin(common_theme_apgs)) & (common_agencies_df[challenge] == 1)]  # filters DataFrame for only agencies with common themes, challenges
 
         return common_agencies_df
 
-    def __get_affirmative_thematic_columns(self, goal_name, column_list):
+    def __get_row_positions(self, goal_name, year, quarter):
         """
-        For the passed goal, returns a list of the names of the columns in the affirmative from the list of columns passed that are included in the thematic mapping DataFrame.
+        Returns the positions within the agency DataFrame of the rows of the passed goal in the passed fiscal year and quarter.
 
-        :param goal_name: The name of the APG for which a list of columns in the affirmative will be returned.
-        :param column_list: A list of column names that are included in the thematic mapping DataFrame. Most commonly used as a group of related columns such as CAP goals, outcomes or themes.
-        :return: A list of the names of the columns in the affirmative among the passed list.
+        :param goal_name: The name of the APG.
+        :param year: The fiscal year of the rows.
+        :param quarter: The quarter of the rows.
+        :return: An array of the positions of the matching rows, in the order they are held in the agency DataFrame. Empty if there are none, or if the passed goal name is missing, as a missing value is equal to no goal name.
         """
-        thematic_mapping_row = THEMATIC_MAPPING_DF.loc[THEMATIC_MAPPING_DF["Goal Name"] == goal_name]
+        if pd.isna(goal_name):
+            return self.NO_POSITIONS
+
+        return self.goal_quarter_positions.get((goal_name, year, quarter), self.NO_POSITIONS)
 
-        return thematic_mapping_row[column_list].columns[(thematic_mapping_row[column_list] == 1).all()].tolist()
+    def __get_goal_key(self, goal_name):
+        """
+        Returns the key of the passed goal name in the row position lookups of the object.
+
+        :param goal_name: The name of the APG, or a missing value (e.g., NaN or None).
+        :return: The passed goal name, or np.nan if it is missing, such that every missing goal name is looked up under the same key.
+        """
+        return np.nan if pd.isna(goal_name) else goal_name
 
     def __handle_year_quarter_input(self, year, quarter):
         """
@@ -0,0 +1,246 @@
+"""
+Holds definition of CoverSheetRecord class, a compact representation of the data read from a single cover sheet, and the functions used to convert records into DataFrames.
+"""
+
+from src.constants import HEADER_MAP, STATUS_RANK_MAP, CHALLENGES_LIST, THEMES_LIST
+
+from array import array
+import numpy as np
+import pandas as pd
+import sys
+
+# Names of the columns that records may hold, indexed by the ID under which they are stored in a record. Shared by every record in the process, such that the name of each column is only held once however many cover sheets are read
+COLUMN_NAMES = []
+
+# Maps the name of each column in COLUMN_NAMES to its ID
+COLUMN_IDS = {}
+
+class CoverSheetRecord():
+    """
+    Represents the data read from a single cover sheet. Holds the same data as the dictionary returned by read_cover_sheet, in a fraction of the memory: columns are stored as IDs into COLUMN_NAMES rather than as strings, checkboxes are packed into the bits of a pair of integers and only the free-text answers are stored as strings.
+    """
+    __slots__ = ("columns", "checkboxes", "checked", "text_columns", "text")
+
+    def __init__(self):
+        """
+        Constructor method; creates an empty CoverSheetRecord object, to which the data of a cover sheet is added as it is read.
+        """
+        self.columns = array("H")   # IDs of the columns held by the record, in the order they were first read
+        self.checkboxes = 0     # bitmask of the columns holding a checkbox
+        self.checked = 0    # bitmask of the columns holding a checked checkbox
+        self.text_columns = array("H")  # IDs of the columns holding a free-text answer
+        self.text = []  # the free-text answer held by each column in self.text_columns
+
+    def __setitem__(self, column, value):
+        """
+        Stores the passed value under the passed column, in the same way as assigning it to a key of a dictionary: a column that is already held keeps its position and has its value replaced.
+
+        :param column: The name of the column.
+        :param value: The value of the column; 1 or 0 for a checked or unchecked checkbox, or a string for a free-text answer.
+        """
+        column_id = get_column_id(column)
+        bit = 1 << column_id
+
+        if column_id not in self.columns:
+            self.columns.append(column_id)
+        elif self.checkboxes & bit:     # removes the previous value of a column that was already read
+            self.checkboxes &= ~bit
+            self.checked &= ~bit
+        else:
+            index = self.text_columns.index(column_id)
+            del self.text_columns[index]
+            del self.text[index]
+
+        if isinstance(value, int):
+            self.checkboxes |= bit
+            if value:
+                self.checked |= bit
+        else:
+            self.text_columns.append(column_id)
+            self.text.append(value)
+
+    def __getitem__(self, column):
+        """
+        Returns the value stored under the passed column.
+
+        :param column: The name of the column.
+        :return: 1 or 0 for a checked or unchecked checkbox, or the string held by a free-text answer.
+        """
+        column_id = COLUMN_IDS.get(column)
+
+        if column_id is None or column_id not in self.columns:
+            raise KeyError(column)
+
+        bit = 1 << column_id
+
+        if self.checkboxes & bit:
+            return 1 if self.checked & bit else 0
+        return self.text[self.text_columns.index(column_id)]
+
+    def __len__(self):
+        """
+        Returns the number of columns held by the record.
+
+        :return: The number of columns held by the record.
+        """
+        return len(self.columns)
+
+    def __eq__(self, other):
+        """
+        Returns TRUE if the passed object is a record holding the same columns, in the same order, with the same values as this record, FALSE otherwise.
+
+        :param other: The object to compare this record to.
+        """
+        if not isinstance(other, CoverSheetRecord):
+            return NotImplemented
+        return self.columns == other.columns and self.to_dict() == other.to_dict()
+
+    def __getstate__(self):
+        """
+        Returns the state of the record to be pickled. Columns are pickled by name, as the IDs of columns that are not in the default set may differ between the worker process that read a cover sheet and the process that receives its record.
+
+        :return: A tuple of the names of the columns held by the record, the names of its checked and of its unchecked checkboxes, the names of the columns holding a free-text answer and the free-text answers themselves.
+        """
+        checked = []
+        unchecked = []
+
+        for column_id in self.columns:
+            if self.checkboxes >> column_id & 1:
+                (checked if self.checked >> column_id & 1 else unchecked).append(COLUMN_NAMES[column_id])
+
+        return [COLUMN_NAMES[column_id] for column_id in self.columns], checked, unchecked, [COLUMN_NAMES[column_id] for column_id in self.text_columns], self.text
+
+    def __setstate__(self, state):
+        """
+        Restores the state of a pickled record, assigning IDs to its columns in the current process.
+
+        :param state: A tuple as returned by __getstate__.
+        """
+        names, checked, unchecked, text_names, text = state
+
+        self.columns = array("H", [get_column_id(name) for name in names])
+        self.checkboxes = 0
+        self.checked = 0
+        self.text_columns = array("H", [get_column_id(name) for name in text_names])
+        self.text = text
+
+        for name in checked:
+            self.checkboxes |= 1 << COLUMN_IDS[name]
+            self.checked |= 1 << COLUMN_IDS[name]
+        for name in unchecked:
+            self.checkboxes |= 1 << COLUMN_IDS[name]
+
+    def to_dict(self):
+        """
+        Returns the data held by the record as a dictionary, identical to the one returned by read_cover_sheet for the same cover sheet.
+
+        :return: A dictionary mapping the name of each column held by the record to its value.
+        """
+        text = dict(zip(self.text_columns, self.text))
+        data = {}
+
+        for column_id in self.columns:
+            bit = 1 << column_id
+            if self.checkboxes & bit:
+                data[COLUMN_NAMES[column_id]] = 1 if self.checked & bit else 0
+            else:
+                data[COLUMN_NAMES[column_id]] = text[column_id]
+
+        return data
+
+def get_column_id(column):
+    """
+    Returns the ID under which the passed column is stored in records, assigning it a new ID if it has not been seen before. The name of the column is interned, such that every record refers to the same string.
+
+    :param column: The name of a column.
+    :return: The index of the column in COLUMN_NAMES.
+    """
+    column_id = COLUMN_IDS.get(column)
+
+    if column_id is None:
+        column_id = len(COLUMN_NAMES)
+        column = sys.intern(column)
+        COLUMN_NAMES.append(column)
+        COLUMN_IDS[column] = column_id
+
+    return column_id
+
+def records_to_dataframe(records):
+    """
+    Creates a DataFrame object from a list of records, building each column in bulk rather than first converting every record into a dictionary. The checkboxes of every record are unpacked from their bitmasks at once, and the free-text answers of records holding the same free-text columns, which is the case for most cover sheets read from the same template, are transposed into columns at once. Produces the same DataFrame as passing the dictionaries returned by read_cover_sheet to the DataFrame constructor.
+
+    :param records: A list of CoverSheetRecord objects.
+    :return: A DataFrame object with each row representing a record, and a column for every column held by any of the records, in the order they were first read. Columns that a record does not hold are NaN in its row.
+    """
+    if len(records) == 0:
+        return pd.DataFrame([])
+
+    # Orders the columns by the record in which they were first read
+    column_order = {}
+    for layout in dict.fromkeys(record.columns.tobytes() for record in records):
+        column_order.update(dict.fromkeys(array("H", layout)))
+
+    # Collects the free-text answers of each column as a list of (positions, values) tuples, one for each group of records holding the same free-text columns
+    text_layouts = {}
+    for i, record in enumerate(records):
+        text_layouts.setdefault(record.text_columns.tobytes(), []).append(i)
+
+    text = {}
+    for layout, positions in text_layouts.items():
+        for column_id, values in zip(array("H", layout), zip(*[records[i].text for i in positions])):   # transposes the free-text answers of the records into columns
+            text.setdefault(column_id, []).append((positions, values))
+
+    # Unpacks the checkboxes of every record at once, provided that their bitmasks fit in a 64-bit integer
+    all_checkboxes = 0
+    for record in records:
+        all_checkboxes |= record.checkboxes
+
+    checkboxes = [record.checkboxes for record in records]
+    checked = [record.checked for record in records]
+    if all_checkboxes.bit_length() < 64:
+        checkboxes = np.array(checkboxes, dtype=np.int64)
+        checked = np.array(checked, dtype=np.int64)
+
+    data = {}
+
+    for column_id in column_order:
+        if not all_checkboxes >> column_id & 1:     # if the column only holds free-text answers
+            parts = text[column_id]
+            if len(parts) == 1 and len(parts[0][0]) == len(records):
+                values = list(parts[0][1])
+            else:
+                values = __fill_column([], parts, len(records))
+        elif column_id not in text and isinstance(checked, np.ndarray):     # if the column only holds checkboxes
+            is_held = (checkboxes >> column_id & 1).astype(bool)
+            values = checked >> column_id & 1
+            if not is_held.all():
+                values = np.where(is_held, values, np.nan)  # NaN in the rows of records that do not hold the column, as when building the DataFrame from dictionaries
+        else:
+            values = [checked[i] >> column_id & 1 if checkboxes[i] >> column_id & 1 else float("nan") for i in range(len(records))]
+            values = __fill_column([int(value) if value == value else value for value in values], text.get(column_id, []), len(records))
+
+        data[COLUMN_NAMES[column_id]] = values
+
+    return pd.DataFrame(data, index=pd.RangeIndex(len(records)))     # records holding no columns are still given a row
+
+def __fill_column(values, parts, length):
+    """
+    Fills a column with the free-text answers held by each group of records.
+
+    :param values: A list holding the value of the column in each row, or an empty list to start from a column of NaN.
+    :param parts: A list of (positions, values) tuples, holding the positions of the records in a group and the free-text answer of each of them.
+    :param length: The number of rows in the column.
+    :return: The list of the values of the column.
+    """
+    if len(values) == 0:
+        values = [float("nan")] * length
+
+    for positions, part in parts:
+        for i, value in zip(positions, part):
+            values[i] = value
+
+    return values
+
+# Assigns the lowest IDs to the columns found on every cover sheet, such that they are the same in every process
+for column in list(STATUS_RANK_MAP.keys()) + CHALLENGES_LIST + THEMES_LIST + list(HEADER_MAP.values()):
+    get_column_id(column)
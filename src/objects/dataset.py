@@ -0,0 +1,93 @@
+"""
+Holds definition of Dataset class, which loads the central database once and hands out the Agency objects of every agency from it.
+"""
+
+from src.objects.agency import Agency
+from src.objects.thematic_mapping import THEMATIC_MAPPING
+from src.input.database import load_database
+from src.constants import AGENCY_ABBREVIATION_TO_NAME, AGENCY_NAME_TO_ABBREVIATION, DATABASE_PATH
+
+class Dataset():
+    """
+    Represents the contents of the central database, loaded once for the whole process. The rows of each agency are split from the rest of the data in a single pass, such that every Agency object handed out shares the same central DataFrame rather than reading and filtering it again. Agency objects can be created for any quarter and fiscal year held by the database.
+    """
+
+    def __init__(self, database_path=DATABASE_PATH, df=None):
+        """
+        Constructor method; creates a Dataset object holding the contents of the database at the passed path.
+
+        :param database_path: The path to the central data storage for the project, either a .csv file, a SQLite database or the directory of a partitioned database.
+        :param df: A DataFrame holding the contents of the database, if it has already been loaded. Defaults to loading the database at the passed path.
+        """
+        self.database_path = database_path
+        self.df = df if df is not None else load_database(database_path)
+        self.theme_challenge_indexes = {}   # the theme and challenge index of each (quarter, year) tuple, built when first needed
+        self.agency_dfs = {abbreviation: agency_df for abbreviation, agency_df in self.get_df().groupby("Agency Name", sort=False, observed=True)}    # the rows of each agency, in the order they are held in the central DataFrame
+
+    # GETTER METHODS
+
+    def get_database_path(self):
+        """
+        Returns the path of the database that the object was loaded from.
+
+        :return: The path to the central data storage for the project.
+        """
+        return self.database_path
+
+    def get_df(self):
+        """
+        Returns the central DataFrame, holding the data of all CFO Act agencies.
+
+        :return: A DataFrame that stores the data surrounding agencies and their goal statuses.
+        """
+        return self.df
+
+    def get_agency_df(self, name):
+        """
+        Returns the rows of the central DataFrame relevant to the passed agency.
+
+        :param name: The abbreviation or full name of the agency.
+        :return: A slice of the central DataFrame only containing the rows of the passed agency, with the same index. Empty if the database holds no rows for the agency.
+        """
+        abbreviation = AGENCY_NAME_TO_ABBREVIATION.get(name, name)
+
+        if abbreviation not in self.agency_dfs:
+            return self.get_df().iloc[0:0]
+
+        return self.agency_dfs[abbreviation]
+
+    # UTILITY METHODS
+
+    def get_agency(self, name, quarter, year):
+        """
+        Returns an Agency object representing the passed agency at the passed quarter and fiscal year, created from the central DataFrame of the object.
+
+        :param name: The abbreviation or full name of the agency.
+        :param quarter: The quarter that the agency will be reporting on.
+        :param year: The fiscal year that the agency will be reporting on.
+        :return: An Agency object, identical to one created from the whole database.
+        """
+        return Agency(self.get_df(), name, quarter, year, agency_df=self.get_agency_df(name), theme_challenge_index=self.get_theme_challenge_index(quarter, year))
+
+    def get_theme_challenge_index(self, quarter, year):
+        """
+        Returns the index of the APG teams of every agency working on each theme and challenge in the passed quarter and fiscal year, which is shared by every Agency object of that quarter. Built once for each quarter and fiscal year.
+
+        :param quarter: The quarter of the index.
+        :param year: The fiscal year of the index.
+        :return: A dictionary mapping each (theme, challenge) tuple to the APG teams working on it. See ThematicMapping.get_theme_challenge_index.
+        """
+        if (quarter, year) not in self.theme_challenge_indexes:
+            self.theme_challenge_indexes[(quarter, year)] = THEMATIC_MAPPING.get_theme_challenge_index(self.get_df(), quarter, year)
+
+        return self.theme_challenge_indexes[(quarter, year)]
+
+    def get_agencies(self, quarter, year):
+        """
+        Returns an Agency object for each of the 24 CFO Act agencies at the passed quarter and fiscal year.
+
+        :param quarter: The quarter that the agencies will be reporting on.
+        :param year: The fiscal year that the agencies will be reporting on.
+        :return: A list of Agency objects, in the order of AGENCY_ABBREVIATION_TO_NAME.
+        """
+        return [self.get_agency(abbreviation, quarter, year) for abbreviation in AGENCY_ABBREVIATION_TO_NAME.keys()]
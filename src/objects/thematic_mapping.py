@@ -0,0 +1,110 @@
+"""
+Holds definition of ThematicMapping class, a compiled form of the thematic mapping DataFrame that maps each APG to its themes, CAP goals and outcomes, and each of those to its APGs.
+"""
+
+from src.constants import THEMATIC_MAPPING_DF, THEMES_LIST, CAP_GOALS_LIST, OUTCOMES_LIST, CHALLENGES_LIST
+
+class ThematicMapping():
+    """
+    Represents the thematic mapping of APGs to themes, CAP goals and outcomes. The mapping is compiled once, when the object is created, into the set of columns in the affirmative for each goal and the goals in the affirmative for each column, such that neither has to be filtered for in the thematic mapping DataFrame again.
+    """
+
+    def __init__(self, df, columns=THEMES_LIST + CAP_GOALS_LIST + OUTCOMES_LIST):
+        """
+        Constructor method; compiles the passed thematic mapping DataFrame.
+
+        :param df: A DataFrame in the format of the thematic mapping spreadsheet, with an "Agency Name" and a "Goal Name" column and a column holding a 1 or a 0 for each theme, CAP goal and outcome.
+        :param columns: The names of the columns of the DataFrame to compile. Defaults to every theme, CAP goal and outcome.
+        """
+        self.columns = [column for column in columns if column in df.columns]
+        is_affirmative = df[self.columns] == 1
+
+        # The columns in the affirmative for each goal; a goal held in several rows is only connected to the columns in the affirmative in all of them
+        self.goal_columns = {}
+        for goal_name, goal_df in is_affirmative.groupby(df["Goal Name"], sort=False):
+            self.goal_columns[goal_name] = frozenset(goal_df.columns[goal_df.all()])
+
+        # The (agency name, goal name) pair of each row in the affirmative for each column, in the order of the rows of the DataFrame
+        self.column_goals = {column: list(zip(df.loc[is_affirmative[column], "Agency Name"], df.loc[is_affirmative[column], "Goal Name"])) for column in self.columns}
+
+    def get_columns(self, goal_name, column_list):
+        """
+        Returns the columns in the affirmative for the passed goal among the passed list of columns. A goal that is not held in the thematic mapping is connected to every column.
+
+        :param goal_name: The name of the APG.
+        :param column_list: A list of column names that are included in the thematic mapping, such as a group of related columns like CAP goals, outcomes or themes.
+        :return: A list of the names of the columns in the affirmative, in the order of the passed list.
+        """
+        goal_columns = self.goal_columns.get(goal_name)
+
+        if goal_columns is None:
+            return [column for column in column_list if column in self.columns]
+
+        return [column for column in column_list if column in goal_columns]
+
+    def get_themes(self, goal_name):
+        """
+        Returns a list of the themes connected to the passed goal name.
+
+        :param goal_name: The name of the APG.
+        :return: A list of the themes connected to the passed goal.
+        """
+        return self.get_columns(goal_name, THEMES_LIST)
+
+    def get_cap_goals(self, goal_name):
+        """
+        Returns a list of the CAP goals connected to the passed goal name.
+
+        :param goal_name: The name of the APG.
+        :return: A list of the CAP goals connected to the passed goal.
+        """
+        return self.get_columns(goal_name, CAP_GOALS_LIST)
+
+    def get_outcomes(self, goal_name):
+        """
+        Returns a list of the outcomes connected to the passed goal name.
+
+        :param goal_name: The name of the APG.
+        :return: A list of the outcomes connected to the passed goal.
+        """
+        return self.get_columns(goal_name, OUTCOMES_LIST)
+
+    def get_goals(self, column, exclude_agency=None):
+        """
+        Returns a list of the goals connected to the passed theme, CAP goal or outcome (e.g., all of the goals under the "Climate" theme).
+
+        :param column: The name of a theme, CAP goal or outcome.
+        :param exclude_agency: The full name of an agency whose goals are left out. Defaults to including the goals of every agency.
+        :return: A list of the names of the goals connected to the passed column, in the order they are held in the thematic mapping.
+        """
+        return [goal_name for agency_name, goal_name in self.column_goals.get(column, []) if agency_name != exclude_agency]
+
+    def get_theme_challenge_index(self, df, quarter, year, themes=THEMES_LIST, challenges=CHALLENGES_LIST):
+        """
+        Returns an index of the APG teams of every agency working on each combination of theme and challenge in the passed quarter and fiscal year, built in a single pass over the rows of the quarter rather than once for every theme and challenge of every agency.
+
+        :param df: The central DataFrame, holding the data of all CFO Act agencies.
+        :param quarter: The quarter of the rows to index.
+        :param year: The fiscal year of the rows to index.
+        :param themes: The themes to index. Defaults to every theme.
+        :param challenges: The challenges to index. Defaults to every challenge.
+        :return: A dictionary mapping each (theme, challenge) tuple to a list of (agency, goal name, mapping agencies) tuples, one for each row of the quarter whose goal is connected to the theme and that reported the challenge, in the order they are held in the passed DataFrame. The agency is as held in the DataFrame, and the mapping agencies are the full names of the agencies under which the goal is connected to the theme in the thematic mapping.
+        """
+        quarter_df = df.loc[(df["Quarter"] == quarter) & (df["Fiscal Year"] == year)]     # retrieves slice of DataFrame for the passed year and quarter
+        index = {}
+
+        for theme in themes:
+            goal_agencies = {}  # the agencies under which each goal is connected to the theme
+            for agency_name, goal_name in self.column_goals.get(theme, []):
+                goal_agencies.setdefault(goal_name, set()).add(agency_name)
+
+            theme_df = quarter_df.loc[quarter_df["Goal Name"].isin(list(goal_agencies))]
+
+            for challenge in challenges:
+                challenge_df = theme_df.loc[theme_df[challenge] == 1]
+                index[(theme, challenge)] = [(agency, goal_name, frozenset(goal_agencies[goal_name])) for agency, goal_name in zip(challenge_df["Agency Name"], challenge_df["Goal Name"])]
+
+        return index
+
+# The thematic mapping of the project, compiled from THEMATIC_MAPPING_DF
+THEMATIC_MAPPING = ThematicMapping(THEMATIC_MAPPING_DF)
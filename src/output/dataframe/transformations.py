@@ -13,7 +13,7 @@ def get_status_count_groupby_agency_year_quarter(df):
     :param df: A DataFrame that resembles either the raw data storage source or a slice of original source.
     :return: A DataFrame displaying the count of each goal status in every unique combination of agency name, fiscal year and quarter.
     """
-    return df.groupby(["Agency Name", "Status", "Fiscal Year", "Quarter"]).size().reset_index().rename(columns={0: "Count"})
+    return df.groupby(["Agency Name", "Status", "Fiscal Year", "Quarter"], observed=True).size().reset_index().rename(columns={0: "Count"})
 
 def get_recurring_challenges_count(df):
     """
@@ -54,6 +54,7 @@ def get_challenge_count_by_quarter(df):
 
     for challenge in CHALLENGES_LIST:
         data_df = df.astype({challenge:"category"})   # without changing the type of the column, the groupby automatically drops all fields with a count of 0
+        data_df = data_df.astype({column: object for column in ["Agency Name", "Quarter"] if data_df[column].dtype == "category"})    # only the challenge is grouped by all of its values, rather than by every agency and quarter of the database as well
 
         data_df = data_df.groupby(["Agency Name", "Fiscal Year", "Quarter", challenge]).size().reset_index().rename(columns={0: "Count"})
 
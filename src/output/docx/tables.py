@@ -104,9 +104,7 @@ def get_common_challenges_theme_table(agency, apg, challenge):
     table = []
 
     for theme in agency.get_themes(apg):
-        common_teams_df = agency.get_common_apgs_theme_challenge(theme, challenge)
-        common_teams_df = common_teams_df.loc[:, ["Agency Name", "Goal Name"]].rename(columns={"Agency Name": "agency", "Goal Name": "apg"})    # rename columns in prepartion for insertion in table
-        common_teams_dicts = common_teams_df.to_dict("records")     # converts DataFrame to list of dictionaries for instertion into table
+        common_teams_dicts = [{"agency": agency_name, "apg": goal_name} for agency_name, goal_name in agency.get_common_teams_theme_challenge(theme, challenge)]     # list of dictionaries for instertion into table
 
         table.append({
             "theme": theme,
@@ -196,9 +196,10 @@ def create_goal_status_over_time(agency, apg_name, dir=DEFAULT_DIRECTORY, name="
     apg_status_df = agency.get_agency_df()
     
     # Formatting DataFrame
-    apg_status_df = apg_status_df.loc[((apg_status_df["Fiscal Year"] == agency.get_year() - 1) & (apg_status_df["Quarter"] > agency.get_quarter())) | ((apg_status_df["Fiscal Year"] == agency.get_year()) & (apg_status_df["Quarter"] <= agency.get_quarter()))]   # filter for only the previous four quarters
+    quarters = apg_status_df["Quarter"].astype(str)    # quarters are compared as strings, as categories can only be compared for equality
+    apg_status_df = apg_status_df.loc[((apg_status_df["Fiscal Year"] == agency.get_year() - 1) & (quarters > agency.get_quarter())) | ((apg_status_df["Fiscal Year"] == agency.get_year()) & (quarters <= agency.get_quarter()))]   # filter for only the previous four quarters
     apg_status_df = apg_status_df.loc[apg_status_df["Goal Name"] == apg_name].sort_values(by=["Fiscal Year","Quarter"])     # sort in chronological order
-    apg_status_df["Quarter/Year"] = apg_status_df["Quarter"] + " " + apg_status_df["Fiscal Year"].astype(int).astype(str)
+    apg_status_df["Quarter/Year"] = apg_status_df["Quarter"].astype(str) + " " + apg_status_df["Fiscal Year"].astype(int).astype(str)
 
     font = {
         'family' : 'sans-serif',
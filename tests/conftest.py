@@ -0,0 +1,34 @@
+# Make the project's src package importable when the tests are run from
+# another directory
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.constants import CHALLENGES_LIST, THEMES_LIST, STATUS_RANK_MAP
+
+import random
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def central_df():
+    """
+    Returns a small central DataFrame in the format of the database, holding a few goals of three agencies over five quarters, including rows without a goal name and a goal that is only reported on in some quarters.
+    """
+    rng = random.Random(0)
+    goals = {"SBA": ["SBA goal 1", "SBA goal 2", float("nan")], "DOC": ["DOC goal 1", "DOC goal 2"], "DOD": ["DOD goal 1"]}
+    quarters = [(2019, "Q4"), (2020, "Q1"), (2020, "Q2"), (2020, "Q3"), (2020, "Q4")]
+    rows = []
+
+    for year, quarter in quarters:
+        for agency, goal_names in goals.items():
+            for goal_name in goal_names:
+                if goal_name == "SBA goal 2" and quarter == "Q2":  # a goal without a report in a quarter
+                    continue
+                row = {"Agency Name": agency, "Goal Name": goal_name, "Fiscal Year": year, "Quarter": quarter, "Status": rng.choice(list(STATUS_RANK_MAP.keys()))}
+                row.update({column: rng.randint(0, 1) for column in CHALLENGES_LIST + THEMES_LIST})
+                row["Blockers"] = f"Blockers of {goal_name} in {quarter} {year}"
+                rows.append(row)
+
+    return pd.DataFrame(rows)
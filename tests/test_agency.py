@@ -0,0 +1,133 @@
+"""
+Tests of the goal and common APG team lookups of the Agency class in src/objects/agency.py, which are compared with the DataFrame scans that they replace.
+"""
+
+from src.objects.agency import Agency
+from src.objects.thematic_mapping import ThematicMapping
+from src.input.database import apply_database_schema
+from src.constants import THEMES_LIST, CHALLENGES_LIST
+import src.utility as utility
+
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+
+QUARTERS = [("Q1", 2020), ("Q3", 2020), ("Q4", 2020)]    # the quarter before the first of these is in the previous fiscal year, and the quarter before the second lacks a goal
+
+def get_year_quarter(agency, year, quarter):
+    """
+    Returns the year and quarter that the passed arguments of a lookup refer to, as the Agency class handles them.
+    """
+    if quarter == "previous":
+        quarter, year = utility.get_previous_quarter_and_year(agency.get_quarter(), agency.get_year())
+
+    return year or agency.get_year(), quarter or agency.get_quarter()
+
+def scan_apg_row(agency, goal_name, year=None, quarter=None):
+    """
+    Returns the rows of the passed goal by scanning the agency DataFrame, as get_apg_row used to.
+    """
+    year, quarter = get_year_quarter(agency, year, quarter)
+    df = agency.get_agency_df()
+
+    return df.loc[(df["Quarter"] == quarter) & (df["Fiscal Year"] == year) & (df["Goal Name"] == goal_name)]
+
+def scan_goal_status_df(agency, goal_names=None, year=None, quarter=None):
+    """
+    Returns the statuses of the passed goals by scanning the agency DataFrame, as get_goal_status_df used to.
+    """
+    year, quarter = get_year_quarter(agency, year, quarter)
+    df = agency.get_agency_df()
+    conditional = pd.Series(True, index=df.index)
+
+    if not "all" in [year, quarter]:
+        conditional = conditional & (df["Fiscal Year"] == year) & (df["Quarter"] == quarter)
+    if goal_names:
+        conditional = conditional & (df["Goal Name"].isin(goal_names))
+
+    return df.loc[conditional, ["Goal Name", "Quarter", "Fiscal Year", "Status"]].reset_index(drop=True)
+
+@pytest.fixture(params=["untyped", "typed"])
+def df(request, central_df):
+    """
+    Returns the central DataFrame, with or without the types of the database schema.
+    """
+    return apply_database_schema(central_df) if request.param == "typed" else central_df
+
+@pytest.mark.parametrize("name", ["SBA", "DOC", "Department of Defense"])
+@pytest.mark.parametrize("current_quarter, current_year", QUARTERS)
+def test_goal_rows_match_scan(df, name, current_quarter, current_year):
+    agency = Agency(df, name, current_quarter, current_year)
+    goal_names = agency.get_goals() + ["Unknown goal", None, np.nan]
+
+    for goal_name, year, quarter in itertools.product(goal_names, [None, 2019, 2020], [None, "Q1", "Q2", "previous"]):
+        expected = scan_apg_row(agency, goal_name, year, quarter)
+        assert agency.get_apg_row(goal_name, year, quarter).equals(expected)
+
+        expected_status = expected["Status"].iloc[0] if len(expected) else None
+        assert agency.get_goal_status(goal_name, year, quarter) == expected_status
+
+@pytest.mark.parametrize("name", ["SBA", "DOC"])
+@pytest.mark.parametrize("current_quarter, current_year", QUARTERS)
+def test_goal_status_df_matches_scan(df, name, current_quarter, current_year):
+    agency = Agency(df, name, current_quarter, current_year)
+    goals = agency.get_goals()
+
+    for goal_names in [None, [], goals[:1], goals[::-1] + goals[:1], ["Unknown goal"], [np.nan], [np.nan, goals[0]]]:     # missing goal names are passed as NaN, as they are loaded from the database
+        for year, quarter in [(None, None), ("all", None), (None, "all"), (2019, "Q4"), (None, "previous")]:
+            expected = scan_goal_status_df(agency, goal_names, year, quarter)
+            pd.testing.assert_frame_equal(agency.get_goal_status_df(goal_names, year, quarter), expected)
+
+def test_goals_without_name_are_kept(df):
+    agency = Agency(df, "SBA", "Q4", 2020)
+
+    assert any(pd.isna(goal_name) for goal_name in agency.get_goals())
+    assert agency.get_goal_status_df()["Goal Name"].isna().sum() == 1
+    assert agency.get_goal_status_df(year="all")["Goal Name"].isna().sum() == 5
+    assert agency.get_goal_status(np.nan) is None     # a missing goal name is not the name of a goal
+
+def test_previous_quarter_without_goal(df):
+    agency = Agency(df, "SBA", "Q3", 2020)
+
+    assert agency.get_goal_status("SBA goal 2", quarter="previous") is None
+    assert agency.get_goal_status("SBA goal 2") is not None
+    assert agency.get_apg_row("SBA goal 1", quarter="previous")["Quarter"].to_list() == ["Q2"]
+
+def scan_common_teams(agency, mapping_df, theme, challenge):
+    """
+    Returns the common APG teams of the passed theme and challenge by scanning the thematic mapping and central DataFrames, as get_common_apgs_theme_challenge used to.
+    """
+    common_theme_apgs = mapping_df.loc[(mapping_df[theme] == 1) & (mapping_df["Agency Name"] != agency.get_name()), "Goal Name"].tolist()
+
+    df = agency.get_df()
+    common_agencies_df = df.loc[(df["Quarter"] == agency.get_quarter()) & (df["Fiscal Year"] == agency.get_year())]
+    common_agencies_df = common_agencies_df.loc[(common_agencies_df["Goal Name"].isin(common_theme_apgs)) & (common_agencies_df[challenge] == 1)]
+
+    return list(zip(common_agencies_df["Agency Name"], common_agencies_df["Goal Name"]))
+
+@pytest.mark.parametrize("current_quarter, current_year", QUARTERS)
+def test_common_teams_match_scan(df, current_quarter, current_year):
+    mapping_df = pd.DataFrame([{"Agency Name": agency_name, "Goal Name": goal_name, "Climate": climate, "Equity": equity, "Recovery": 1} for agency_name, goal_name, climate, equity in [
+        ("Small Business Administration", "SBA goal 1", 1, 0),
+        ("Small Business Administration", "SBA goal 2", 1, 1),
+        ("Department of Commerce", "DOC goal 1", 0, 1),
+        ("Department of Commerce", "SBA goal 1", 0, 1),   # a goal connected to a theme under another agency only
+        ("Department of Defense", "DOD goal 1", 1, 1),
+    ]])
+    index = ThematicMapping(mapping_df).get_theme_challenge_index(df, current_quarter, current_year)
+
+    for name in ["SBA", "DOC", "DOD", "USDA"]:
+        agency = Agency(df, name, current_quarter, current_year, theme_challenge_index=index)
+
+        for theme, challenge in itertools.product(THEMES_LIST, CHALLENGES_LIST):
+            assert agency.get_common_teams_theme_challenge(theme, challenge) == scan_common_teams(agency, mapping_df, theme, challenge)
+
+@pytest.mark.parametrize("current_quarter, current_year", QUARTERS)
+def test_common_teams_match_common_apgs(df, current_quarter, current_year):
+    for name in ["SBA", "DOC", "DOD"]:
+        agency = Agency(df, name, current_quarter, current_year)
+
+        for theme, challenge in itertools.product(THEMES_LIST, CHALLENGES_LIST):
+            common_apgs_df = agency.get_common_apgs_theme_challenge(theme, challenge)
+            assert agency.get_common_teams_theme_challenge(theme, challenge) == list(zip(common_apgs_df["Agency Name"], common_apgs_df["Goal Name"]))
@@ -0,0 +1,65 @@
+"""
+Tests of the cover sheet records in src/objects/cover_sheet.py, which are compared with the dictionaries that they replace.
+"""
+
+from src.input.cover_sheets.synthetic import create_synthetic_cover_sheets
+from src.input.cover_sheets.reading import read_cover_sheet_file
+from src.objects.cover_sheet import CoverSheetRecord, records_to_dataframe
+
+import pickle
+import random
+import pandas as pd
+import pytest
+
+def make_record(data):
+    """
+    Returns a record holding the same data as the passed dictionary, assigned in the same order.
+    """
+    record = CoverSheetRecord()
+    for column, value in data.items():
+        record[column] = value
+
+    return record
+
+@pytest.mark.parametrize("engine", ["xml", "docx"])
+def test_records_match_dicts_of_read_sheets(tmp_path, engine):
+    paths = create_synthetic_cover_sheets(str(tmp_path), 5, seed=0)
+
+    dicts = [read_cover_sheet_file(path, engine=engine) for path in paths]
+    records = [read_cover_sheet_file(path, engine=engine, record=True) for path in paths]
+
+    for data, record in zip(dicts, records):
+        assert list(record.to_dict().items()) == list(data.items())
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    pd.testing.assert_frame_equal(records_to_dataframe(records), pd.DataFrame(dicts))
+
+def test_records_match_dicts_with_mixed_columns():
+    rng = random.Random(0)
+    columns = ["Climate", "Blockers", "Status", "New column", "Another column"]
+
+    for trial in range(200):
+        dicts = []
+        for i in range(rng.randint(1, 5)):
+            data = {}
+            for j in range(rng.randint(0, 8)):     # columns may be assigned again, with a value of another type
+                data[rng.choice(columns)] = rng.choice([0, 1, "", "Some text"])
+            dicts.append(data)
+
+        records = [make_record(data) for data in dicts]
+
+        for data, record in zip(dicts, records):
+            assert list(record.to_dict().items()) == list(data.items())
+            assert len(record) == len(data)
+            assert all(record[column] == value for column, value in data.items())
+
+        pd.testing.assert_frame_equal(records_to_dataframe(records), pd.DataFrame(dicts))
+
+def test_records_to_dataframe_without_records():
+    pd.testing.assert_frame_equal(records_to_dataframe([]), pd.DataFrame([]))
+
+def test_record_lacks_unread_columns():
+    record = make_record({"Climate": 1})
+
+    with pytest.raises(KeyError):
+        record["Blockers"]
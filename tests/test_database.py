@@ -0,0 +1,127 @@
+"""
+Tests of the database backends in src/input/database.py.
+"""
+
+from src.input.cover_sheets.synthetic import create_synthetic_cover_sheet
+from src.input.cover_sheets.reading import process_cover_sheet_files
+from src.input.cover_sheets.upload import update_database
+from src.input.database import load_database, load_text_columns, create_database, load_index, get_partition_files, KEY_COLUMNS
+from src.constants import CATEGORY_COLUMNS, FLAG_COLUMNS
+
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def legacy_sheet_df(tmp_path):
+    """
+    Returns a DataFrame holding a single cover sheet in the legacy table layout, read as ingest.py reads it, such that it holds none of the key columns.
+    """
+    file_path = str(tmp_path / "legacy.docx")
+    create_synthetic_cover_sheet(file_path, seed=0, image_probability=0)
+
+    df, errors = process_cover_sheet_files([file_path], processes=1)
+    assert errors == {}
+
+    return df
+
+def test_legacy_sheet_has_no_keys(legacy_sheet_df):
+    assert len(legacy_sheet_df) == 1
+    assert not any(column in legacy_sheet_df.columns for column in KEY_COLUMNS)
+
+def test_sqlite_rejects_rows_without_keys(tmp_path, legacy_sheet_df):
+    database_path = str(tmp_path / "database.db")
+
+    for i in range(2):
+        with pytest.raises(ValueError, match="Agency Name"):
+            update_database(database_path, legacy_sheet_df, new_column_policy="add")
+
+    assert load_database(database_path).empty
+
+    keyed_df = legacy_sheet_df.assign(**{"Agency Name": "SBA", "Goal Name": "Goal", "Fiscal Year": 2020, "Quarter": None})
+    with pytest.raises(ValueError, match="1 of the 1 rows"):
+        update_database(database_path, keyed_df, new_column_policy="add")
+
+    assert load_database(database_path).empty
+
+def test_sqlite_ingests_same_legacy_sheet_once(tmp_path, legacy_sheet_df):
+    database_path = str(tmp_path / "database.db")
+    keyed_df = legacy_sheet_df.assign(**{"Agency Name": "SBA", "Goal Name": "Goal", "Fiscal Year": 2020, "Quarter": "Q4"})
+
+    for i in range(2):
+        update_database(database_path, keyed_df, new_column_policy="add")
+        assert len(load_database(database_path)) == 1
+
+    # A resubmitted sheet replaces the values of the row it was first read into
+    update_database(database_path, keyed_df.assign(Blockers="Resubmitted"), new_column_policy="add")
+    database = load_database(database_path)
+
+    assert len(database) == 1
+    assert database.loc[0, "Blockers"] == "Resubmitted"
+
+def test_partitioned_rejects_rows_without_partition(tmp_path, legacy_sheet_df):
+    database_path = str(tmp_path / "database")
+    create_database(database_path)
+
+    with pytest.raises(ValueError, match="Fiscal Year, Quarter"):
+        update_database(database_path, legacy_sheet_df, new_column_policy="add")
+
+    keyed_df = legacy_sheet_df.assign(**{"Agency Name": "SBA", "Goal Name": "Goal", "Fiscal Year": 2020, "Quarter": float("nan")})
+    with pytest.raises(ValueError, match="1 of the 1 rows"):
+        update_database(database_path, keyed_df, new_column_policy="add")
+
+    assert load_index(database_path)["files"] == []
+
+def test_partitioned_loads_only_matching_partitions(tmp_path, legacy_sheet_df):
+    database_path = str(tmp_path / "database")
+    create_database(database_path)
+
+    for year, quarter in [(2020, "Q3"), (2020, "Q4"), (2021, "Q1")]:
+        keyed_df = legacy_sheet_df.assign(**{"Agency Name": "SBA", "Goal Name": "Goal", "Fiscal Year": year, "Quarter": quarter})
+        update_database(database_path, keyed_df, new_column_policy="add")
+
+    index = load_index(database_path)
+    assert [entry["partition"] for entry in index["files"]] == [[2020, "Q3"], [2020, "Q4"], [2021, "Q1"]]
+    assert [entry["path"] for entry in get_partition_files(index, fiscal_years=[2020], quarters=["Q4"])] == ["Fiscal Year=2020/Quarter=Q4/part-00001.parquet"]
+
+    database = load_database(database_path, fiscal_years=[2020])
+    assert database[["Fiscal Year", "Quarter"]].values.tolist() == [[2020, "Q3"], [2020, "Q4"]]
+
+def test_csv_append_adds_new_columns(tmp_path):
+    database_path = str(tmp_path / "database.csv")
+    pd.DataFrame({"Agency Name": ["SBA"], "Status": ["Ahead"]}).to_csv(database_path, index=False)
+
+    update_database(database_path, pd.DataFrame({"Agency Name": ["DOC"], "Blockers": ["Hiring"]}), new_column_policy="add")
+    database = load_database(database_path, typed=False)
+
+    assert database.columns.to_list() == ["Agency Name", "Status", "Blockers"]
+    assert database["Agency Name"].to_list() == ["SBA", "DOC"]
+    assert database["Status"].isna().to_list() == [False, True]
+    assert database["Blockers"].isna().to_list() == [True, False]
+
+def test_typed_load_matches_untyped_load(tmp_path, central_df):
+    database_path = str(tmp_path / "database.csv")
+    central_df.to_csv(database_path, index=False)
+
+    typed = load_database(database_path)
+    untyped = load_database(database_path, typed=False)
+
+    assert all(typed[column].dtype == "category" for column in CATEGORY_COLUMNS)
+    assert all(typed[column].dtype == "int8" for column in FLAG_COLUMNS)
+    pd.testing.assert_frame_equal(typed.astype(untyped.dtypes.to_dict()), untyped)
+
+    # The rows selected by a lookup are the same whichever types they were loaded with
+    selected = [frame.loc[(frame["Agency Name"] == "SBA") & (frame["Quarter"] == "Q4") & (frame["Fiscal Year"] == 2020)].index.to_list() for frame in [typed, untyped]]
+    assert selected[0] == selected[1] and len(selected[0]) == 3
+
+def test_text_columns_loaded_later(tmp_path, central_df):
+    database_path = str(tmp_path / "database.csv")
+    central_df.to_csv(database_path, index=False)
+
+    database = load_database(database_path, text_columns=False)
+    assert "Blockers" not in database.columns
+
+    # Only the selected rows are given their free text, in the order they are held
+    rows = database.loc[database["Agency Name"] == "DOC"].iloc[::-1]
+    rows = load_text_columns(database_path, rows)
+
+    pd.testing.assert_frame_equal(rows, load_database(database_path).loc[rows.index, rows.columns])
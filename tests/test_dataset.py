@@ -0,0 +1,37 @@
+"""
+Tests of the Dataset class in src/objects/dataset.py, whose Agency objects are compared with those created from the whole central DataFrame.
+"""
+
+from src.objects.dataset import Dataset
+from src.objects.agency import Agency
+from src.input.database import apply_database_schema
+from src.constants import THEMES_LIST, CHALLENGES_LIST, AGENCY_ABBREVIATION_TO_NAME
+
+import itertools
+import pandas as pd
+import pytest
+
+@pytest.mark.parametrize("typed", [False, True])
+def test_agencies_match_agencies_of_whole_df(central_df, typed):
+    df = apply_database_schema(central_df) if typed else central_df
+    dataset = Dataset(df=df)
+
+    for name, (quarter, year) in itertools.product(["SBA", "Department of Commerce", "DOD", "USDA"], [("Q1", 2020), ("Q4", 2020)]):
+        dataset_agency = dataset.get_agency(name, quarter, year)
+        agency = Agency(df, name, quarter, year)
+
+        pd.testing.assert_frame_equal(dataset_agency.get_agency_df(), agency.get_agency_df())
+        pd.testing.assert_frame_equal(dataset_agency.get_goal_status_df(year="all"), agency.get_goal_status_df(year="all"))
+        pd.testing.assert_frame_equal(dataset_agency.get_goal_status_df(quarter="previous"), agency.get_goal_status_df(quarter="previous"))
+
+        for theme, challenge in itertools.product(THEMES_LIST, CHALLENGES_LIST):
+            assert dataset_agency.get_common_teams_theme_challenge(theme, challenge) == agency.get_common_teams_theme_challenge(theme, challenge)
+
+def test_theme_challenge_index_is_shared_within_quarter(central_df):
+    dataset = Dataset(df=central_df)
+    agencies = dataset.get_agencies("Q4", 2020)
+
+    assert len(agencies) == len(AGENCY_ABBREVIATION_TO_NAME)
+    assert all(agency.theme_challenge_index is agencies[0].theme_challenge_index for agency in agencies)
+    assert dataset.get_agency("SBA", "Q1", 2020).theme_challenge_index is not agencies[0].theme_challenge_index
+    assert list(dataset.theme_challenge_indexes) == [("Q4", 2020), ("Q1", 2020)]
@@ -0,0 +1,81 @@
+"""
+Tests of the ThematicMapping class in src/objects/thematic_mapping.py, whose lookups are compared with the scans of the thematic mapping DataFrame that they replace.
+"""
+
+from src.objects.thematic_mapping import ThematicMapping, THEMATIC_MAPPING
+from src.constants import THEMATIC_MAPPING_DF, THEMES_LIST, CAP_GOALS_LIST, OUTCOMES_LIST, AGENCY_ABBREVIATION_TO_NAME
+
+import random
+import pandas as pd
+import pytest
+
+COLUMN_LISTS = [THEMES_LIST, CAP_GOALS_LIST, OUTCOMES_LIST]
+
+def scan_columns(mapping_df, goal_name, column_list):
+    """
+    Returns the columns in the affirmative for the passed goal by scanning the thematic mapping DataFrame, as Agency used to.
+    """
+    mapping_rows = mapping_df.loc[mapping_df["Goal Name"] == goal_name]
+
+    return mapping_rows[column_list].columns[(mapping_rows[column_list] == 1).all()].tolist()
+
+def scan_goals(mapping_df, column, exclude_agency=None):
+    """
+    Returns the goals in the affirmative for the passed column by scanning the thematic mapping DataFrame, as get_common_apgs_theme_challenge used to.
+    """
+    return mapping_df.loc[(mapping_df[column] == 1) & (mapping_df["Agency Name"] != exclude_agency), "Goal Name"].tolist()
+
+@pytest.fixture
+def mapping_df():
+    """
+    Returns a small thematic mapping DataFrame, including a goal held in two rows that disagree and a row without a goal name.
+    """
+    rng = random.Random(0)
+    goals = [("Small Business Administration", "SBA goal 1"), ("Small Business Administration", "SBA goal 2"), ("Department of Commerce", "DOC goal 1"), ("Department of Commerce", "SBA goal 1"), ("Department of Defense", float("nan"))]
+    rows = []
+
+    for agency_name, goal_name in goals:
+        row = {"Agency Name": agency_name, "Goal Name": goal_name}
+        row.update({column: rng.randint(0, 1) for column in THEMES_LIST + CAP_GOALS_LIST + OUTCOMES_LIST})
+        rows.append(row)
+
+    rows[3].update({"Climate": 1 - rows[0]["Climate"]})    # "SBA goal 1" is only in the affirmative for a column if both of its rows are
+
+    return pd.DataFrame(rows)
+
+@pytest.mark.parametrize("mapping", ["synthetic", "project"])
+def test_columns_match_scan(mapping_df, mapping):
+    if mapping == "project":
+        mapping_df = THEMATIC_MAPPING_DF
+
+    thematic_mapping = ThematicMapping(mapping_df)
+    goal_names = mapping_df["Goal Name"].tolist() + ["Unknown goal", float("nan")]
+
+    for goal_name in goal_names:
+        for column_list in COLUMN_LISTS:
+            assert thematic_mapping.get_columns(goal_name, column_list) == scan_columns(mapping_df, goal_name, column_list)
+
+        assert thematic_mapping.get_themes(goal_name) == scan_columns(mapping_df, goal_name, THEMES_LIST)
+        assert thematic_mapping.get_cap_goals(goal_name) == scan_columns(mapping_df, goal_name, CAP_GOALS_LIST)
+        assert thematic_mapping.get_outcomes(goal_name) == scan_columns(mapping_df, goal_name, OUTCOMES_LIST)
+
+@pytest.mark.parametrize("mapping", ["synthetic", "project"])
+def test_goals_match_scan(mapping_df, mapping):
+    if mapping == "project":
+        mapping_df = THEMATIC_MAPPING_DF
+
+    thematic_mapping = ThematicMapping(mapping_df)
+
+    for column in THEMES_LIST + CAP_GOALS_LIST + OUTCOMES_LIST:
+        for exclude_agency in [None] + list(AGENCY_ABBREVIATION_TO_NAME.values()):
+            assert thematic_mapping.get_goals(column, exclude_agency=exclude_agency) == scan_goals(mapping_df, column, exclude_agency)
+
+def test_goal_in_disagreeing_rows(mapping_df):
+    thematic_mapping = ThematicMapping(mapping_df)
+
+    assert "Climate" not in thematic_mapping.get_themes("SBA goal 1")
+    assert thematic_mapping.get_themes("Unknown goal") == THEMES_LIST     # a goal that is not in the mapping is connected to every column
+
+def test_project_mapping_is_compiled_from_constants():
+    for goal_name in THEMATIC_MAPPING_DF["Goal Name"]:
+        assert THEMATIC_MAPPING.get_themes(goal_name) == scan_columns(THEMATIC_MAPPING_DF, goal_name, THEMES_LIST)
@@ -0,0 +1,63 @@
+"""
+Tests of the handling of new columns when updating the database in src/input/cover_sheets/upload.py.
+"""
+
+from src.input.cover_sheets.upload import update_database
+from src.input.database import load_database
+
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def database_path(tmp_path):
+    """
+    Returns the path to a .csv database holding a single row.
+    """
+    database_path = str(tmp_path / "database.csv")
+    pd.DataFrame({"Agency Name": ["SBA"], "Status": ["Ahead"]}).to_csv(database_path, index=False)
+
+    return database_path
+
+NEW_DATA_DF = pd.DataFrame({"Agency Name": ["DOC"], "Blockers": ["Hiring"], "Tags": ["IT"]})
+
+def answer(monkeypatch, answers):
+    """
+    Answers the console prompts of update_database with the passed answers, in order, and returns the list of prompts asked.
+    """
+    answers = iter(answers)
+    prompts = []
+
+    def fake_input(prompt):
+        prompts.append(prompt)
+        return next(answers)
+
+    monkeypatch.setattr("builtins.input", fake_input)
+
+    return prompts
+
+def test_fail_policy_leaves_database_unchanged(database_path):
+    with pytest.raises(ValueError, match="Blockers, Tags"):
+        update_database(database_path, NEW_DATA_DF, new_column_policy="fail")
+
+    assert len(load_database(database_path)) == 1
+
+@pytest.mark.parametrize("answers, added_columns", [
+    (["Y"], {"Blockers": True, "Tags": True}),
+    (["n", "N"], {"Blockers": False, "Tags": False}),
+    (["N", "maybe", "Y", "N", "Y"], {"Blockers": False, "Tags": True}),
+])
+def test_prompt_policy_adds_chosen_columns(monkeypatch, database_path, answers, added_columns):
+    prompts = answer(monkeypatch, answers)
+
+    assert update_database(database_path, NEW_DATA_DF, new_column_policy="prompt") == added_columns
+    assert len(prompts) == len(answers)
+
+    database = load_database(database_path, typed=False)
+    assert database.columns.to_list() == ["Agency Name", "Status"] + [column for column, is_added in added_columns.items() if is_added]
+    assert database["Agency Name"].to_list() == ["SBA", "DOC"]
+
+def test_prompt_policy_asks_nothing_without_new_columns(monkeypatch, database_path):
+    prompts = answer(monkeypatch, [])
+
+    assert update_database(database_path, pd.DataFrame({"Agency Name": ["DOC"]}), new_column_policy="prompt") == {}
+    assert prompts == []
@@ -0,0 +1,106 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------- Word Form Data Extraction Benchmark ----------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# This script fills the form template with random data and times the data
+# extraction of the resulting forms.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import sys
+import time
+import argparse
+
+# Not available on Windows, where peak memory is not reported
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Local Imports
+from src.functions.data_extraction import extract_data
+from src.functions.synthetic_forms import create_synthetic_forms
+
+
+# ------------------------------------------------------------------------------
+# -------------------------- Function Definition -------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Time the extraction of each file
+def time_extraction(file_paths):
+    latencies = []
+    for file_path in file_paths:
+        start = time.perf_counter()
+        extract_data(file_path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+# Print throughput, latency percentiles and peak memory
+def print_report(name, latencies):
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)] * 1000
+
+    print(f"{name}: {len(latencies) / sum(latencies):.1f} files/sec "
+          f"over {len(latencies)} files")
+    print(f"\tlatency (ms): p50 {percentile(50):.2f}, p90 {percentile(90):.2f}, "
+          f"p99 {percentile(99):.2f}, max {ordered[-1] * 1000:.2f}")
+
+    if resource is None:
+        print("\tpeak RSS: n/a")
+    else:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS, kilobytes elsewhere
+        if sys.platform == "darwin":
+            peak_rss = peak_rss / 1024
+        print(f"\tpeak RSS: {peak_rss / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data extraction.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--template",
+                        default="./src/input/apgCoverSheet_v1.0_template_WORKING.docx")
+    parser.add_argument("--directory", default="./benchmark_data/forms/")
+    args = parser.parse_args()
+
+    # Create the forms, reusing those from earlier runs
+    start = time.perf_counter()
+    file_paths = create_synthetic_forms(args.template, args.directory, args.count)
+    print(f"{len(file_paths)} synthetic forms ready in "
+          f"{time.perf_counter() - start:.1f} seconds")
+
+    print_report("extract_data", time_extraction(file_paths))
+    return
+
+
+# ------------------------------------------------------------------------------
+# ----------------------------- Function Call ----------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Run the main function
+if __name__ == "__main__":
+    main()
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ----------------------------- End Script -------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -25,13 +25,12 @@
 
 # Standard Library Imports
 import sys
-import json
 
 # Third Party Imports
 #import pandas as pd
 
 # Local Imports
-from src.globals import DIRECTORY
+from src.globals import DIRECTORY, OUTPUT_PATH
 from src.functions.data_extraction import *
 from src.functions.write_data import airTable_post
 
@@ -44,15 +43,13 @@ from src.functions.write_data import airTable_post
 # Define the main function
 def main():
     
-    # Extract and validate data from all word files in directory
-    data = get_data(DIRECTORY)
-    
-    # Write the data to output.json file -- for testing/debugging
-    with open("src/output/output.json", "w") as output:
-        json.dump(data, output)
+    # Extract data from all word files in directory, adding each form to the
+    # output.jsonl file as it is extracted. Forms already in the file from an
+    # earlier run are skipped
+    count = write_data_jsonl(DIRECTORY, OUTPUT_PATH)
     
     # Print success message
-    print("--- JSON output file created. ---\n")
+    print(f"--- {count} forms added to JSONL output file. ---\n")
 
     # This doesn't work as cleanly with the newer, nested dictionary output
     # A more robust function will be needed to produce csv output
@@ -68,7 +65,7 @@ def main():
     
     # Post the results to airtable if command line arg exists
     if len(sys.argv) > 1 and sys.argv[1] == "-p":
-        airTable_post(data)
+        airTable_post(dict(iter_jsonl(OUTPUT_PATH)))
     else:
         # Print usage message
         print("--- Usage: python main.py [-p] to post to to AirTable. ---")
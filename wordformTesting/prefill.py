@@ -0,0 +1,67 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ----------------------- Prefilled Form Generation ----------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# This script creates next quarter's prefilled form for every agency and goal
+# in the cover sheet database.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import time
+import argparse
+
+# Local Imports
+from src.functions.create_prepopulated_form import create_bulk_pre_populated_forms
+
+
+# ------------------------------------------------------------------------------
+# -------------------------- Function Definition -------------------------------
+# ------------------------------------------------------------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create prefilled forms.")
+    parser.add_argument("database", help="path to the cover sheet database csv")
+    parser.add_argument("--template",
+                        default="./src/input/apgCoverSheet_v1.0_template_WORKING.docx")
+    parser.add_argument("--output-dir", default="./src/output/prefilled/")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    file_paths = create_bulk_pre_populated_forms(args.database, args.template,
+                                                 args.output_dir, args.processes)
+
+    # Print success message
+    print(f"--- {len(file_paths)} prefilled forms created in {args.output_dir} "
+          f"in {time.perf_counter() - start:.1f} seconds ---")
+    return
+
+
+# ------------------------------------------------------------------------------
+# ----------------------------- Function Call ----------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Run the main function
+if __name__ == "__main__":
+    main()
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ----------------------------- End Script -------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
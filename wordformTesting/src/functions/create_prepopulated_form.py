@@ -1,4 +1,3 @@
-
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 # ----------------------- Create a Prepopulated Form ---------------------------
@@ -20,8 +19,16 @@
 # ------------------------- Set-up / Package Imports ---------------------------
 # ------------------------------------------------------------------------------
 
+# Standard Library Imports
+import os
+import re
+from multiprocessing import Pool
+
+# Third Party Imports
+import pandas as pd
+
 # Local Imports
-from objects.docWriter import DocWriter
+from src.objects.docWriter import DocWriter
 
 
 # ------------------------------------------------------------------------------
@@ -29,6 +36,10 @@ from objects.docWriter import DocWriter
 # ------------------------------------------------------------------------------
 
 
+# Template parsed once per worker process by set_worker_template
+WORKER_TEMPLATE = None
+
+
 # Ability to create prepopulated forms
 # This needs to be completed to loop through files and use data instead of replacements
 def create_pre_populated_forms(output_file, replacements, template_file):
@@ -59,6 +70,99 @@ def create_pre_populated_forms(output_file, replacements, template_file):
     return
 
 
+# Create next quarter's prefilled form for every agency and goal in the
+# cover sheet database (a csv with 'Agency Name', 'Goal Name', 'Fiscal Year'
+# and 'Quarter' columns). Returns the paths of the forms created
+def create_bulk_pre_populated_forms(database_path, template_file, output_dir,
+                                    processes=None, chunksize=16):
+
+    # Create the output directory if needed
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    # Get the data and output path of each form
+    all_replacements = get_next_quarter_replacements(database_path)
+    file_names = get_form_file_names(all_replacements)
+    jobs = [(os.path.join(output_dir, file_name), replacements)
+            for file_name, replacements in zip(file_names, all_replacements)]
+
+    # Write the forms in this process if only one process is wanted
+    if processes == 1:
+        set_worker_template(template_file)
+        return list(map(write_pre_populated_form, jobs))
+
+    # Each worker parses the template once, rather than once per form
+    with Pool(processes, initializer=set_worker_template,
+              initargs=(template_file,)) as pool:
+        return pool.map(write_pre_populated_form, jobs, chunksize)
+
+
+# Get the file name of each form from its agency, goal and quarter. Goals
+# whose names only differ in characters that are not safe in a file name
+# (e.g. "A/B" and "A B") get a numbered suffix, so that no form overwrites
+# another. Names are compared ignoring case, as on Windows and macOS
+def get_form_file_names(all_replacements):
+    file_names = []
+    taken = set()
+    for replacements in all_replacements:
+        file_name = "_".join([str(replacements['agency_acronym_1']),
+                              str(replacements['goal_nickname']),
+                              replacements['fiscal_year'],
+                              replacements['fiscal_quarter']])
+        # Keep only characters that are safe in a file name
+        file_name = re.sub(r"[^\w\-]+", "_", file_name)
+        unique_name = file_name
+        suffix = 2
+        while unique_name.lower() in taken:
+            unique_name = f"{file_name}_{suffix}"
+            suffix += 1
+        taken.add(unique_name.lower())
+        file_names.append(unique_name + ".docx")
+    return file_names
+
+
+# Get the data of next quarter's form for each agency and goal, from the
+# latest quarter each goal was reported in
+def get_next_quarter_replacements(database_path):
+    database = pd.read_csv(database_path, usecols=['Agency Name', 'Goal Name',
+                                                   'Fiscal Year', 'Quarter'])
+    # Latest quarter of each goal
+    latest = database.sort_values(['Fiscal Year', 'Quarter'])\
+                     .drop_duplicates(['Agency Name', 'Goal Name'], keep='last')
+
+    replacements = []
+    for agency, goal, year, quarter in latest.itertuples(index=False):
+        # Q4 is followed by Q1 of the next fiscal year
+        quarter = int(str(quarter).lstrip('Q')) + 1
+        if quarter > 4:
+            year, quarter = year + 1, 1
+        replacements.append({'agency_acronym_1': agency,
+                             'goal_nickname': goal,
+                             'fiscal_year': f'FY{int(year) % 100:02}',
+                             'fiscal_quarter': f'Q{quarter}'})
+    return replacements
+
+
+# Parse the template and index its inputs in the current process
+def set_worker_template(template_file):
+    global WORKER_TEMPLATE
+    template = DocWriter(template_file)
+    tree = template.get_xml()
+    index = template.get_sdt_index(tree)
+    # Text of each input in the template, to reset it between forms
+    originals = [(t, t.text) for alias, texts in index for t in texts]
+    WORKER_TEMPLATE = (template, tree, index, originals)
+
+
+# Populate the worker's template with a form's data and write it
+def write_pre_populated_form(job):
+    output_file, replacements = job
+    template, tree, index, originals = WORKER_TEMPLATE
+    template.populate_index(index, originals, replacements)
+    template._write_and_close_docx(tree, output_file)
+    return output_file
+
+
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 # ------------------------------ End Script ------------------------------------
@@ -22,19 +22,96 @@
 
 # Standard Library Imports
 import os
+import json
+import time
 
 # Third-Party Imports
 from pyairtable import Api
 
+# Local Imports
+from src.globals import SCHEMA_CACHE_PATH, SCHEMA_CACHE_TTL, SCHEMA_FIXTURE_PATH
+
 
 # ------------------------------------------------------------------------------
 # -------------------------- Function Definition -------------------------------
 # ------------------------------------------------------------------------------
 
-# Function to get schema from Airtable
+# Function to get schema from Airtable, or from the on-disk cache if it is fresh
 # This may need to be modified if the data model changes
-def create_schema(versions):
-    
+def create_schema(versions, refresh=False):
+
+    # Get the backend the schema tables are read from
+    backend = get_schema_backend()
+
+    # Use the cache unless it is stale, from another backend or missing a version
+    cache = None if refresh else load_schema_cache()
+    if not is_cache_fresh(cache, backend, versions):
+        # Versions looked up in the same tables before
+        looked_up = cache.get('looked_up', []) \
+            if cache and cache.get('backend') == backend else []
+        mapping, datadict = get_schema_tables(backend)
+        cache = {'backend': backend,
+                 'revision': get_schema_revision(backend),
+                 'created': time.time(),
+                 'schema': build_schema(mapping, datadict),
+                 # Versions looked up, including those not in the mapping
+                 # table, such as None for legacy forms with no version. The
+                 # tables were just read in full, so this answers for the
+                 # versions looked up before too
+                 'looked_up': list(dict.fromkeys(looked_up + list(versions)))}
+        save_schema_cache(cache)
+
+    # Versions that are not in the mapping table have no feilds
+    return {version: cache['schema'].get(version, []) for version in versions}
+
+
+# Function to build the schema of every version in the mapping table
+def build_schema(mapping, datadict):
+
+    # Restructure the data dictionary
+    datadict = {x['id']: x for x in datadict}
+
+    # Initiate the SCHEMA dict
+    schema = {}
+
+    # Configure the schema based on the mapping table, in one pass over it
+    for x in mapping:
+        field = dict(x['fields'])
+        schema.setdefault(field['form_version'], []).append(field)
+
+        # Add relevent feilds from data dict
+        field.update(get_fields(field['associated_field'][0], datadict))
+
+        # Remove unwanted fields
+        field.pop('form_name', None)
+        field.pop('form_version', None)
+        field.pop('associated_field', None)
+        # Convert allowable values from string to list
+        if 'values' in field:
+            field['values'] = field['values'].split(", ")
+
+    return schema
+
+
+# Function to get the backend the schema tables are read from. Set the
+# SCHEMA_BACKEND environment variable to 'file' to read them from a local
+# JSON fixture instead of Airtable, to run with no network
+def get_schema_backend():
+    backend = os.getenv("SCHEMA_BACKEND", "airtable")
+    if backend not in ("airtable", "file"):
+        raise ValueError(f"Unknown schema backend '{backend}', "
+                         "use 'airtable' or 'file'")
+    return backend
+
+
+# Function to get the mapping and data dictionary tables from the backend
+def get_schema_tables(backend):
+    if backend == "file":
+        # The fixture holds both tables in the format returned by Airtable
+        with open(os.getenv("SCHEMA_FIXTURE", SCHEMA_FIXTURE_PATH)) as fixture:
+            tables = json.load(fixture)
+        return tables['mapping'], tables['datadict']
+
     # Define the Airtable API
     api = Api(os.getenv("AIRTABLE_TOKEN"))
 
@@ -45,32 +122,52 @@ def create_schema(versions):
     # Get additional information from the data dictionary
     datadict = api.table(base_id = os.getenv("AIRTABLE_BASE_ID"),
                         table_name = os.getenv("AIRTABLE_TABLE_DATADICT")).all()
-    
-    # Restructure the data dictionary
-    datadict = {x['id']: x for x in datadict}
-    
-    # Initiate the SCHEMA dict
-    schema = {}
 
-    for version in versions:
-        # Configure the schema based on the mapping table
-        schema[version] = [x['fields'] for x in mapping if x['fields']['form_version'] == version]
-
-        # Loop through the feilds in the schema 
-        for field in schema[version]:
-            
-            # Add relevent feilds from data dict
-            field.update(get_fields(field['associated_field'][0]), datadict)
-            
-            # Remove unwanted fields
-            field.pop('form_name', None)
-            field.pop('form_version', None)
-            field.pop('associated_feild', None)
-            # Convert allowable values from string to list
-            if 'values' in field:
-                field['values'] = field['values'].split(", ")
-    
-    return schema
+    return mapping, datadict
+
+
+# Function to get the revision of the schema tables, which changes when the
+# tables do. Airtable has no cheap way to tell, so its cache relies on the TTL
+def get_schema_revision(backend):
+    if backend == "file":
+        stat = os.stat(os.getenv("SCHEMA_FIXTURE", SCHEMA_FIXTURE_PATH))
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    return None
+
+
+# Function to check if the cached schema can be used
+def is_cache_fresh(cache, backend, versions):
+    if cache is None or cache.get('backend') != backend:
+        return False
+    # Refresh once the cache is older than the TTL
+    if time.time() - cache['created'] > SCHEMA_CACHE_TTL:
+        return False
+    # Refresh if the tables changed since the cache was created
+    if cache['revision'] != get_schema_revision(backend):
+        return False
+    # Refresh if a form has a version the cache hasn't seen, as it may be new.
+    # Versions already looked up and not found are not looked up again until
+    # the cache is refreshed for another reason
+    looked_up = set(cache.get('looked_up', []))
+    return all(version in cache['schema'] or version in looked_up
+               for version in versions)
+
+
+# Function to load the cached schema, if there is one
+def load_schema_cache():
+    try:
+        with open(SCHEMA_CACHE_PATH) as cache:
+            return json.load(cache)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+# Function to save the schema to the cache, replacing it in a single step
+def save_schema_cache(cache):
+    tmp_path = SCHEMA_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as output:
+        json.dump(cache, output)
+    os.replace(tmp_path, SCHEMA_CACHE_PATH)
 
 
 # Function to add feilds from the data dict to the schema
@@ -23,8 +23,10 @@
 
 # Standard Library Imports
 import os
+import json
 import zipfile
 import xml.etree.ElementTree as ET
+from multiprocessing import Pool
 
 # Local Imports
 from src.globals import NS
@@ -37,62 +39,222 @@ from src.functions.create_schema import create_schema
 # ------------------------------------------------------------------------------
 
 
+# Compiled validator of each schema version used by the worker processes to
+# validate each form, set once per worker
+WORKER_VALIDATORS = None
+
+
 # main caller function to loop through the files and extract data
-def get_data(dir):
-    data = {}
-    for file in os.listdir(dir):
-        # If it is a docx file
-        if file.endswith("docx"):
-            # Open as XML and Extract the data add it to the dictionary
-            data[file] = extract_data(dir + file)
-
-    # Create a set of all of the versions that are in data
-    versions = set([data[form]['Version'] for form in data])
-
-    # create the schema
-    schema = create_schema(versions)
-
-    # Currently, the schema in Airtable doesn't align with the latest template
-    # As such this line is commented out
-    # Validate the data that was entered into the forms
-    # data = process_data(data, schema)
-        
+def get_data(dir, processes=None, validate=False):
+    # Collect the data of every file, keyed by file name
+    return dict(iter_data(dir, processes, validate))
+
+
+# Extract the data of every file and append it to a JSONL file, one form per
+# line, so that no more than a few forms are held in memory at once. Each line
+# is written as soon as its form is extracted, and forms already in the file
+# are skipped, so an interrupted run picks up where it stopped. Returns the
+# number of forms added to the file
+def write_data_jsonl(dir, output_path, processes=None, validate=False):
+    # Get the forms already written, dropping a partly written last line
+    done = set(file for file, data in iter_jsonl(output_path, repair=True))
+
+    count = 0
+    with open(output_path, "a") as output:
+        for file, data in iter_data(dir, processes, validate, skip=done):
+            output.write(json.dumps({"file": file, "data": data}) + "\n")
+            output.flush()
+            count += 1
+    return count
+
+
+# Read the (file name, data) pairs of a JSONL file written by write_data_jsonl,
+# one line at a time. A partly written last line is ignored, or cut from the
+# file if repair is True
+def iter_jsonl(path, repair=False):
+    if not os.path.isfile(path):
+        return
+    with open(path, "rb+" if repair else "rb") as jsonl:
+        offset = 0
+        for line in jsonl:
+            # Lines are only complete once their newline is written, so a line
+            # without one was cut off by an interrupted run
+            if not line.endswith(b"\n"):
+                if repair:
+                    jsonl.truncate(offset)
+                return
+            offset += len(line)
+            form = json.loads(line)
+            yield form["file"], form["data"]
+
+
+# Extract (and optionally validate) the data of each file across worker
+# processes, yielding (file name, data) pairs in file name order
+def iter_data(dir, processes=None, validate=False, chunksize=4, skip=()):
+    # Get the docx files in a stable order, leaving out those to skip
+    files = sorted(file for file in os.listdir(dir)
+                   if file.endswith("docx") and file not in skip)
+    file_paths = [os.path.join(dir, file) for file in files]
+
+    validators = None
+    if validate:
+        # Read just the version of each form to create the schema up front
+        versions = set(get_form_version(file_path) for file_path in file_paths)
+        validators = compile_schema(create_schema(versions))
+
+    # Read the files in this process if only one process is wanted
+    if processes == 1:
+        set_worker_validators(validators)
+        yield from zip(files, map(extract_form, file_paths))
+        return
+
+    # Each worker is sent the validators once, rather than with every file
+    with Pool(processes, initializer=set_worker_validators,
+              initargs=(validators,)) as pool:
+        yield from zip(files, pool.imap(extract_form, file_paths, chunksize))
+
+
+# Set the validators used by extract_form in the current process
+def set_worker_validators(validators):
+    global WORKER_VALIDATORS
+    WORKER_VALIDATORS = validators
+
+
+# Extract the data from a single file, validating it if validators are set
+def extract_form(wordDoc):
+    data = extract_data(wordDoc)
+    if WORKER_VALIDATORS is not None:
+        data = process_form(data, WORKER_VALIDATORS)
     return data
 
 
-# extract the desired data from an XML Tree
+# Get the version of a form without reading all of it. The version is taken
+# from a custom document property named 'Version' if there is one, otherwise
+# from the 'Version' input, and the rest of the document is not read
+def get_form_version(wordDoc):
+    with zipfile.ZipFile(wordDoc) as docx:
+        # Look for the version in the custom document properties
+        if "docProps/custom.xml" in docx.namelist():
+            for prop in ET.fromstring(docx.read("docProps/custom.xml")):
+                if prop.attrib.get("name") == "Version":
+                    return "".join(prop.itertext())
+
+        # Otherwise stream the document up to the end of the 'Version' input
+        with docx.open("word/document.xml") as xml:
+            depth = 0
+            version_depth = None
+            texts = []
+            for event, elem in ET.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == NS + "sdt":
+                        depth += 1
+                    elif elem.tag == NS + "alias" and version_depth is not None:
+                        # Text of a nested input is not part of the version
+                        break
+                    elif elem.tag == NS + "alias" and \
+                            elem.attrib[NS + "val"] == "Version":
+                        version_depth = depth
+                else:
+                    if elem.tag == NS + "t" and version_depth is not None:
+                        texts.append(checkbox_convert(elem.text or ""))
+                    elif elem.tag == NS + "sdt":
+                        if depth == version_depth:
+                            break
+                        depth -= 1
+                    elem.clear()
+            if version_depth is not None:
+                return "".join(texts)
+
+    # The form has no version
+    return None
+
+
+# extract the desired data from a word doc in a single pass over its XML
 def extract_data(wordDoc):
-    # Get structured XML tree
-    tree = get_xml(wordDoc)
-    # Initiate a dict
     data = {}
-    # Loop through the elements in the tree
-    for elem in tree.iter():
-        # If the element is an input
-        if elem.tag == NS + "sdt":
-            # Reset key and value
-            key = ''
-            value = ''
-            # Loop through the sub elements
-            for x in elem.iter():
-                # Get the 'alias' and set it to key
-                if x.tag == NS + "alias":
-                    key = x.attrib[NS + "val"]
-                # If 'alias' doesn't exist get the id
-                elif x.tag == NS + 'id' and key == "":
-                    key = x.attrib[NS + 'val']
+    # Stack of the inputs that are open at the current point in the document,
+    # the innermost input last
+    open_inputs = []
+    # Every input within the current top-level input, in document order
+    inputs = []
+    # Text of every 't' element inside the current top-level input, in document
+    # order. Each input holds a slice of this list, so nested text is only read
+    # once
+    texts = []
+
+    with zipfile.ZipFile(wordDoc) as docx, docx.open("word/document.xml") as xml:
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                # If the element is an input, open it with an empty key. Each
+                # key the input is read under is mapped to where its text ends
+                if elem.tag == NS + "sdt":
+                    open_inputs.append({"alias": None, "id": None, "key": "",
+                                        "keys": {"": None},
+                                        "start": len(texts)})
+                    inputs.append(open_inputs[-1])
+                # Note the 'alias' and id of the innermost input, which are
+                # used once all of its properties are read
+                elif elem.tag == NS + "alias" and open_inputs:
+                    open_inputs[-1]["alias"] = elem.attrib[NS + "val"]
+                elif elem.tag == NS + "id" and open_inputs:
+                    open_inputs[-1]["id"] = elem.attrib[NS + "val"]
+            else:
                 # Get the text from the 't' element
-                if x.tag == NS + "t":
+                if elem.tag == NS + "t" and open_inputs:
                     # There could be multiple 't' elements per input
-                    value = value + checkbox_convert(x.text)
-                # Update data with the new key value pair
-                data[key] = value                    
+                    texts.append(checkbox_convert(elem.text or ""))
+                # Key the innermost input once its properties are read
+                elif elem.tag == NS + "sdtPr" and open_inputs:
+                    set_key(open_inputs, len(texts))
+                # Close the input, ending the text of its last key
+                elif elem.tag == NS + "sdt":
+                    closed = open_inputs.pop()
+                    closed["keys"][closed["key"]] = len(texts)
+                    # Once no input is open, add the values of the inputs read
+                    # and release the text
+                    if not open_inputs:
+                        add_values(data, inputs, texts)
+                        inputs = []
+                        texts = []
+                # Free the element now that it has been read
+                elem.clear()
+
     # process the output dict so it is nested properly
     data = create_nested_dict(data)
 
     return data
 
 
+# Key the innermost input by its 'alias', or by its id if it has no 'alias'.
+# Text after the key belongs to it in the inputs around it too, though an id
+# only keys those inputs that have no key yet
+def set_key(open_inputs, text_count):
+    innermost = open_inputs[-1]
+    if innermost["alias"] is not None:
+        key = innermost["alias"]
+        keyed = open_inputs
+    elif innermost["id"] is not None:
+        key = innermost["id"]
+        keyed = [x for x in open_inputs if x["key"] == ""]
+    else:
+        return
+
+    for open_input in keyed:
+        # End the text of the previous key
+        open_input["keys"][open_input["key"]] = text_count
+        open_input["keys"].setdefault(key, None)
+        open_input["key"] = key
+
+
+# Set the value of each key of the given inputs in document order, such that a
+# key keeps the place where it was first found and takes the value of the last
+# input read under it
+def add_values(data, inputs, texts):
+    for closed in inputs:
+        for key, end in closed["keys"].items():
+            data[key] = "".join(texts[closed["start"]:end])
+
+
 # Convert the word doc into a structured XML Tree
 def get_xml(wordDoc):
     return ET.fromstring(zipfile.ZipFile(wordDoc).read("word/document.xml"))
@@ -113,28 +275,20 @@ def checkbox_convert(value):
 
 # Processes data for validation and prep for post
 def process_data(data, schema):
-    for form in data:
-        # Init an errors dict within data
-        data[form]['Errors'] = {}
-
-        # Look for a schema with the version that is on the form
-        try:
-            schema = {feild['wordFormColumn']: feild for feild in schema[data[form]['Version']]}
-        except IndexError:
-            return f'Error: Version {form["Version"]} does not exist in schema.'
-
-        # For each feild, validate the data according to the rules in schema
-        for feild in data[form]:
-            if feild != 'Errors':
-                data[form] = data_type(feild, schema[feild], data[form])
-                data[form] = data_values(feild, schema[feild], data[form])
-                data[form] = data_required(feild, schema[feild], data[form])
-
-        # Rename the feilds based on schema
-        data[form] = {schema[k].get('airTableColumnName', k) if k !=
-                      'Errors' else k: v for k, v in data.items()}
-
-    return data
+    # Compile the schema once and validate all of the forms together
+    return validate_forms(data, compile_schema(schema))
+
+
+# Validates the data of a single form and prepares it for post, using the
+# validators created by compile_schema
+def process_form(data, validators):
+    # Look for a validator with the version that is on the form
+    version = data.get('Version')
+    if version not in validators:
+        data['Errors'] = {}
+        return add_error(data, 'Version',
+                         f'Error: Version {version} does not exist in schema.')
+    return validators[version].validate(data)
 
 
 # Create a nested dictionary
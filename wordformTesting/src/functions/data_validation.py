@@ -19,11 +19,68 @@
 # ------------------------------------------------------------------------------
 
 
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Third Party Imports
+import pandas as pd
+
+# Local Imports
+from src.objects.formValidator import FormValidator
+
+
 # ------------------------------------------------------------------------------
 # -------------------------- Function Definition -------------------------------
 # ------------------------------------------------------------------------------
 
 
+# Compile each version of the schema into a FormValidator, once for all forms
+def compile_schema(schema):
+    return {version: FormValidator(fields) for version, fields in schema.items()}
+
+
+# Validate the data of many forms at once. The forms of each version are
+# validated as a single DataFrame. Returns the forms with an 'Errors' dict and
+# their feilds renamed, as process_data does
+def validate_forms(data, validators):
+    # One row per form, with a column for the version and each validated feild
+    columns = set(['Version'])
+    for validator in validators.values():
+        columns.update(validator.rules)
+    frame = pd.DataFrame(list(data.values()), index=list(data), columns=list(columns))
+
+    output = {}
+    for version, forms in frame.groupby('Version', sort=False, dropna=False):
+        # Forms with a version missing from the schema only get a version error
+        if version not in validators:
+            for form in forms.index:
+                data[form]['Errors'] = {}
+                output[form] = add_error(
+                    data[form], 'Version',
+                    f'Error: Version {data[form].get("Version")} does not exist in schema.')
+            continue
+
+        validator = validators[version]
+        integers, errors = validator.validate_frame(forms)
+        integers = {feild: dict(zip(values.index, values))
+                    for feild, values in integers.items()}
+        for form in forms.index:
+            values = data[form]
+            # Keep the int of each converted integer feild
+            for feild, converted in integers.items():
+                if form in converted:
+                    values[feild] = converted[form]
+            # Collect the errors in the order of the form's feilds
+            values['Errors'] = {feild: errors[feild][form] for feild in values
+                                if feild in errors and form in errors[feild]}
+            output[form] = validator.rename(values)
+
+    # Return the forms in their original order
+    return {form: output[form] for form in data}
+
+
 # Function to ensure the data type matches what schema dictates
 def data_type(feild, schema, data):
     # Get the required datatype from schema
@@ -45,7 +102,7 @@ def data_type(feild, schema, data):
 
 # Check if form data is in the list of accepted values for each feild
 def data_values(feild, schema, data):
-    if type(schema['values']) == list:
+    if type(schema.get('values')) == list:
         if not data[feild] in schema['values']:
             error_msg = f"ValueError: '{data[feild]}' is not an accepted option in schema for feild {feild}"
             data = add_error(data, feild, error_msg)
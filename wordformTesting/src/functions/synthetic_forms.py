@@ -0,0 +1,119 @@
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------- Synthetic Form Generation --------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# Functions included here fill the empty form template with random data, to
+# create realistic forms for benchmarking data extraction offline.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import os
+import random
+from datetime import date, timedelta
+
+# Third Party Imports
+from lxml import etree
+
+# Local Imports
+from src.globals import NS
+from src.objects.docWriter import DocWriter
+
+
+# ------------------------------------------------------------------------------
+# -------------------------- Function Definition -------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Words used to build the free text of synthetic forms
+WORDS = ["agency", "goal", "progress", "hiring", "technology", "funding",
+         "delay", "contract", "review", "policy", "data", "staff", "training",
+         "partners", "outreach", "milestone", "quarter", "target", "systems"]
+
+
+# Create the given number of synthetic forms in a directory
+def create_synthetic_forms(template_file, directory, count, seed=0):
+    # Create the output directory if needed
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    # Read the template and its inputs once for all forms
+    template = DocWriter(template_file)
+    fields = get_template_fields(template.get_xml())
+
+    file_paths = []
+    for i in range(count):
+        file_path = os.path.join(directory, f"synthetic_form_{seed}_{i:05}.docx")
+        # Keep forms created by an earlier run with the same seed
+        if not os.path.isfile(file_path):
+            replacements = get_random_replacements(fields, random.Random(f"{seed}-{i}"))
+            tree = template.populate_template(replacements)
+            template._write_and_close_docx(tree, file_path)
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+# Get the alias, input type and allowed values of each input in a template
+def get_template_fields(tree):
+    fields = []
+    for elem in tree.iter(NS + "sdt"):
+        sdt_pr = elem.find(NS + "sdtPr")
+        alias = sdt_pr.find(NS + "alias")
+        if alias is None:
+            continue
+        # Default to a plain text input
+        field = {"alias": alias.attrib[NS + "val"], "type": "text", "values": []}
+        # The input type is set by the element that follows the alias
+        for x in sdt_pr:
+            name = etree.QName(x).localname
+            if name in ("checkbox", "date"):
+                field["type"] = name
+            elif name in ("dropDownList", "comboBox"):
+                field["type"] = "list"
+                # Skip the 'Choose an item.' placeholder, which has no display text
+                field["values"] = [item.attrib[NS + "displayText"]
+                                   for item in x.iter(NS + "listItem")
+                                   if NS + "displayText" in item.attrib]
+        fields.append(field)
+    return fields
+
+
+# Choose a random value for each input
+def get_random_replacements(fields, rng):
+    replacements = {}
+    for field in fields:
+        # Keep the version of the template
+        if field["alias"] == "Version":
+            continue
+        if field["type"] == "checkbox":
+            replacements[field["alias"]] = rng.choice(["☒", "☐"])
+        elif field["type"] == "date":
+            day = date(2024, 1, 1) + timedelta(days=rng.randint(0, 730))
+            replacements[field["alias"]] = day.strftime("%m/%d/%Y")
+        elif field["type"] == "list" and field["values"]:
+            replacements[field["alias"]] = rng.choice(field["values"])
+        else:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(1, 30))]
+            replacements[field["alias"]] = " ".join(words)
+    return replacements
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
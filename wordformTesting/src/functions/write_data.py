@@ -26,9 +26,18 @@
 
 # Standard Library Imports
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Third Party Imports
 from pyairtable import Api
+from requests import HTTPError, RequestException
+from requests.exceptions import ChunkedEncodingError, Timeout
+from requests.exceptions import ConnectionError as DroppedConnectionError
+
+# Local Imports
+from src.globals import POST_CHECKPOINT_PATH
 
 
 # ------------------------------------------------------------------------------
@@ -36,12 +45,18 @@ from pyairtable import Api
 # ------------------------------------------------------------------------------
 
 
+# Airtable accepts at most 10 records per request, and 5 requests per second
+# per base
+RECORDS_PER_REQUEST = 10
+REQUESTS_PER_SECOND = 5
+
+
 # Define function to post to airtable
-def airTable_post(data):
+def airTable_post(data, checkpoint_path=POST_CHECKPOINT_PATH, max_in_flight=3):
 
     # https://pyairtable.readthedocs.io/en/stable/api.html
 
-    payload = []
+    payload = {}
     errors = []
     # Checking if the data validation process found errors before writing
     for row in data:
@@ -49,28 +64,114 @@ def airTable_post(data):
             # if no errors remove fields and add to payload
             data[row].pop('Errors')
             data[row].pop('Version')
-            payload.append(data[row])
+            payload[row] = data[row]
         else:
             # if errors add to errors
             errors.append(data[row])
 
-    # this is for testing, delete in prod
-    print(payload)
-
-    # Create authenticated API instance
-    api = Api(api_key=os.getenv("AIRTABLE_TOKEN"))
+    # Create authenticated API instance. Retries are handled by post_records,
+    # and AIRTABLE_ENDPOINT_URL can point at a local stand-in for testing
+    api = Api(os.getenv("AIRTABLE_TOKEN"), retry_strategy=None,
+              endpoint_url=os.getenv("AIRTABLE_ENDPOINT_URL",
+                                     "https://api.airtable.com"))
 
     # Define the table that we want to update
-    table = api.table(
-        base_id=os.getenv("AIRTABLE_BASE_ID"), table_name=os.getenv("AIRTABLE_TABLE")
-    )
-
-    # Commented out for testing, uncomment in prod
-    # Batch update the table
-    # table.batch_create(payload)
-
-    print("--- Posted to AirTable ---")
-    return
+    table = api.table(os.getenv("AIRTABLE_BASE_ID"), os.getenv("AIRTABLE_TABLE"))
+
+    # Batch create the records, skipping those posted by an earlier run
+    failed = post_records(table, payload, checkpoint_path, max_in_flight)
+
+    print(f"--- Posted to AirTable: {len(payload) - len(failed)} of "
+          f"{len(payload)} forms, {len(errors)} with errors not posted ---")
+    return failed
+
+
+# Post records to a table in chunks across a few threads. Each key in records
+# identifies a record, and is added to the checkpoint file once the record is
+# posted, so a rerun only posts what is left. Returns the error of each
+# record that Airtable rejected. Any other error, such as a connection that
+# kept dropping, is raised once the chunks in flight have been checkpointed
+def post_records(table, records, checkpoint_path, max_in_flight=3,
+                 max_retries=5, backoff=30):
+
+    # Skip the records posted by an earlier run
+    posted = load_checkpoint(checkpoint_path)
+    keys = [key for key in records if key not in posted]
+    chunks = [keys[i:i + RECORDS_PER_REQUEST]
+              for i in range(0, len(keys), RECORDS_PER_REQUEST)]
+
+    # Shared by the threads to space out their requests
+    limiter = {"lock": threading.Lock(), "next": time.monotonic()}
+
+    failed = {}
+    # First error other than a rejected request, raised once every chunk in
+    # flight has finished and been checkpointed
+    error = None
+    # The pool size bounds the number of requests in flight
+    with ThreadPoolExecutor(max_in_flight) as pool, \
+            open(checkpoint_path, "a") as checkpoint:
+        futures = {pool.submit(post_chunk, table, [records[key] for key in chunk],
+                               limiter, max_retries, backoff): chunk
+                   for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                # Leave the chunk out of the checkpoint, so a rerun retries it
+                failed.update({key: str(e) for key in chunk})
+                if not isinstance(e, HTTPError) and error is None:
+                    error = e
+                continue
+            # Checkpoint the chunk as soon as it is posted
+            checkpoint.write("".join(key + "\n" for key in chunk))
+            checkpoint.flush()
+
+    if error is not None:
+        raise error
+    return failed
+
+
+# Post one chunk of records, backing off and retrying when throttled, when
+# Airtable had an error or when the request never got a response
+def post_chunk(table, records, limiter, max_retries, backoff):
+    for attempt in range(max_retries + 1):
+        wait_for_request(limiter)
+        try:
+            return table.batch_create(records)
+        except RequestException as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            # Airtable asks clients to wait 30 seconds once throttled
+            time.sleep(backoff * 2 ** attempt)
+
+
+# Check if a failed request is worth retrying: throttled (429), an Airtable
+# error (5xx), or a network error such as a dropped connection or a timeout
+def is_retryable(error):
+    if isinstance(error, (DroppedConnectionError, Timeout, ChunkedEncodingError)):
+        return True
+    if not isinstance(error, HTTPError):
+        return False
+    status = error.response.status_code if error.response is not None else None
+    return status == 429 or (status is not None and status >= 500)
+
+
+# Wait until a request can be made without going over the rate limit
+def wait_for_request(limiter):
+    with limiter["lock"]:
+        now = time.monotonic()
+        start = max(now, limiter["next"])
+        limiter["next"] = start + 1 / REQUESTS_PER_SECOND
+    time.sleep(start - now)
+
+
+# Get the keys of the records posted by earlier runs
+def load_checkpoint(checkpoint_path):
+    if not os.path.isfile(checkpoint_path):
+        return set()
+    with open(checkpoint_path) as checkpoint:
+        return set(line.rstrip("\n") for line in checkpoint if line.strip())
 
 
 # ------------------------------------------------------------------------------
@@ -3,7 +3,20 @@
 # Update this one as needed. This directory should contain filled out forms
 DIRECTORY = "./src/input/dir/"
 
+# Where main.py writes the data of each form, one JSON line per form
+OUTPUT_PATH = "./src/output/output.jsonl"
+
 NAMESPACE = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
 
 NS = "{" + NAMESPACE["w"] + "}"
 
+
+# Where the schema pulled from Airtable is cached, and for how many seconds
+SCHEMA_CACHE_PATH = "./src/output/schema_cache.json"
+SCHEMA_CACHE_TTL = 3600
+
+# Local stand-in for the Airtable schema tables, used when SCHEMA_BACKEND=file
+SCHEMA_FIXTURE_PATH = "./src/input/schema_fixture.json"
+
+# Forms already posted to Airtable, so an interrupted post can be resumed
+POST_CHECKPOINT_PATH = "./src/output/post_checkpoint.txt"
@@ -27,9 +27,10 @@
 
 # Standard Library Imports
 import os
-import shutil
+import copy
+import zlib
+import struct
 import zipfile
-import tempfile
 from lxml import etree
 
 # Local Imports
@@ -45,8 +46,12 @@ from src.globals import NS
 class DocWriter:
     
     
-    # Init func to create a zip file
+    # Init func to create a zip file. A path is opened here rather than by
+    # zipfile, so write_docx can read the compressed files from it
     def __init__(self, docx_file):
+        if isinstance(docx_file, (str, os.PathLike)):
+            docx_file = open(docx_file, 'rb')
+        self.file = docx_file
         self.zipfile = zipfile.ZipFile(docx_file)
 
 
@@ -55,31 +60,76 @@ class DocWriter:
         return etree.fromstring(self.zipfile.read("word/document.xml"))
 
 
-    # Write the docx file
+    # Write the docx file, to a file path or any binary stream (e.g. BytesIO)
     def _write_and_close_docx(self, xml_content, output_filename):
-        
-        # Create a temp directory
-        tmp_dir = tempfile.mkdtemp()
-
-        # Expand the original docx zip.
-        self.zipfile.extractall(tmp_dir)
-
-        # Write the modified xml to word/document.xml
-        with open(os.path.join(tmp_dir, 'word/document.xml'), 'wb') as f:
-            xmlstr = etree.tostring(xml_content, pretty_print=True)
-            f.write(xmlstr)
-
-        # Zip it up as the new docx
-        # Get a list of all the files in the original docx zipfile
-        filenames = self.zipfile.namelist()
-        # Now, create the new zip file and add all the filex into the archive
-        zip_copy_filename = output_filename
-        with zipfile.ZipFile(zip_copy_filename, "w") as docx:
-            for filename in filenames:
-                docx.write(os.path.join(tmp_dir, filename), filename)
-
-        # Clean up the temp dir
-        shutil.rmtree(tmp_dir)
+        xmlstr = etree.tostring(xml_content, pretty_print=True)
+
+        # Open the output file if given a path
+        if isinstance(output_filename, (str, os.PathLike)):
+            with open(output_filename, 'wb') as output:
+                self.write_docx(xmlstr, output)
+        else:
+            self.write_docx(xmlstr, output_filename)
+
+
+    # Write a copy of the docx zip with a new word/document.xml to a stream.
+    # Every other file is copied across still compressed, so nothing is
+    # extracted to disk or compressed again
+    def write_docx(self, xmlstr, output):
+        # Compress the modified xml
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                      zlib.DEFLATED, -15)
+        document = compressor.compress(xmlstr) + compressor.flush()
+
+        infos = []
+        for info in self.zipfile.infolist():
+            info = copy.copy(info)
+            if info.filename == 'word/document.xml':
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.CRC = zlib.crc32(xmlstr)
+                info.file_size = len(xmlstr)
+                info.compress_size = len(document)
+            infos.append(info)
+
+        # Nothing is written if the zip would need zip64 records
+        check_zip_size(infos)
+
+        central_dir = []
+        offset = 0
+
+        for info in infos:
+            if info.filename == 'word/document.xml':
+                data = document
+            else:
+                data = self._read_compressed(info)
+            # Sizes are written before the data rather than after it
+            info.flag_bits &= ~0x08
+
+            # Write the file, and keep its entry for the central directory
+            header = info.FileHeader()
+            output.write(header)
+            output.write(data)
+            central_dir.append(central_dir_entry(info, offset))
+            offset += len(header) + len(data)
+
+        # Write the central directory and the end record
+        central_dir = b''.join(central_dir)
+        output.write(central_dir)
+        output.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0,
+                                 len(infos), len(infos),
+                                 len(central_dir), offset, 0))
+
+
+    # Read the compressed bytes of a file in the docx zip
+    def _read_compressed(self, info):
+        self.file.seek(info.header_offset)
+        header = self.file.read(30)
+        if header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f'Bad local header for {info.filename}')
+        # The data follows the header, the file name and the extra field
+        name_length, extra_length = struct.unpack('<2H', header[26:30])
+        self.file.seek(info.header_offset + 30 + name_length + extra_length)
+        return self.file.read(info.compress_size)
 
 
     # Function to populate data
@@ -101,6 +151,30 @@ class DocWriter:
         return tree
 
 
+    # Index the 't' elements of each input with an alias, in document order,
+    # so the same tree can be populated many times without searching it
+    def get_sdt_index(self, tree):
+        index = []
+        for elem in tree.iter(NS + "sdt"):
+            alias = elem.find(NS + 'sdtPr').find(NS + 'alias')
+            content = elem.find(NS + 'sdtContent')
+            if alias is not None and content is not None:
+                index.append((alias.attrib[NS + 'val'], list(content.iter(NS + 't'))))
+        return index
+
+
+    # Function to populate an indexed tree with data, as populate_template
+    # does. The text of every input is first reset to that of the template,
+    # so data from a previous call is never left behind
+    def populate_index(self, index, originals, replacements):
+        for t, text in originals:
+            t.text = text
+        for alias, texts in index:
+            if alias in replacements:
+                for t in texts:
+                    t.text = replacements[alias]
+
+
     # Function to create an output file
     def create_output_file(self, outfilepath, replacements):
         # Populate the template with replacement data
@@ -112,6 +186,51 @@ class DocWriter:
         return
 
 
+# Raise an error if a zip of the given files would need zip64 records, which
+# write_docx does not write. The limits are those at which zipfile itself
+# switches to zip64
+def check_zip_size(infos):
+    if len(infos) >= zipfile.ZIP_FILECOUNT_LIMIT:
+        raise zipfile.LargeZipFile(f'{len(infos)} files need a zip64 archive')
+
+    offset = 0
+    central_dir_size = 0
+    for info in infos:
+        size = max(info.file_size, info.compress_size, offset)
+        if size > zipfile.ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f'{info.filename} needs a zip64 archive')
+        # The local header and central directory entry of each file, with its
+        # name at its longest (utf-8) length
+        name_length = len(info.filename.encode('utf-8'))
+        offset += 30 + name_length + len(info.extra) + info.compress_size
+        central_dir_size += (46 + name_length + len(info.extra)
+                             + len(info.comment))
+
+    if max(offset, central_dir_size) > zipfile.ZIP64_LIMIT:
+        raise zipfile.LargeZipFile('The docx zip needs a zip64 archive')
+
+
+# Create the central directory entry of a file written at the given offset
+def central_dir_entry(info, offset):
+    # Non-ascii file names are stored as utf-8, which is flagged
+    try:
+        filename = info.filename.encode('ascii')
+        flag_bits = info.flag_bits
+    except UnicodeEncodeError:
+        filename = info.filename.encode('utf-8')
+        flag_bits = info.flag_bits | 0x800
+    dt = info.date_time
+    dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+    dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+    return struct.pack('<4s4B4HL2L5H2L', b'PK\x01\x02', info.create_version,
+                       info.create_system, info.extract_version, info.reserved,
+                       flag_bits, info.compress_type, dostime, dosdate, info.CRC,
+                       info.compress_size, info.file_size, len(filename),
+                       len(info.extra), len(info.comment), 0, info.internal_attr,
+                       info.external_attr, offset) \
+        + filename + info.extra + info.comment
+
+
 # ------------------------------------------------------------------------------
 # ------------------------------------------------------------------------------
 # ------------------------------- End Script -----------------------------------
@@ -0,0 +1,175 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# -------------------------- FormValidator Object ------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# The FormValidator object validates the data extracted from forms of one
+# schema version. The feilds of the version are compiled once, when the object
+# is created, so each form is checked against ready-made rules:
+# 1. Integer feilds are converted to int, or get a TypeError
+# 2. Feilds with a list of accepted values are checked against a set of them
+# 3. Required feilds get a RequiredError when empty
+# Forms can be validated one at a time, or all at once as a DataFrame.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+# Third Party Imports
+import pandas as pd
+
+
+# ------------------------------------------------------------------------------
+# ---------------------------- Class Definition --------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Text that int() accepts
+INTEGER_PATTERN = r"\s*[+-]?\d+(?:_\d+)*\s*"
+
+
+# FormValidator class
+class FormValidator:
+
+
+    # Init func to compile the feilds of a schema version
+    def __init__(self, fields):
+        self.rules = {}
+        self.names = {}
+        for field in fields:
+            column = field['wordFormColumn']
+            values = field.get('values')
+            self.rules[column] = {
+                'integer': field['dataType'] == 'integer',
+                # Accepted values are looked up in a set
+                'values': frozenset(values) if type(values) == list else None,
+                'required': field['required'],
+            }
+            # Name of the feild in the database, if it differs from the input ID
+            if field.get('airTableColumnName', column) != column:
+                self.names[column] = field['airTableColumnName']
+
+
+    # Validate the data of a single form and rename its feilds
+    def validate(self, data):
+        # Init an errors dict within data
+        data['Errors'] = {}
+
+        for feild in list(data):
+            # Nested inputs and inputs missing from the schema are not validated
+            if feild == 'Errors' or feild not in self.rules:
+                continue
+            rule = self.rules[feild]
+            value = data[feild]
+            errors = []
+
+            # Convert integers, keeping the input if it is not one
+            if rule['integer']:
+                try:
+                    value = int(value)
+                    data[feild] = value
+                except ValueError:
+                    errors.append(type_error(feild, value))
+            # Check against the accepted values
+            if rule['values'] is not None and not is_accepted(value, rule['values']):
+                errors.append(value_error(feild, value))
+            # Check that required feilds are filled out
+            if rule['required'] and value == "":
+                errors.append(required_error(feild))
+
+            if errors:
+                data['Errors'][feild] = errors
+
+        return self.rename(data)
+
+
+    # Rename the feilds based on schema
+    def rename(self, data):
+        if not self.names:
+            return data
+        return {self.names.get(k, k) if k != 'Errors' else k: v
+                for k, v in data.items()}
+
+
+    # Validate a DataFrame of forms, one form per row and one feild per column.
+    # Missing feilds are NaN. Returns a dict of the converted values of each
+    # integer feild, as a Series, and a dict of the errors of each feild,
+    # mapping each row with errors to its list of error messages
+    def validate_frame(self, frame):
+        integers = {}
+        errors = {}
+
+        for feild in frame.columns:
+            column = frame[feild][frame[feild].notna()]
+            if feild not in self.rules or column.empty:
+                continue
+            rule = self.rules[feild]
+            # Error messages of each row, in the order of the checks
+            messages = {}
+
+            # Convert integers, keeping the inputs that are not one
+            if rule['integer']:
+                is_integer = column.str.fullmatch(INTEGER_PATTERN) == True
+                converted = column[is_integer].map(int).astype(object)
+                for row, value in column[~is_integer].items():
+                    messages.setdefault(row, []).append(type_error(feild, value))
+                column = column.where(~is_integer, converted)
+                integers[feild] = converted
+            # Check against the accepted values
+            if rule['values'] is not None:
+                try:
+                    failed = column[~column.isin(rule['values'])]
+                # Values that can't be in a set, such as nested inputs
+                except TypeError:
+                    failed = column[[not is_accepted(x, rule['values'])
+                                     for x in column]]
+                for row, value in failed.items():
+                    messages.setdefault(row, []).append(value_error(feild, value))
+            # Check that required feilds are filled out
+            if rule['required']:
+                for row in column.index[column == ""]:
+                    messages.setdefault(row, []).append(required_error(feild))
+
+            if messages:
+                errors[feild] = messages
+
+        return integers, errors
+
+
+# Check if a value is in a set of accepted values
+def is_accepted(value, values):
+    try:
+        return value in values
+    # Values that can't be in a set, such as nested inputs, are never accepted
+    except TypeError:
+        return False
+
+
+# Create invalid data type error messages
+def type_error(feild, value):
+    return f'TypeError: Feild {feild}({value}) not of type integer'
+
+
+# Create invalid value error messages
+def value_error(feild, value):
+    return f"ValueError: '{value}' is not an accepted option in schema for feild {feild}"
+
+
+# Create missing required feild error messages
+def required_error(feild):
+    return f'RequiredError: Required feild missing: {feild}'
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -0,0 +1,6 @@
+# Make the project's src package importable when the tests are run from
+# another directory
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,80 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ---------------------- Prefilled Form File Name Tests ------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# These tests check that every prefilled form gets its own file, including
+# goals whose names only differ in characters that are not safe in a file name.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import os
+
+# Third Party Imports
+import pandas as pd
+
+# Local Imports
+from src.functions.create_prepopulated_form import (
+    create_bulk_pre_populated_forms, get_form_file_names)
+
+
+# Template used by prefill.py
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "src", "input", "apgCoverSheet_v1.0_template_WORKING.docx")
+
+
+# ------------------------------------------------------------------------------
+# --------------------------------- Tests --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+def replacements(goal, agency="DOC"):
+    return {'agency_acronym_1': agency, 'goal_nickname': goal,
+            'fiscal_year': 'FY21', 'fiscal_quarter': 'Q1'}
+
+
+def test_colliding_goal_names_get_a_suffix():
+    file_names = get_form_file_names([replacements("A/B"), replacements("A B"),
+                                      replacements("a:b"), replacements("C")])
+
+    assert file_names == ["DOC_A_B_FY21_Q1.docx", "DOC_A_B_FY21_Q1_2.docx",
+                          "DOC_a_b_FY21_Q1_3.docx", "DOC_C_FY21_Q1.docx"]
+
+
+def test_names_differing_in_case_get_a_suffix():
+    file_names = get_form_file_names([replacements("Goal"), replacements("GOAL")])
+
+    assert file_names == ["DOC_Goal_FY21_Q1.docx", "DOC_GOAL_FY21_Q1_2.docx"]
+
+
+def test_bulk_forms_are_not_overwritten(tmp_path):
+    database_path = tmp_path / "database.csv"
+    pd.DataFrame({'Agency Name': ["DOC", "DOC", "DOC"],
+                  'Goal Name': ["A/B", "A B", "C"],
+                  'Fiscal Year': [2020, 2020, 2020],
+                  'Quarter': ["Q4", "Q4", "Q4"]}).to_csv(database_path, index=False)
+
+    file_paths = create_bulk_pre_populated_forms(database_path, TEMPLATE,
+                                                 str(tmp_path / "forms"), processes=1)
+
+    assert len(set(file_paths)) == 3
+    assert all(os.path.isfile(file_path) for file_path in file_paths)
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -0,0 +1,98 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# -------------------------- Schema Cache Tests --------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# These tests check that the schema cache only reads the schema tables again
+# for versions it has never looked up, including versions that are not in the
+# mapping table, such as None for legacy forms.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import os
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+import src.functions.create_schema as create_schema_module
+from src.globals import SCHEMA_FIXTURE_PATH
+
+
+# Fixture holding the schema tables, relative to the project directory
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       SCHEMA_FIXTURE_PATH)
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------- Fixtures -------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Read the tables from the fixture, caching them in a temporary file, and
+# count the reads
+@pytest.fixture
+def reads(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCHEMA_BACKEND", "file")
+    monkeypatch.setenv("SCHEMA_FIXTURE", FIXTURE)
+    monkeypatch.setattr(create_schema_module, "SCHEMA_CACHE_PATH",
+                        str(tmp_path / "schema_cache.json"))
+
+    reads = []
+    get_schema_tables = create_schema_module.get_schema_tables
+
+    def counted(backend):
+        reads.append(backend)
+        return get_schema_tables(backend)
+
+    monkeypatch.setattr(create_schema_module, "get_schema_tables", counted)
+    return reads
+
+
+# ------------------------------------------------------------------------------
+# --------------------------------- Tests --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+def test_missing_versions_are_only_looked_up_once(reads):
+    create_schema_module.create_schema(["1.0"])
+    create_schema_module.create_schema(["1.0", None])
+    create_schema_module.create_schema(["1.0", None])
+    create_schema_module.create_schema([None])
+
+    assert len(reads) == 2
+
+
+def test_new_version_refreshes_and_keeps_earlier_lookups(reads):
+    create_schema_module.create_schema([None])
+    create_schema_module.create_schema(["0.9"])
+    schema = create_schema_module.create_schema([None, "0.9"])
+
+    assert len(reads) == 2
+    assert schema == {None: [], "0.9": []}
+
+
+def test_refresh_reads_the_tables(reads):
+    create_schema_module.create_schema([None])
+    create_schema_module.create_schema([None], refresh=True)
+
+    assert len(reads) == 2
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -0,0 +1,97 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------ Data Extraction Tests -------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# These tests extract the data of small word docs written on the fly, and check
+# that each input is keyed by its alias, or by its id if it has no alias, in
+# whatever order its properties are written.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import zipfile
+
+# Third Party Imports
+import pytest
+
+# Local Imports
+from src.functions.data_extraction import extract_data
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------- Helpers --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+# Write a word doc holding the given body XML and return its path
+def write_doc(tmp_path, body):
+    path = tmp_path / "form.docx"
+    with zipfile.ZipFile(path, "w") as docx:
+        docx.writestr("word/document.xml",
+                      f"<w:document {W}><w:body>{body}</w:body></w:document>")
+    return path
+
+
+# XML of an input with the given properties and content
+def sdt(properties, content):
+    return (f"<w:sdt><w:sdtPr>{properties}</w:sdtPr>"
+            f"<w:sdtContent>{content}</w:sdtContent></w:sdt>")
+
+
+def run(text):
+    return f"<w:r><w:t>{text}</w:t></w:r>"
+
+
+ALIAS = '<w:alias w:val="Goal"/>'
+TAG = '<w:tag w:val="goal"/>'
+ID = '<w:id w:val="12"/>'
+
+
+# ------------------------------------------------------------------------------
+# --------------------------------- Tests --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("properties", [ALIAS + TAG + ID, ID + TAG + ALIAS,
+                                        TAG + ID + ALIAS])
+def test_alias_is_key_in_any_order(tmp_path, properties):
+    path = write_doc(tmp_path, sdt(properties, run("Reduce ") + run("waste")))
+
+    assert extract_data(path) == {"": "", "Goal": "Reduce waste"}
+
+
+def test_id_is_key_without_alias(tmp_path):
+    path = write_doc(tmp_path, sdt(TAG + ID, run("☒")))
+
+    assert extract_data(path) == {"": "", "12": "X"}
+
+
+def test_nested_inputs(tmp_path):
+    inner = sdt('<w:id w:val="7"/><w:alias w:val="Status&amp;Flag"/>',
+                run("☐"))
+    path = write_doc(tmp_path, sdt(ID + ALIAS, run("Goal ") + inner))
+
+    assert extract_data(path) == {"": "", "Goal": "Goal ",
+                                  "Status": {"Flag": ""}}
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# --------------------------- DocWriter Zip Tests ------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# These tests write populated forms with DocWriter and read them back with
+# zipfile, checking that the written zip is valid, that only word/document.xml
+# changes and that every other file keeps its compressed bytes.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import io
+import os
+import struct
+import zipfile
+
+# Third Party Imports
+import pytest
+from lxml import etree
+
+# Local Imports
+from src.objects.docWriter import DocWriter
+
+
+# Template used by prefill.py
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "src", "input", "apgCoverSheet_v1.0_template_WORKING.docx")
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------- Helpers --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Read the compressed bytes of a file in a zip, straight from its local header
+def read_raw(zip_bytes, info):
+    header = zip_bytes[info.header_offset:info.header_offset + 30]
+    assert header[:4] == b"PK\x03\x04"
+    name_length, extra_length = struct.unpack("<2H", header[26:30])
+    start = info.header_offset + 30 + name_length + extra_length
+    return zip_bytes[start:start + info.compress_size]
+
+
+# Write a small docx zip holding stored, deflated and utf-8 named files
+def make_docx():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as docx:
+        docx.writestr("[Content_Types].xml", "<Types/>", zipfile.ZIP_STORED)
+        docx.writestr("word/document.xml", "<document/>", zipfile.ZIP_DEFLATED)
+        docx.writestr("word/média/ünïcode.txt", "ü" * 500,
+                      zipfile.ZIP_DEFLATED)
+    buffer.seek(0)
+    return buffer
+
+
+# Write the template populated with the given replacements to a buffer
+def write(writer, replacements):
+    output = io.BytesIO()
+    writer._write_and_close_docx(writer.populate_template(replacements), output)
+    return output.getvalue()
+
+
+# ------------------------------------------------------------------------------
+# --------------------------------- Tests --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("source", ["template", "small"])
+def test_round_trip(source):
+    template = TEMPLATE if source == "template" else make_docx()
+    writer = DocWriter(template)
+    xml = writer.get_xml()
+    xmlstr = etree.tostring(xml, pretty_print=True)
+
+    output = io.BytesIO()
+    writer._write_and_close_docx(xml, output)
+    written = output.getvalue()
+    written_zip = zipfile.ZipFile(io.BytesIO(written))
+
+    assert written_zip.testzip() is None
+    assert written_zip.namelist() == writer.zipfile.namelist()
+    assert written_zip.read("word/document.xml") == xmlstr
+
+    # Every other file keeps its compressed bytes
+    source_bytes = open(TEMPLATE, "rb").read() if source == "template" \
+        else make_docx().getvalue()
+    for info in writer.zipfile.infolist():
+        if info.filename == "word/document.xml":
+            continue
+        written_info = written_zip.getinfo(info.filename)
+        assert written_info.compress_type == info.compress_type
+        assert written_info.CRC == info.CRC
+        assert read_raw(written, written_info) == read_raw(source_bytes, info)
+
+
+def test_populated_form_reads_back(tmp_path):
+    writer = DocWriter(TEMPLATE)
+    path = tmp_path / "form.docx"
+    writer.create_output_file(str(path), {"Version": "v9.9"})
+
+    with zipfile.ZipFile(path) as docx:
+        assert docx.testzip() is None
+        assert b"v9.9" in docx.read("word/document.xml")
+
+    # The template itself is left as it was
+    assert b"v9.9" not in writer.zipfile.read("word/document.xml")
+    assert write(writer, {}) == write(DocWriter(TEMPLATE), {})
+
+
+def test_refuses_zip64(monkeypatch):
+    writer = DocWriter(make_docx())
+    monkeypatch.setattr(zipfile, "ZIP64_LIMIT", 100)
+
+    output = io.BytesIO()
+    with pytest.raises(zipfile.LargeZipFile, match="ünïcode"):
+        writer._write_and_close_docx(writer.get_xml(), output)
+    # Nothing is written
+    assert output.getvalue() == b""
+
+
+def test_refuses_too_many_files(monkeypatch):
+    writer = DocWriter(make_docx())
+    monkeypatch.setattr(zipfile, "ZIP_FILECOUNT_LIMIT", 3)
+
+    output = io.BytesIO()
+    with pytest.raises(zipfile.LargeZipFile):
+        writer._write_and_close_docx(writer.get_xml(), output)
+    assert output.getvalue() == b""
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
@@ -0,0 +1,180 @@
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------ Airtable Post Tests ---------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+# These tests post records through post_records to a local HTTP stand-in for
+# Airtable, which throttles, errors or drops the connection on request, and
+# check that every record ends up created once and checkpointed once.
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+
+
+# ------------------------------------------------------------------------------
+# ------------------------- Set-up / Package Imports ---------------------------
+# ------------------------------------------------------------------------------
+
+
+# Standard Library Imports
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third Party Imports
+import pytest
+from pyairtable import Api
+from requests.exceptions import ConnectionError as DroppedConnectionError
+
+# Local Imports
+from src.functions.write_data import post_records, load_checkpoint
+
+
+# ------------------------------------------------------------------------------
+# ---------------------------- Airtable Stand-in -------------------------------
+# ------------------------------------------------------------------------------
+
+
+# Local server that creates the records posted to it. Each chunk is known by
+# the name of its first record, and can be given a list of failures to answer
+# with before it is created: 429, 500 or "drop" to close the connection
+class StandIn(ThreadingHTTPServer):
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.created = []
+        self.failures = {}
+        self.always_drop = set()
+
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        records = json.loads(body)["records"]
+        first = records[0]["fields"]["Name"]
+
+        with self.server.lock:
+            failures = self.server.failures.get(first, [])
+            failure = failures.pop(0) if failures else None
+            if first in self.server.always_drop:
+                failure = "drop"
+            if failure is None:
+                self.server.created.extend(r["fields"]["Name"] for r in records)
+
+        if failure == "drop":
+            # Close the connection without answering
+            self.close_connection = True
+            return
+        if failure is not None:
+            self.send_json(failure, {"error": {"type": "STAND_IN_ERROR"}})
+            return
+        self.send_json(200, {"records": [
+            {"id": f"rec{i:014}", "createdTime": "2024-01-01T00:00:00.000Z",
+             "fields": r["fields"]} for i, r in enumerate(records)]})
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------- Fixtures -------------------------------------
+# ------------------------------------------------------------------------------
+
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def table(server):
+    api = Api("patTest", retry_strategy=None, endpoint_url=server.url())
+    return api.table("appTest0000000000", "tblTest0000000000")
+
+
+# 60 forms, posted as 6 chunks of 10
+@pytest.fixture
+def records():
+    return {f"form_{i:02}.docx": {"Name": f"form_{i:02}.docx"} for i in range(60)}
+
+
+def post(table, records, checkpoint_path):
+    return post_records(table, records, checkpoint_path, max_in_flight=3,
+                        max_retries=2, backoff=0)
+
+
+# ------------------------------------------------------------------------------
+# --------------------------------- Tests --------------------------------------
+# ------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("failure", [429, 500, 503, "drop"])
+def test_retries_until_posted(server, table, records, tmp_path, failure):
+    server.failures["form_10.docx"] = [failure, failure]
+    checkpoint_path = tmp_path / "checkpoint.txt"
+
+    assert post(table, records, checkpoint_path) == {}
+    assert sorted(server.created) == sorted(records)
+    assert load_checkpoint(checkpoint_path) == set(records)
+
+
+def test_rejected_chunk_is_not_retried(server, table, records, tmp_path):
+    server.failures["form_20.docx"] = [422]
+    checkpoint_path = tmp_path / "checkpoint.txt"
+
+    failed = post(table, records, checkpoint_path)
+
+    assert set(failed) == {f"form_{i}.docx" for i in range(20, 30)}
+    assert load_checkpoint(checkpoint_path) == set(records) - set(failed)
+
+    # A rerun only posts the rejected chunk
+    assert post(table, records, checkpoint_path) == {}
+    assert sorted(server.created) == sorted(records)
+
+
+def test_dropped_connection_checkpoints_other_chunks(server, table, records,
+                                                     tmp_path):
+    server.always_drop.add("form_00.docx")
+    checkpoint_path = tmp_path / "checkpoint.txt"
+
+    with pytest.raises(DroppedConnectionError):
+        post(table, records, checkpoint_path)
+
+    # Every chunk that was created is checkpointed, even those still in
+    # flight when the first chunk failed
+    assert load_checkpoint(checkpoint_path) == set(server.created)
+    assert len(server.created) == 50
+
+    # A rerun posts the dropped chunk without duplicating the others
+    server.always_drop.clear()
+    assert post(table, records, checkpoint_path) == {}
+    assert sorted(server.created) == sorted(records)
+
+
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------- End Script -----------------------------------
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------